@@ -5,11 +5,21 @@ from flask_login import LoginManager, login_user, logout_user, login_required, c
 
 from config import ProductionConfig
 
-from boxing.db import db
+from boxing.db import db, init_readonly_engine, readonly_session
 from boxing.models.boxers_model import Boxers
 from boxing.models.ring_model import RingModel
 from boxing.models.user_model import Users
+from boxing.utils.admission import admission_controlled, create_limiters
+from boxing.utils.api_utils import configure_client
 from boxing.utils.logger import configure_logger
+from boxing.utils.response_cache import ResponseCache, count_writes
+from boxing.utils.sql_utils import (
+    WalCheckpointer,
+    get_readonly_pragmas,
+    get_readonly_sqlite_uri,
+    register_sqlite_pragmas
+)
+from boxing.utils import memory_utils
 
 
 load_dotenv()
@@ -22,15 +32,33 @@ def create_app(config_class=ProductionConfig):
 
     db.init_app(app)  # Initialize db with app
     with app.app_context():
+        sqlite_pragmas = app.config.get("SQLITE_PRAGMAS", {})
+        register_sqlite_pragmas(db.engine, sqlite_pragmas)
+
+        # Route read-only model methods to a separate engine if one is available
+        readonly_uri = app.config.get("SQLALCHEMY_READONLY_DATABASE_URI")
+        if readonly_uri is None:
+            readonly_uri = get_readonly_sqlite_uri(db.engine.url)
+        if readonly_uri:
+            readonly_engine = init_readonly_engine(app, readonly_uri)
+            register_sqlite_pragmas(readonly_engine, get_readonly_pragmas(sqlite_pragmas))
+
         db.create_all()  # Recreate all tables
 
+        checkpoint_interval = app.config.get("SQLITE_WAL_CHECKPOINT_INTERVAL", 0)
+        if checkpoint_interval > 0 and db.engine.dialect.name == "sqlite":
+            checkpointer = WalCheckpointer(db.engine, checkpoint_interval)
+            checkpointer.start()
+            app.extensions["wal_checkpointer"] = checkpointer
+
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = "login"
 
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.query.filter_by(username=user_id).first()
+        with readonly_session():
+            return Users.query.filter_by(username=user_id).first()
 
     @login_manager.unauthorized_handler
     def unauthorized():
@@ -42,6 +70,23 @@ def create_app(config_class=ProductionConfig):
 
     ring_model = RingModel()
 
+    response_cache = ResponseCache(app.config.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    response_cache_ttl = app.config.get("RESPONSE_CACHE_TTL", 5)
+    app.extensions["response_cache"] = response_cache
+
+    # Bumped after every successful write in this process; cached responses are keyed by it.
+    # A bout is a GET that records wins and fights.
+    response_cache_writes = count_writes(app, write_endpoints=("bout",))
+
+    def boxers_version() -> int:
+        return response_cache_writes.value
+
+    admission_limiters = create_limiters(app.config.get("ADMISSION_LIMITS", {}))
+    app.extensions["admission_limiters"] = admission_limiters
+
+    random_org_client = configure_client(**app.config.get("RANDOM_ORG_CLIENT", {}))
+    app.extensions["random_org_client"] = random_org_client
+
 
     ####################################################
     #
@@ -55,17 +100,57 @@ def create_app(config_class=ProductionConfig):
         """
         Health check route to verify the service is running.
 
+        The service stays healthy while random.org is unavailable, since fights fall
+        back to a local generator, but the response reports it as degraded.
+
         Returns:
             JSON response indicating the health status of the service.
 
         """
         app.logger.info("Health check endpoint hit")
+        degraded = random_org_client.is_degraded()
         return make_response(jsonify({
             'status': 'success',
-            'message': 'Service is running'
+            'message': 'Service is running in degraded mode' if degraded else 'Service is running',
+            'degraded': degraded,
+            'dependencies': {
+                'random_org': random_org_client.breaker.state
+            }
         }), 200)
 
 
+    @app.route('/api/metrics', methods=['GET'])
+    @login_required
+    def get_metrics() -> Response:
+        """Route to report the random.org client, admission limiter and response cache counters.
+
+        Returns:
+            JSON response with the random.org client stats, the stats of each route group
+            and the response cache stats.
+
+        Raises:
+            500 error if there is an issue collecting the metrics.
+
+        """
+        try:
+            app.logger.info("Received request to report metrics")
+
+            return make_response(jsonify({
+                "status": "success",
+                "random_org": random_org_client.get_stats(),
+                "admission": {name: limiter.get_stats() for name, limiter in admission_limiters.items()},
+                "response_cache": response_cache.get_stats()
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to report metrics: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while reporting metrics",
+                "details": str(e)
+            }), 500)
+
+
     ##########################################################
     #
     # User Management
@@ -412,6 +497,7 @@ def create_app(config_class=ProductionConfig):
 
     @app.route('/api/get-boxer-by-id/<int:boxer_id>', methods=['GET'])
     @login_required
+    @response_cache.cached(version=boxers_version, ttl=response_cache_ttl)
     def get_boxer_by_id(boxer_id: int) -> Response:
         """Route to get a boxer by its ID.
 
@@ -455,6 +541,7 @@ def create_app(config_class=ProductionConfig):
 
     @app.route('/api/get-boxer-by-name/<string:boxer_name>', methods=['GET'])
     @login_required
+    @response_cache.cached(version=boxers_version, ttl=response_cache_ttl)
     def get_boxer_by_name(boxer_name: str) -> Response:
         """Route to get a boxer by its name.
 
@@ -505,6 +592,7 @@ def create_app(config_class=ProductionConfig):
 
     @app.route('/api/fight', methods=['GET'])
     @login_required
+    @admission_controlled(admission_limiters.get("random_org"))
     def bout() -> Response:
         """Route that triggers the fight between the two current boxers.
 
@@ -682,6 +770,7 @@ def create_app(config_class=ProductionConfig):
 
 
     @app.route('/api/leaderboard', methods=['GET'])
+    @response_cache.cached(version=boxers_version, ttl=response_cache_ttl)
     def get_leaderboard() -> Response:
         """Route to get the leaderboard of boxers sorted by wins or win percentage.
 
@@ -728,6 +817,162 @@ def create_app(config_class=ProductionConfig):
                 "details": str(e)
             }), 500)
 
+
+    ############################################################
+    #
+    # Diagnostics
+    #
+    ############################################################
+
+
+    @app.route('/api/memory-usage', methods=['GET'])
+    @login_required
+    def get_memory_usage() -> Response:
+        """Route to report the tracemalloc status and the snapshots taken so far.
+
+        The ring model is still a skeleton with no structures to measure, so only
+        tracemalloc is reported.
+
+        Returns:
+            JSON response with the tracemalloc status.
+
+        Raises:
+            500 error if there is an issue measuring memory usage.
+
+        """
+        try:
+            app.logger.info("Received request to report memory usage")
+
+            return make_response(jsonify({
+                "status": "success",
+                "tracemalloc": {
+                    "tracing": memory_utils.is_tracing(),
+                    "snapshots": memory_utils.list_snapshots(),
+                    **memory_utils.get_traced_memory()
+                }
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to report memory usage: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while reporting memory usage",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/memory-snapshot', methods=['POST'])
+    @login_required
+    def take_memory_snapshot() -> Response:
+        """Route to take a tracemalloc snapshot, starting tracemalloc if needed.
+
+        Returns:
+            JSON response with the id of the new snapshot and the traced memory.
+
+        Raises:
+            500 error if there is an issue taking the snapshot.
+
+        """
+        try:
+            app.logger.info("Received request to take a memory snapshot")
+
+            snapshot = memory_utils.take_snapshot()
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Snapshot {snapshot['snapshot_id']} taken",
+                "snapshot": snapshot
+            }), 201)
+
+        except Exception as e:
+            app.logger.error(f"Failed to take memory snapshot: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while taking the memory snapshot",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/memory-snapshot-diff', methods=['GET'])
+    @login_required
+    def get_memory_snapshot_diff() -> Response:
+        """Route to diff two tracemalloc snapshots.
+
+        Query Parameters:
+            - first (int, optional): The id of the older snapshot. Defaults to the one taken before `second`.
+            - second (int, optional): The id of the newer snapshot. Defaults to the most recent.
+            - limit (int, optional): The number of allocation sites to return. Default is 10.
+            - key_type (str, optional): 'lineno', 'filename' or 'traceback'. Default is 'lineno'.
+
+        Returns:
+            JSON response with the top allocation sites between the two snapshots.
+
+        Raises:
+            400 error if the parameters are invalid or the snapshots are not available.
+            500 error if there is an issue computing the diff.
+
+        """
+        try:
+            first = request.args.get('first', type=int)
+            second = request.args.get('second', type=int)
+            limit = request.args.get('limit', 10, type=int)
+            key_type = request.args.get('key_type', 'lineno')
+
+            app.logger.info(f"Received request to diff memory snapshots {first} and {second}")
+
+            stats = memory_utils.compare_snapshots(first, second, limit=limit, key_type=key_type)
+
+            return make_response(jsonify({
+                "status": "success",
+                "top_allocations": stats
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Cannot diff memory snapshots: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to diff memory snapshots: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while diffing memory snapshots",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/memory-snapshots', methods=['DELETE'])
+    @login_required
+    def clear_memory_snapshots() -> Response:
+        """Route to discard all tracemalloc snapshots and stop tracing.
+
+        Returns:
+            JSON response indicating success of the operation.
+
+        Raises:
+            500 error if there is an issue clearing the snapshots.
+
+        """
+        try:
+            app.logger.info("Received request to clear memory snapshots")
+
+            memory_utils.clear_snapshots()
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Memory snapshots cleared and tracing stopped"
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to clear memory snapshots: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while clearing memory snapshots",
+                "details": str(e)
+            }), 500)
+
     return app
 
 
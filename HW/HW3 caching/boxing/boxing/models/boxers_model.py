@@ -3,7 +3,7 @@ from typing import List
 
 from sqlalchemy.exc import IntegrityError
 
-from boxing.db import db
+from boxing.db import db, read_only
 from boxing.utils.logger import configure_logger
 
 
@@ -88,6 +88,7 @@ class Boxers(db.Model):
             logger.error(f"Database error during creation: {e}")
 
     @classmethod
+    @read_only
     def get_boxer_by_id(cls, boxer_id: int) -> "Boxers":
         """Retrieve a boxer by ID.
 
@@ -106,6 +107,7 @@ class Boxers(db.Model):
         pass
 
     @classmethod
+    @read_only
     def get_boxer_by_name(cls, name: str) -> "Boxers":
         """Retrieve a boxer by name.
 
@@ -167,6 +169,7 @@ class Boxers(db.Model):
         logger.info(f"Updated stats for boxer {self.name}: {self.fights} fights, {self.wins} wins.")
 
     @staticmethod
+    @read_only
     def get_leaderboard(sort_by: str = "wins") -> List[dict]:
         """Retrieve a sorted leaderboard of boxers.
 
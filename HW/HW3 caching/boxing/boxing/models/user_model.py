@@ -5,7 +5,7 @@ import os
 from flask_login import UserMixin
 from sqlalchemy.exc import IntegrityError
 
-from boxing.db import db
+from boxing.db import db, read_only
 from boxing.utils.logger import configure_logger
 
 
@@ -48,6 +48,7 @@ class Users():
             logger.error("Database error: %s", str(e))
 
     @classmethod
+    @read_only
     def check_password(cls, username: str, password: str) -> bool:
         """
         Check if a given password matches the stored password for a user.
@@ -91,6 +92,7 @@ class Users():
         pass
 
     @classmethod
+    @read_only
     def get_id_by_username(cls, username: str) -> int:
         """
         Retrieve the ID of a user by username.
@@ -0,0 +1,163 @@
+from functools import wraps
+import logging
+import threading
+from typing import Optional
+
+from flask import jsonify, make_response
+
+from boxing.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class AdmissionLimiter:
+    """
+    Caps the number of concurrent requests in a route group.
+
+    Requests beyond max_concurrent wait in a bounded queue for up to queue_timeout
+    seconds. When the queue is full, or the wait times out, the request is rejected
+    so that a slow dependency cannot hold every server thread.
+
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int = 0,
+                 queue_timeout: float = 0.0, retry_after: int = 1):
+        """Initializes the limiter.
+
+        Args:
+            name (str): The name of the route group, used in logs and stats.
+            max_concurrent (int): The number of requests allowed to run at once.
+            max_queue (int): The number of requests allowed to wait for a slot.
+            queue_timeout (float): The number of seconds a queued request waits for a slot.
+            retry_after (int): The Retry-After value (seconds) sent with rejections.
+
+        Raises:
+            ValueError: If any limit is invalid.
+
+        """
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent for '{name}' must be at least 1")
+        if max_queue < 0 or queue_timeout < 0 or retry_after < 0:
+            raise ValueError(f"max_queue, queue_timeout and retry_after for '{name}' must not be negative")
+
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    def try_acquire(self) -> bool:
+        """Tries to take a slot, waiting in the queue if there is room.
+
+        Returns:
+            bool: True if a slot was taken (release() must be called), False if rejected.
+
+        """
+        acquired = self._slots.acquire(blocking=False)
+
+        if not acquired:
+            with self._lock:
+                queue_full = self._waiting >= self.max_queue
+                if not queue_full:
+                    self._waiting += 1
+
+            if not queue_full:
+                try:
+                    acquired = self._slots.acquire(timeout=self.queue_timeout)
+                finally:
+                    with self._lock:
+                        self._waiting -= 1
+
+        with self._lock:
+            if acquired:
+                self._active += 1
+                self._admitted += 1
+            else:
+                self._rejected += 1
+
+        if not acquired:
+            logger.warning(f"Admission rejected for route group '{self.name}'")
+        return acquired
+
+    def release(self) -> None:
+        """Gives back a slot taken by try_acquire().
+
+        """
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def get_stats(self) -> dict:
+        """Returns the limiter's configuration and counters.
+
+        Returns:
+            dict: The limits, current active/waiting requests and admitted/rejected totals.
+
+        """
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+                "active": self._active,
+                "waiting": self._waiting,
+                "admitted": self._admitted,
+                "rejected": self._rejected
+            }
+
+
+def create_limiters(limits: dict) -> dict[str, AdmissionLimiter]:
+    """
+    Builds one limiter per route group from the ADMISSION_LIMITS config.
+
+    Args:
+        limits (dict): Route group names mapped to AdmissionLimiter keyword arguments.
+
+    Returns:
+        dict[str, AdmissionLimiter]: The limiters, keyed by route group.
+
+    """
+    return {name: AdmissionLimiter(name, **options) for name, options in limits.items()}
+
+
+def admission_controlled(limiter: Optional[AdmissionLimiter]):
+    """
+    Decorator that runs a route under an admission limiter.
+
+    Rejected requests get a 503 response with a Retry-After header. If limiter is
+    None (the route group is not configured), the route runs unrestricted.
+
+    Args:
+        limiter (AdmissionLimiter, optional): The limiter of the route's group.
+
+    """
+    def decorator(func):
+        if limiter is None:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not limiter.try_acquire():
+                response = make_response(jsonify({
+                    "status": "error",
+                    "message": f"Service is busy ({limiter.name}), please retry later"
+                }), 503)
+                response.headers["Retry-After"] = str(limiter.retry_after)
+                return response
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                limiter.release()
+
+        return wrapper
+    return decorator
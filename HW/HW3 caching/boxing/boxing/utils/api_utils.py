@@ -1,6 +1,12 @@
 import logging
 import os
+import secrets
+import threading
+import time
+from typing import Callable, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from boxing.utils.logger import configure_logger
 
@@ -12,28 +18,287 @@ configure_logger(logger)
 RANDOM_ORG_URL = os.getenv("RANDOM_ORG_URL",
                            "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new")
 
+# Per-attempt (connect, read) timeouts in seconds
+RANDOM_ORG_CONNECT_TIMEOUT = float(os.getenv("RANDOM_ORG_CONNECT_TIMEOUT", 1.0))
+RANDOM_ORG_READ_TIMEOUT = float(os.getenv("RANDOM_ORG_READ_TIMEOUT", 2.0))
 
-def get_random() -> float:
+# Retries after the first attempt; waits grow as backoff_factor * 2 ** (retry - 1)
+RANDOM_ORG_RETRIES = int(os.getenv("RANDOM_ORG_RETRIES", 2))
+RANDOM_ORG_BACKOFF_FACTOR = float(os.getenv("RANDOM_ORG_BACKOFF_FACTOR", 0.1))
+RANDOM_ORG_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Seconds a call may spend on all its attempts and backoff waits together; kept under the
+# 5 second timeout the client used before it retried
+RANDOM_ORG_DEADLINE = float(os.getenv("RANDOM_ORG_DEADLINE", 4.0))
+
+# Keep-alive connections kept open to random.org
+RANDOM_ORG_POOL_SIZE = int(os.getenv("RANDOM_ORG_POOL_SIZE", 10))
+
+# Consecutive failures that open the breaker, and seconds before a trial request is let through
+RANDOM_ORG_FAILURE_THRESHOLD = int(os.getenv("RANDOM_ORG_FAILURE_THRESHOLD", 5))
+RANDOM_ORG_RESET_TIMEOUT = float(os.getenv("RANDOM_ORG_RESET_TIMEOUT", 30.0))
+
+
+class CircuitBreaker:
     """
-    Fetches a random float between 0 and 1 from random.org.
+    A consecutive-failure circuit breaker.
 
-    Returns:
-        float: The random number fetched from random.org.
+    The breaker starts closed. After failure_threshold consecutive failures it opens
+    and rejects calls for reset_timeout seconds. It then lets a single trial call
+    through (half-open): success closes it again, failure reopens it.
+
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = RANDOM_ORG_FAILURE_THRESHOLD,
+                 reset_timeout: float = RANDOM_ORG_RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initializes the breaker in the closed state.
+
+        Args:
+            failure_threshold (int): The number of consecutive failures that open the breaker.
+            reset_timeout (float): The number of seconds the breaker stays open before a trial call.
+            clock (Callable[[], float]): The monotonic clock used for timing.
+
+        Raises:
+            ValueError: If failure_threshold is less than 1 or reset_timeout is negative.
+
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if reset_timeout < 0:
+            raise ValueError("reset_timeout must not be negative")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._trial_owner: Optional[int] = None
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Returns the current state of the breaker."""
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Checks whether a call may go through.
+
+        Moves an open breaker to half-open once reset_timeout has passed, admitting
+        exactly one trial call until its outcome is recorded. The calling thread owns
+        the trial until then.
+
+        Returns:
+            bool: True if the call may go through, False if it should be short-circuited.
+
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                logger.info("Circuit breaker half-open, allowing a trial request")
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trial_owner = threading.get_ident()
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """Records a successful call, closing the breaker."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit breaker closed")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
 
-    Raises:
-        ValueError: If the response from random.org is not a valid float.
-        RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
+    def record_failure(self) -> None:
+        """Records a failed call, opening the breaker if the threshold is reached."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                    logger.warning(f"Circuit breaker opened after {self._consecutive_failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
 
+    def release_trial(self) -> None:
+        """Lets another trial call through if this thread's trial ended without an outcome.
+
+        Called after every call, so an exception that is neither a success nor a counted
+        failure cannot leave the breaker waiting forever on a trial that is over. Calls
+        that did not take the trial (for example ones that started before the breaker
+        went half-open) leave it alone.
+
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trial_owner == threading.get_ident():
+                self._trial_in_flight = False
+                self._trial_owner = None
+
+    def get_stats(self) -> dict:
+        """Returns the breaker's state and counters.
+
+        Returns:
+            dict: The state, consecutive failures, times opened and seconds until a trial call.
+
+        """
+        with self._lock:
+            retry_in = None
+            if self._state == self.OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (self._clock() - self._opened_at)), 3)
+            return {
+                "state": self._state,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened,
+                "retry_in": retry_in
+            }
+
+
+class RandomOrgClient:
     """
-    try:
-        logger.info(f"Fetching random number from {RANDOM_ORG_URL}")
+    A resilient random.org client.
+
+    Requests go through a pooled keep-alive session. Connection errors, timeouts and
+    429/5xx responses are retried with exponential backoff until the call's deadline
+    runs out. Failures feed a circuit breaker; while it is open (or when a call fails)
+    numbers come from the local `secrets` generator instead, and the client reports
+    itself as degraded.
+
+    """
+
+    def __init__(self, url: str = RANDOM_ORG_URL,
+                 connect_timeout: float = RANDOM_ORG_CONNECT_TIMEOUT,
+                 read_timeout: float = RANDOM_ORG_READ_TIMEOUT,
+                 retries: int = RANDOM_ORG_RETRIES,
+                 backoff_factor: float = RANDOM_ORG_BACKOFF_FACTOR,
+                 deadline: float = RANDOM_ORG_DEADLINE,
+                 pool_size: int = RANDOM_ORG_POOL_SIZE,
+                 breaker: Optional[CircuitBreaker] = None,
+                 fallback: bool = True):
+        """Initializes the client and its connection pool.
+
+        Args:
+            url (str): The random.org decimal-fractions URL.
+            connect_timeout (float): The per-attempt connect timeout in seconds.
+            read_timeout (float): The per-attempt read timeout in seconds.
+            retries (int): The number of retries after the first attempt.
+            backoff_factor (float): The base of the exponential backoff between retries.
+            deadline (float): The most seconds a call spends on its attempts and waits.
+            pool_size (int): The number of keep-alive connections to keep open.
+            breaker (CircuitBreaker, optional): The breaker to use. Defaults to a new one.
+            fallback (bool): If True, failures fall back to the local generator instead of raising.
+
+        """
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.deadline = deadline
+        self.fallback = fallback
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+        # Retries are done in fetch() so they can stop at the deadline
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._failures = 0
+        self._fallbacks = 0
+        self._last_error: Optional[str] = None
+
+    def fetch(self) -> float:
+        """
+        Fetches a random float between 0 and 1 from random.org, with retries.
+
+        Every attempt's timeouts and every backoff wait are cut to what is left of the
+        deadline, and no retry starts once its wait would run past it.
+
+        Returns:
+            float: The random number fetched from random.org.
+
+        Raises:
+            ValueError: If the response from random.org is not a valid float.
+            RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
+
+        """
+        logger.info(f"Fetching random number from {self.url}")
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            timeout = (min(self.timeout[0], remaining), min(self.timeout[1], remaining))
+
+            try:
+                response = self._session.get(self.url, timeout=timeout)
+                if response.status_code in RANDOM_ORG_RETRY_STATUSES and attempt < self.retries:
+                    error = f"status {response.status_code}"
+                else:
+                    # Check if the request was successful
+                    response.raise_for_status()
+                    return self._parse_response(response.text)
+
+            except requests.exceptions.Timeout:
+                if attempt >= self.retries:
+                    logger.error("Request to random.org timed out.")
+                    raise RuntimeError("Request to random.org timed out.")
+                error = "timeout"
+
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.retries:
+                    logger.error(f"Request to random.org failed: {e}")
+                    raise RuntimeError(f"Request to random.org failed: {e}")
+                error = str(e)
+
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request to random.org failed: {e}")
+                raise RuntimeError(f"Request to random.org failed: {e}")
 
-        response = requests.get(RANDOM_ORG_URL, timeout=5)
+            backoff = self.backoff_factor * 2 ** attempt
+            if time.monotonic() + backoff >= deadline:
+                logger.error(f"Request to random.org timed out after {attempt + 1} attempts ({error})")
+                raise RuntimeError("Request to random.org timed out.")
 
-        # Check if the request was successful
-        response.raise_for_status()
+            attempt += 1
+            logger.warning(f"Retrying request to random.org ({attempt}/{self.retries}) after {error}")
+            time.sleep(backoff)
 
-        random_number_str = response.text.strip()
+    def _parse_response(self, text: str) -> float:
+        """Parses the body of a random.org decimal-fractions response.
+
+        Args:
+            text (str): The response body.
+
+        Returns:
+            float: The random number.
+
+        Raises:
+            ValueError: If the body is not a float between 0 and 1.
+
+        """
+        random_number_str = text.strip()
 
         try:
             random_number = float(random_number_str)
@@ -41,16 +306,147 @@ def get_random() -> float:
             logger.error(f"Invalid response from random.org: {random_number_str}")
             raise ValueError(f"Invalid response from random.org: {random_number_str}")
 
+        if not 0 <= random_number <= 1:
+            logger.error(f"Invalid response from random.org: {random_number_str}")
+            raise ValueError(f"Invalid response from random.org: {random_number_str}")
+
         logger.debug(f"Received random number: {random_number:.3f}")
         logger.info(f"Successfully fetched random number")
 
         return random_number
 
-    except requests.exceptions.Timeout:
-        logger.error("Request to random.org timed out.")
-        raise RuntimeError("Request to random.org timed out.")
+    def get_random(self) -> float:
+        """
+        Returns a random float between 0 and 1, from random.org if it is available.
+
+        Returns:
+            float: The random number.
+
+        Raises:
+            ValueError: If fallback is disabled and random.org returns an invalid response.
+            RuntimeError: If fallback is disabled and random.org is unavailable.
+
+        """
+        if not self.breaker.allow_request():
+            if not self.fallback:
+                raise RuntimeError("Circuit breaker is open, random.org is unavailable")
+            return self._fallback_random("circuit breaker is open")
+
+        with self._lock:
+            self._requests += 1
+
+        try:
+            random_number = self.fetch()
+        except (RuntimeError, ValueError) as e:
+            self.breaker.record_failure()
+            with self._lock:
+                self._failures += 1
+                self._last_error = str(e)
+            if not self.fallback:
+                raise
+            return self._fallback_random(str(e))
+        else:
+            self.breaker.record_success()
+        finally:
+            self.breaker.release_trial()
+
+        return random_number
+
+    def _fallback_random(self, reason: str) -> float:
+        """Returns a random float between 0 and 1 from the local `secrets` generator.
+
+        The value has two decimals, like the random.org decimal fractions it replaces.
+
+        Args:
+            reason (str): Why random.org was not used, for the log.
+
+        Returns:
+            float: The random number.
+
+        """
+        with self._lock:
+            self._fallbacks += 1
+        logger.warning(f"Using local random number generator: {reason}")
+        return secrets.randbelow(100) / 100
+
+    def is_degraded(self) -> bool:
+        """Returns True if random.org is currently being bypassed or probed."""
+        return self.breaker.state != CircuitBreaker.CLOSED
+
+    def get_stats(self) -> dict:
+        """Returns the client's counters and breaker state.
+
+        Returns:
+            dict: Whether the client is degraded, request/failure/fallback totals,
+                the last error and the breaker stats.
+
+        """
+        with self._lock:
+            stats = {
+                "degraded": self.is_degraded(),
+                "requests": self._requests,
+                "failures": self._failures,
+                "fallbacks": self._fallbacks,
+                "last_error": self._last_error
+            }
+        stats["circuit_breaker"] = self.breaker.get_stats()
+        return stats
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self._session.close()
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request to random.org failed: {e}")
-        raise RuntimeError(f"Request to random.org failed: {e}")
 
+_client: Optional[RandomOrgClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> RandomOrgClient:
+    """
+    Returns the shared random.org client, creating it on first use.
+
+    Returns:
+        RandomOrgClient: The shared client.
+
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = RandomOrgClient()
+        return _client
+
+
+def configure_client(**options) -> RandomOrgClient:
+    """
+    Replaces the shared random.org client with one built from the given options.
+
+    Args:
+        **options: RandomOrgClient keyword arguments; failure_threshold and
+            reset_timeout configure the circuit breaker.
+
+    Returns:
+        RandomOrgClient: The new shared client.
+
+    """
+    global _client
+    breaker_options = {key: options.pop(key) for key in ("failure_threshold", "reset_timeout") if key in options}
+    client = RandomOrgClient(breaker=CircuitBreaker(**breaker_options), **options)
+
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None:
+        previous.close()
+    return client
+
+
+def get_random() -> float:
+    """
+    Returns a random float between 0 and 1 from the shared random.org client.
+
+    Falls back to the local `secrets` generator while random.org is unavailable.
+
+    Returns:
+        float: The random number.
+
+    """
+    return get_client().get_random()
@@ -14,7 +14,57 @@ class ProductionConfig():
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
 
+    # Applied to every new SQLite connection. WAL lets readers run alongside a writer,
+    # and synchronous=NORMAL is durable under WAL while skipping the fsync on every commit.
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -20000)),  # Negative values are KiB, so ~20MB
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),  # 256MB
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),  # Milliseconds
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+    SQLITE_WAL_CHECKPOINT_INTERVAL = int(os.getenv("SQLITE_WAL_CHECKPOINT_INTERVAL", 300))  # Seconds, 0 disables
+
+    # Read-only engine used by read-only model methods. Defaults to a mode=ro
+    # connection to the primary SQLite file when unset; set to "" to disable.
+    SQLALCHEMY_READONLY_DATABASE_URI = os.getenv("READONLY_DATABASE_URL")
+
+    # Concurrency limits per route group. Routes that call random.org are capped so
+    # that a slow upstream cannot tie up every server thread.
+    ADMISSION_LIMITS = {
+        "random_org": {
+            "max_concurrent": int(os.getenv("RANDOM_ORG_MAX_CONCURRENT", 4)),
+            "max_queue": int(os.getenv("RANDOM_ORG_MAX_QUEUE", 8)),
+            "queue_timeout": float(os.getenv("RANDOM_ORG_QUEUE_TIMEOUT", 1.0)),
+            "retry_after": int(os.getenv("RANDOM_ORG_RETRY_AFTER", 5)),
+        },
+    }
+
+    # Overrides for the shared random.org client (timeouts, retries, deadline, pool size and
+    # circuit breaker). Unset options come from the RANDOM_ORG_* environment variables.
+    RANDOM_ORG_CLIENT = {}
+
+    # Encoded GET responses are cached in an LRU of at most RESPONSE_CACHE_MAX_BYTES body bytes.
+    # Writes in this process invalidate them at once; RESPONSE_CACHE_TTL bounds how long
+    # another worker's writes can go unseen.
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 5))
+
 class TestConfig():
     """Testing configuration."""
     TESTING = True
+    SECRET_KEY = "test-secret-key"
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    SQLITE_PRAGMAS = {
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    }
+    SQLITE_WAL_CHECKPOINT_INTERVAL = 0
+    SQLALCHEMY_READONLY_DATABASE_URI = ""
+    ADMISSION_LIMITS = {
+        "random_org": {"max_concurrent": 4, "max_queue": 8, "queue_timeout": 1.0, "retry_after": 5},
+    }
+    RANDOM_ORG_CLIENT = {"retries": 0, "failure_threshold": 3, "reset_timeout": 30.0}
+    RESPONSE_CACHE_MAX_BYTES = 1024 * 1024
+    RESPONSE_CACHE_TTL = 5
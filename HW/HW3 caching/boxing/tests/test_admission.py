@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+from flask import Flask, jsonify, make_response
+
+from boxing.utils.admission import AdmissionLimiter, admission_controlled, create_limiters
+
+
+##########################################################
+# Limiter
+##########################################################
+
+
+def test_limiter_admits_up_to_max_concurrent():
+    """Test that requests are admitted until every slot is taken."""
+    limiter = AdmissionLimiter("test", max_concurrent=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    stats = limiter.get_stats()
+    assert stats["active"] == 2
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == 1
+
+
+def test_limiter_release_frees_slot():
+    """Test that releasing a slot lets the next request in."""
+    limiter = AdmissionLimiter("test", max_concurrent=1)
+
+    assert limiter.try_acquire()
+    limiter.release()
+
+    assert limiter.try_acquire()
+
+
+def test_limiter_queued_request_gets_released_slot():
+    """Test that a queued request is admitted when a slot frees up before its timeout."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=5)
+    limiter.try_acquire()
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limiter.try_acquire()))
+    waiter.start()
+    while limiter.get_stats()["waiting"] == 0:
+        pass
+    limiter.release()
+    waiter.join()
+
+    assert results == [True]
+
+
+def test_limiter_queue_timeout():
+    """Test that a queued request is rejected when its wait times out."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    limiter.try_acquire()
+
+    assert not limiter.try_acquire()
+    assert limiter.get_stats()["waiting"] == 0
+
+
+def test_limiter_rejects_when_queue_full():
+    """Test that requests are rejected immediately when the queue is full."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=0, queue_timeout=5)
+    limiter.try_acquire()
+
+    assert not limiter.try_acquire()
+
+
+@pytest.mark.parametrize("options", [
+    {"max_concurrent": 0},
+    {"max_concurrent": 1, "max_queue": -1},
+])
+def test_limiter_invalid_limits(options):
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        AdmissionLimiter("test", **options)
+
+
+def test_create_limiters():
+    """Test building limiters from the ADMISSION_LIMITS config."""
+    limiters = create_limiters({"a": {"max_concurrent": 1}, "b": {"max_concurrent": 3, "max_queue": 2}})
+
+    assert limiters["b"].max_concurrent == 3
+    assert limiters["b"].max_queue == 2
+
+
+##########################################################
+# Admission Controlled Routes
+##########################################################
+
+
+@pytest.fixture
+def fight_app():
+    """A small app with a fight route behind the random_org limiter.
+
+    The boxing login and ring models are still skeletons, so the decorator is
+    exercised on its own rather than through the real /api/fight route.
+    """
+    flask_app = Flask(__name__)
+    limiter = AdmissionLimiter("random_org", max_concurrent=1, max_queue=0, retry_after=2)
+    fights = []
+
+    @flask_app.route("/api/fight")
+    @admission_controlled(limiter)
+    def bout():
+        fights.append(limiter.get_stats()["active"])
+        return make_response(jsonify({"status": "success", "winner": "Muhammad Ali"}), 200)
+
+    return flask_app, limiter, fights
+
+
+def test_fight_rejected_when_saturated(fight_app):
+    """Test that a saturated route group returns 503 with Retry-After."""
+    flask_app, limiter, fights = fight_app
+    limiter.try_acquire()
+
+    response = flask_app.test_client().get("/api/fight")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert fights == []
+
+
+def test_fight_admitted_and_released(fight_app):
+    """Test that an admitted request runs the route and gives its slot back."""
+    flask_app, limiter, fights = fight_app
+
+    response = flask_app.test_client().get("/api/fight")
+
+    assert response.status_code == 200
+    assert fights == [1]
+    assert limiter.get_stats()["active"] == 0
+    assert limiter.get_stats()["admitted"] == 1
+
+
+def test_unconfigured_group_is_unrestricted():
+    """Test that a route whose group has no limits runs without a limiter."""
+    def bout():
+        return "Muhammad Ali"
+
+    assert admission_controlled(None)(bout) is bout
@@ -1,60 +1,407 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
 import pytest
-import requests
 
-from boxing.utils.api_utils import get_random
+from boxing.utils import api_utils
+from boxing.utils.api_utils import CircuitBreaker, RandomOrgClient, configure_client, get_random
 
 
 RANDOM_NUMBER = 0.42
 
 
+class StubRandomOrg:
+    """A local HTTP server that answers like random.org's decimal-fractions endpoint.
+
+    Responses are taken from a queue of (status, body, delay) tuples; once the queue
+    is empty every request gets the default response.
+
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.default = (200, f"{RANDOM_NUMBER}\n", 0.0)
+        self.requests = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.connections.add(self.client_address)
+                    status, body, delay = stub.responses.pop(0) if stub.responses else stub.default
+                if delay:
+                    time.sleep(delay)
+                payload = body.encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/plain")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except OSError:
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/decimal-fractions/"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_random_org():
+    """Fixture providing a running local random.org stub."""
+    stub = StubRandomOrg()
+    stub.start()
+    yield stub
+    stub.stop()
+
+
 @pytest.fixture
-def mock_random_org(mocker):
-    # Patch the requests.get call
-    # requests.get returns an object, which we have replaced with a mock object
-    mock_response = mocker.Mock()
-    # We are giving that object a text attribute
-    mock_response.text = f"{RANDOM_NUMBER}"
-    mocker.patch("requests.get", return_value=mock_response)
-    return mock_response
+def make_client(stub_random_org):
+    """Fixture building clients against the stub with fast, deterministic settings."""
+    clients = []
+
+    def make(**options):
+        options.setdefault("retries", 0)
+        options.setdefault("backoff_factor", 0)
+        options.setdefault("read_timeout", 1.0)
+        client = RandomOrgClient(url=stub_random_org.url, **options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
 
-def test_get_random(mock_random_org):
-    """Test retrieving a random number from random.org.
+##########################################################
+# Fetching
+##########################################################
+
+
+def test_get_random(make_client):
+    """Test retrieving a random number from the random.org stub.
 
     """
-    result = get_random()
+    client = make_client()
+
+    result = client.get_random()
 
-    # Assert that the result is the mocked random number
     assert result == RANDOM_NUMBER, f"Expected random number {RANDOM_NUMBER}, but got {result}"
+    assert client.get_stats()["requests"] == 1
+    assert client.get_stats()["fallbacks"] == 0
+
+
+def test_get_random_reuses_connection(stub_random_org, make_client):
+    """Test that consecutive calls share one keep-alive connection.
+
+    """
+    client = make_client()
+
+    for _ in range(5):
+        client.get_random()
 
-    # Ensure that the correct URL was called
-    requests.get.assert_called_once_with("https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new", timeout=5)
+    assert stub_random_org.requests == 5
+    assert len(stub_random_org.connections) == 1
 
-def test_get_random_request_failure(mocker):
-    """Test handling of a request failure when calling random.org.
+
+def test_get_random_retries_server_errors(stub_random_org, make_client):
+    """Test that 5xx responses are retried until one succeeds.
+
+    """
+    stub_random_org.responses = [(503, "busy", 0), (500, "error", 0)]
+    client = make_client(retries=2)
+
+    assert client.get_random() == RANDOM_NUMBER
+    assert stub_random_org.requests == 3
+    assert client.get_stats()["fallbacks"] == 0
+
+
+def test_get_random_request_failure(stub_random_org, make_client):
+    """Test handling of a request failure once the retries are used up.
 
     """
-    # Simulate a request failure
-    mocker.patch("requests.get", side_effect=requests.exceptions.RequestException("Connection error"))
+    stub_random_org.default = (503, "busy", 0)
+    client = make_client(retries=1, fallback=False)
 
-    with pytest.raises(RuntimeError, match="Request to random.org failed: Connection error"):
-        get_random()
+    with pytest.raises(RuntimeError, match="Request to random.org failed"):
+        client.get_random()
+    assert stub_random_org.requests == 2
 
-def test_get_random_timeout(mocker):
+
+def test_get_random_timeout(stub_random_org, make_client):
     """Test handling of a timeout when calling random.org.
 
     """
-    # Simulate a timeout
-    mocker.patch("requests.get", side_effect=requests.exceptions.Timeout)
+    stub_random_org.default = (200, f"{RANDOM_NUMBER}", 0.5)
+    client = make_client(read_timeout=0.1, fallback=False)
+
+    with pytest.raises(RuntimeError, match="Request to random.org timed out."):
+        client.get_random()
+
+
+def test_get_random_stops_retrying_at_deadline(stub_random_org, make_client):
+    """Test that retries and backoff waits stop at the call's deadline.
+
+    """
+    stub_random_org.default = (200, f"{RANDOM_NUMBER}", 0.5)
+    client = make_client(read_timeout=1.0, retries=5, backoff_factor=0.1, deadline=0.3, fallback=False)
 
+    start = time.monotonic()
     with pytest.raises(RuntimeError, match="Request to random.org timed out."):
-        get_random()
+        client.get_random()
+
+    assert time.monotonic() - start < 0.5
+    assert stub_random_org.requests == 1
+
+
+def test_get_random_skips_backoff_past_deadline(stub_random_org, make_client):
+    """Test that a retry whose backoff would end after the deadline is not attempted.
 
-def test_get_random_invalid_response(mock_random_org):
+    """
+    stub_random_org.default = (503, "busy", 0)
+    client = make_client(retries=3, backoff_factor=1.0, deadline=0.5, fallback=False)
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        client.get_random()
+
+    assert stub_random_org.requests == 1
+
+
+def test_get_random_invalid_response(stub_random_org, make_client):
     """Test handling of an invalid response from random.org.
 
     """
-    # Simulate an invalid response (non-digit)
-    mock_random_org.text = "invalid_response"
+    stub_random_org.default = (200, "invalid_response", 0)
+    client = make_client(fallback=False)
 
     with pytest.raises(ValueError, match="Invalid response from random.org: invalid_response"):
-        get_random()
+        client.get_random()
+
+
+def test_get_random_out_of_range_response(stub_random_org, make_client):
+    """Test that a number outside [0, 1] is rejected.
+
+    """
+    stub_random_org.default = (200, "7", 0)
+    client = make_client(fallback=False)
+
+    with pytest.raises(ValueError, match="Invalid response from random.org: 7"):
+        client.get_random()
+
+
+##########################################################
+# Fallback and Circuit Breaker
+##########################################################
+
+
+def test_get_random_falls_back_on_failure(stub_random_org, make_client):
+    """Test that a failed call returns a local random number instead of raising.
+
+    """
+    stub_random_org.default = (500, "error", 0)
+    client = make_client()
+
+    result = client.get_random()
+
+    assert 0 <= result < 1
+    stats = client.get_stats()
+    assert stats["failures"] == 1
+    assert stats["fallbacks"] == 1
+    assert "500" in stats["last_error"]
+
+
+def test_breaker_opens_and_skips_random_org(stub_random_org, make_client):
+    """Test that once the breaker opens, calls no longer reach random.org.
+
+    """
+    stub_random_org.default = (500, "error", 0)
+    client = make_client(breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    client.get_random()
+    client.get_random()
+    assert client.is_degraded()
+
+    for _ in range(3):
+        assert 0 <= client.get_random() < 1
+
+    assert stub_random_org.requests == 2
+    stats = client.get_stats()
+    assert stats["degraded"] is True
+    assert stats["fallbacks"] == 5
+    assert stats["circuit_breaker"]["state"] == CircuitBreaker.OPEN
+    assert stats["circuit_breaker"]["times_opened"] == 1
+
+
+def test_breaker_open_without_fallback_raises(stub_random_org, make_client):
+    """Test that an open breaker raises when fallback is disabled.
+
+    """
+    stub_random_org.default = (500, "error", 0)
+    client = make_client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60), fallback=False)
+
+    with pytest.raises(RuntimeError):
+        client.get_random()
+    with pytest.raises(RuntimeError, match="Circuit breaker is open"):
+        client.get_random()
+
+
+def test_breaker_recovers_after_reset_timeout(stub_random_org, make_client):
+    """Test that a successful trial call after the reset timeout closes the breaker.
+
+    """
+    clock = FakeClock()
+    stub_random_org.responses = [(500, "error", 0)]
+    client = make_client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock))
+
+    client.get_random()
+    assert client.is_degraded()
+
+    clock.now = 10
+    assert client.get_random() == RANDOM_NUMBER
+    assert not client.is_degraded()
+    assert stub_random_org.requests == 2
+
+
+def test_breaker_half_open_allows_single_trial():
+    """Test that a half-open breaker admits one trial call at a time.
+
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+
+    assert not breaker.allow_request()
+
+    clock.now = 5
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_failed_trial_reopens():
+    """Test that a failed trial call reopens the breaker for another reset timeout.
+
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 5
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_stats()["retry_in"] == 5
+    assert breaker.get_stats()["times_opened"] == 2
+
+
+def test_breaker_trial_released_on_uncounted_error(make_client, monkeypatch):
+    """Test that a trial call raising an uncounted exception does not block later trials.
+
+    """
+    clock = FakeClock()
+    client = make_client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock))
+    client.breaker.record_failure()
+    clock.now = 5
+
+    def broken_fetch():
+        raise KeyError("unexpected")
+
+    monkeypatch.setattr(client, "fetch", broken_fetch)
+    with pytest.raises(KeyError):
+        client.get_random()
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+
+    monkeypatch.undo()
+    assert client.get_random() == RANDOM_NUMBER
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_trial_released_only_by_its_owner():
+    """Test that a call that did not take the half-open trial cannot free its slot.
+
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5
+
+    trial = threading.Thread(target=breaker.allow_request)
+    trial.start()
+    trial.join()
+
+    # A call that started before the breaker went half-open finishes on this thread
+    breaker.release_trial()
+
+    assert not breaker.allow_request()
+
+
+def test_breaker_success_resets_failure_count():
+    """Test that a success in between failures keeps the breaker closed.
+
+    """
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_invalid_settings():
+    """Test that invalid breaker settings are rejected.
+
+    """
+    with pytest.raises(ValueError, match="failure_threshold"):
+        CircuitBreaker(failure_threshold=0)
+    with pytest.raises(ValueError, match="reset_timeout"):
+        CircuitBreaker(reset_timeout=-1)
+
+
+##########################################################
+# Shared Client
+##########################################################
+
+
+def test_configure_client_replaces_shared_client(stub_random_org, monkeypatch):
+    """Test that get_random uses the client installed by configure_client.
+
+    """
+    monkeypatch.setattr(api_utils, "_client", None)
+
+    client = configure_client(url=stub_random_org.url, retries=0, failure_threshold=4, reset_timeout=1)
+
+    assert api_utils.get_client() is client
+    assert client.breaker.failure_threshold == 4
+    assert get_random() == RANDOM_NUMBER
+    client.close()
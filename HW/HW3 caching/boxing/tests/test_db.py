@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import TestConfig
+from boxing.db import db, get_readonly_engine, readonly_session
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """Fixture providing an app backed by a SQLite file, with a derived read-only engine."""
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+        SQLALCHEMY_READONLY_DATABASE_URI = None
+        SQLITE_PRAGMAS = {"journal_mode": "WAL", "busy_timeout": 5000}
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_readonly_engine_derived_from_sqlite_file(file_app):
+    """Test that a mode=ro engine is created for a file-backed database."""
+    engine = get_readonly_engine()
+    assert engine.url.query["mode"] == "ro"
+    assert engine.url.database == f"file:{db.engine.url.database}"
+
+
+def test_no_readonly_engine_for_memory_database(app):
+    """Test that the in-memory test database does not get a read-only engine."""
+    assert get_readonly_engine() is None
+    with readonly_session() as session:
+        assert session.get_bind() is db.engine
+
+
+def test_readonly_session_routes_reads(file_app):
+    """Test that reads inside a read-only block use the read-only engine."""
+    with readonly_session() as session:
+        assert session.get_bind() is get_readonly_engine()
+    assert db.session.get_bind() is db.engine
+
+
+def test_readonly_engine_rejects_writes(file_app):
+    """Test that the read-only engine cannot be used to write."""
+    with pytest.raises(OperationalError):
+        with get_readonly_engine().begin() as conn:
+            conn.exec_driver_sql("DELETE FROM boxers")
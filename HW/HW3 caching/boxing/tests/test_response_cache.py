@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+from flask import Flask, jsonify, make_response, request
+
+from boxing.utils.response_cache import ResponseCache, WriteCounter, count_writes
+
+
+##########################################################
+# Write Counter
+##########################################################
+
+
+def test_write_counter_bump():
+    """Test that each bump raises the count by one."""
+    counter = WriteCounter()
+
+    assert counter.value == 0
+    assert counter.bump() == 1
+    assert counter.bump() == 2
+    assert counter.value == 2
+
+
+def test_write_counter_concurrent_bumps():
+    """Test that bumps from many request threads are never lost."""
+    counter = WriteCounter()
+    barrier = threading.Barrier(8, timeout=2)
+
+    def worker():
+        barrier.wait()
+        for _ in range(1000):
+            counter.bump()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 8000
+
+
+##########################################################
+# Response Cache
+##########################################################
+
+
+def test_evicts_least_recently_used_leaderboard():
+    """Test that the least recently read leaderboard is evicted once the size limit is hit."""
+    cache = ResponseCache(max_bytes=20, max_entry_bytes=10)
+    cache.put("wins", b'{"wins":1}', 200, "application/json")
+    cache.put("win_pct", b'{"pct":1}', 200, "application/json")
+    cache.get("wins")
+    cache.put("wins-2", b'{"wins":2}', 200, "application/json")
+
+    assert cache.get("win_pct") is None
+    assert cache.get("wins") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+##########################################################
+# Cached Routes
+##########################################################
+
+
+@pytest.fixture
+def boxing_app():
+    """A small app wired like the boxing app's cached routes.
+
+    The boxing login, boxer and ring models are still skeletons, so the routes only
+    record how often they run.
+    """
+    flask_app = Flask(__name__)
+    cache = ResponseCache(max_bytes=1024)
+    writes = count_writes(flask_app, write_endpoints=("bout",))
+    state = {"leaderboards": 0}
+
+    @flask_app.route("/api/leaderboard")
+    @cache.cached(version=lambda: writes.value, ttl=5)
+    def get_leaderboard():
+        state["leaderboards"] += 1
+        if request.args.get("sort", "wins") not in ("wins", "win_pct"):
+            return make_response(jsonify({"status": "error"}), 400)
+        return make_response(jsonify({"status": "success", "leaderboard": []}), 200)
+
+    @flask_app.route("/api/add-boxer", methods=["POST"])
+    def add_boxer():
+        status = 201 if request.get_json().get("name") else 400
+        return make_response(jsonify({}), status)
+
+    @flask_app.route("/api/fight")
+    def bout():
+        return make_response(jsonify({"winner": "Muhammad Ali"}), 200)
+
+    return flask_app, cache, writes, state
+
+
+def test_leaderboard_served_from_cache(boxing_app):
+    """Test that a repeated leaderboard request does not rebuild the leaderboard."""
+    flask_app, _, _, state = boxing_app
+    client = flask_app.test_client()
+
+    first = client.get("/api/leaderboard?sort=wins")
+    second = client.get("/api/leaderboard?sort=wins")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+    assert state["leaderboards"] == 1
+
+
+def test_leaderboard_sort_cached_separately(boxing_app):
+    """Test that each sort order gets its own cache entry."""
+    flask_app, _, _, state = boxing_app
+    client = flask_app.test_client()
+
+    client.get("/api/leaderboard?sort=wins")
+    client.get("/api/leaderboard?sort=win_pct")
+
+    assert state["leaderboards"] == 2
+
+
+def test_invalid_leaderboard_sort_not_cached(boxing_app):
+    """Test that a 400 for an invalid sort is not cached."""
+    flask_app, cache, _, _ = boxing_app
+    client = flask_app.test_client()
+    client.get("/api/leaderboard?sort=age")
+
+    assert client.get("/api/leaderboard?sort=age").headers["X-Cache"] == "MISS"
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_successful_write_invalidates_cache(boxing_app):
+    """Test that a successful write makes the next leaderboard request miss."""
+    flask_app, _, writes, _ = boxing_app
+    client = flask_app.test_client()
+    client.get("/api/leaderboard")
+
+    assert client.post("/api/add-boxer", json={"name": "Muhammad Ali"}).status_code == 201
+
+    assert writes.value == 1
+    assert client.get("/api/leaderboard").headers["X-Cache"] == "MISS"
+
+
+def test_failed_write_keeps_cache(boxing_app):
+    """Test that a rejected write does not invalidate cached responses."""
+    flask_app, _, writes, _ = boxing_app
+    client = flask_app.test_client()
+    client.get("/api/leaderboard")
+
+    assert client.post("/api/add-boxer", json={}).status_code == 400
+
+    assert writes.value == 0
+    assert client.get("/api/leaderboard").headers["X-Cache"] == "HIT"
+
+
+def test_bout_invalidates_cache(boxing_app):
+    """Test that a fight, a GET that records results, counts as a write."""
+    flask_app, _, writes, _ = boxing_app
+    client = flask_app.test_client()
+    client.get("/api/leaderboard")
+
+    assert client.get("/api/fight").status_code == 200
+
+    assert writes.value == 1
+    assert client.get("/api/leaderboard").headers["X-Cache"] == "MISS"
@@ -1,14 +1,35 @@
+import atexit
+import importlib
+import os
+
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, jsonify, make_response, Response, request, stream_with_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 
 from config import ProductionConfig
 
-from playlist.db import db
+from playlist.db import db, init_readonly_engine
+from playlist.models.play_model import MAX_LEADERBOARD_LIMIT, PlayTracker, Plays, SongHotScores
 from playlist.models.song_model import Songs
-from playlist.models.playlist_model import PlaylistModel
+from playlist.models.playlist_model import PlaylistModel, SongCacheRefresher
+from playlist.models.radio_model import RadioModel
 from playlist.models.user_model import Users
+from playlist.utils.admission import admission_controlled, create_limiters
 from playlist.utils.logger import configure_logger
+from playlist.utils.ndjson_utils import iter_gzip_ndjson, iter_ndjson
+from playlist.utils.sql_utils import (
+    WalCheckpointer,
+    compute_schema_version,
+    get_readonly_pragmas,
+    get_readonly_sqlite_uri,
+    get_schema_version,
+    register_sqlite_pragmas,
+    set_schema_version
+)
+from playlist.utils.response_cache import ResponseCache
+from playlist.utils.snapshot import CacheSnapshotter
+from playlist.utils.startup import StartupTimer, start_warmup
+from playlist.utils import memory_utils
 
 
 load_dotenv()
@@ -24,15 +45,65 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Flask app: The configured Flask application.
 
     """
+    startup_timer = StartupTimer()
+
     app = Flask(__name__)
     configure_logger(app.logger)
 
     app.config.from_object(config_class)
+    app.extensions["startup_timer"] = startup_timer
 
     # Initialize database
-    db.init_app(app)
+    with startup_timer.phase("db_init"):
+        db.init_app(app)
+
     with app.app_context():
-        db.create_all()
+        with startup_timer.phase("db_engines"):
+            sqlite_pragmas = app.config.get("SQLITE_PRAGMAS", {})
+            register_sqlite_pragmas(db.engine, sqlite_pragmas)
+
+            # Route read-only model methods to a separate engine if one is available
+            readonly_uri = app.config.get("SQLALCHEMY_READONLY_DATABASE_URI")
+            if readonly_uri is None:
+                readonly_uri = get_readonly_sqlite_uri(db.engine.url)
+            if readonly_uri:
+                readonly_engine = init_readonly_engine(app, readonly_uri)
+                register_sqlite_pragmas(readonly_engine, get_readonly_pragmas(sqlite_pragmas))
+
+        with startup_timer.phase("schema"):
+            # The schema version is stored in the database, so restarts against an
+            # up-to-date database skip the table, index and trigger checks entirely
+            schema_version = compute_schema_version(
+                db.metadata, db.engine.dialect, Songs.get_extra_ddl()
+            )
+            if app.config.get("SCHEMA_VERSION_CHECK", True) and get_schema_version(db.engine) == schema_version:
+                app.logger.info(f"Database schema is current (version {schema_version}), skipping create_all")
+            else:
+                db.create_all()
+                Songs.ensure_indexes()
+                Songs.ensure_search_index()
+                Songs.ensure_catalog_version()
+                set_schema_version(db.engine, schema_version)
+
+        checkpoint_interval = app.config.get("SQLITE_WAL_CHECKPOINT_INTERVAL", 0)
+        if checkpoint_interval > 0 and db.engine.dialect.name == "sqlite":
+            checkpointer = WalCheckpointer(db.engine, checkpoint_interval)
+            checkpointer.start()
+            app.extensions["wal_checkpointer"] = checkpointer
+
+        with startup_timer.phase("play_counters"):
+            # Plays are written in batches; the rolling leaderboard counters are rebuilt
+            # from the plays table so they survive restarts
+            play_tracker = PlayTracker(
+                db.engine,
+                flush_interval=app.config.get("PLAY_FLUSH_INTERVAL", 0),
+                batch_size=app.config.get("PLAY_FLUSH_BATCH_SIZE", 500)
+            )
+            play_tracker.load_recent()
+            if play_tracker.flush_interval > 0:
+                play_tracker.start()
+                atexit.register(play_tracker.stop)
+            app.extensions["play_tracker"] = play_tracker
 
     # Initialize login manager
     login_manager = LoginManager()
@@ -41,7 +112,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.query.filter_by(username=user_id).first()
+        return Users.get_cached_user(user_id)
 
     @login_manager.unauthorized_handler
     def unauthorized():
@@ -50,7 +121,55 @@ def create_app(config_class=ProductionConfig) -> Flask:
             "message": "Authentication required"
         }), 401)
 
-    playlist_model = PlaylistModel()
+    playlist_model = PlaylistModel(play_tracker=play_tracker)
+
+    # Repeated GET reads are served as stored bytes until the data they read changes
+    response_cache = ResponseCache(app.config.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    app.extensions["response_cache"] = response_cache
+    response_cache_ttl = app.config.get("RESPONSE_CACHE_TTL", 5)
+
+    # Catalog responses include play counts, so plays must invalidate them too
+    def catalog_version():
+        return Songs.get_catalog_version(include_play_counts=True)
+
+    def playlist_version():
+        return playlist_model.get_state_version(), catalog_version()
+
+    refresh_interval = app.config.get("SONG_CACHE_REFRESH_INTERVAL", 0)
+    if refresh_interval > 0:
+        song_cache_refresher = SongCacheRefresher(
+            app,
+            playlist_model,
+            interval_seconds=refresh_interval,
+            window_seconds=app.config.get("SONG_CACHE_REFRESH_WINDOW", 15),
+            budget=app.config.get("SONG_CACHE_REFRESH_BUDGET", 200)
+        )
+        song_cache_refresher.start()
+        atexit.register(song_cache_refresher.stop)
+        app.extensions["song_cache_refresher"] = song_cache_refresher
+
+    snapshot_path = app.config.get("SONG_CACHE_SNAPSHOT_PATH")
+    if snapshot_path:
+        # Restart with the previous process's song cache, revalidated against the catalog
+        with startup_timer.phase("song_cache_snapshot"):
+            with app.app_context():
+                try:
+                    Songs.load_cache_snapshot(snapshot_path)
+                except Exception as e:
+                    app.logger.error(f"Failed to load the song cache snapshot: {e}")
+
+        song_cache_snapshotter = CacheSnapshotter(
+            app,
+            lambda: Songs.save_cache_snapshot(snapshot_path),
+            interval_seconds=app.config.get("SONG_CACHE_SNAPSHOT_INTERVAL", 0)
+        )
+        song_cache_snapshotter.start()
+        atexit.register(song_cache_snapshotter.stop)
+        app.extensions["song_cache_snapshotter"] = song_cache_snapshotter
+    radio_model = RadioModel()
+
+    admission_limiters = create_limiters(app.config.get("ADMISSION_LIMITS", {}))
+    app.extensions["admission_limiters"] = admission_limiters
 
     @app.route('/api/health', methods=['GET'])
     def healthcheck() -> Response:
@@ -243,6 +362,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             with app.app_context():
                 Users.__table__.drop(db.engine)
                 Users.__table__.create(db.engine)
+                Users.clear_user_cache()
             app.logger.info("Users table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
@@ -278,6 +398,12 @@ def create_app(config_class=ProductionConfig) -> Flask:
             with app.app_context():
                 Songs.__table__.drop(db.engine)
                 Songs.__table__.create(db.engine)
+                Songs.clear_song_cache()
+                # Play history and hot scores refer to the old song IDs, which the new table reuses
+                play_tracker.clear()
+                for table in (Plays.__table__, SongHotScores.__table__):
+                    table.drop(db.engine)
+                    table.create(db.engine)
             app.logger.info("Songs table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
@@ -412,6 +538,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-all-songs-from-catalog', methods=['GET'])
     @login_required
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
     def get_all_songs() -> Response:
         """Route to retrieve all songs in the catalog (non-deleted), with an option to sort by play count.
 
@@ -450,8 +577,128 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/export-songs', methods=['GET'])
+    @login_required
+    def export_songs() -> Response:
+        """Route to download the whole catalog as gzip-compressed NDJSON.
+
+        The response is streamed from a database cursor, so memory use does not depend
+        on the size of the catalog.
+
+        Returns:
+            A gzip NDJSON attachment with one song per line.
+
+        """
+        app.logger.info("Received request to export the song catalog")
+
+        return Response(
+            stream_with_context(iter_gzip_ndjson(Songs.export_songs())),
+            mimetype="application/gzip",
+            headers={"Content-Disposition": "attachment; filename=songs.ndjson.gz"}
+        )
+
+
+    @app.route('/api/import-songs', methods=['POST'])
+    @login_required
+    def import_songs() -> Response:
+        """Route to add songs from an NDJSON upload, such as the output of /api/export-songs.
+
+        The request body is read as a stream and inserted in batches within one transaction.
+        Songs whose ID or compound key already exists are skipped.
+
+        Expected Input:
+            - A gzip-compressed NDJSON body, or plain NDJSON if the Content-Type is application/x-ndjson.
+
+        Returns:
+            JSON response with the number of songs imported and skipped.
+
+        Raises:
+            400 error if the body is malformed or any song is invalid (nothing is imported).
+            500 error if there is an issue importing the songs.
+
+        """
+        app.logger.info("Received request to import songs")
+
+        try:
+            compressed = request.mimetype != "application/x-ndjson"
+            results = Songs.import_songs(iter_ndjson(request.stream, compressed=compressed))
+
+            app.logger.info(f"Imported {results['imported']} songs, skipped {results['skipped']}")
+            return make_response(jsonify({
+                "status": "success",
+                **results
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Rejected song import: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to import songs: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while importing songs",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/catalog-stats', methods=['GET'])
+    @login_required
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
+    def get_catalog_stats() -> Response:
+        """Route to retrieve catalog analytics.
+
+        Results are cached until the catalog or a play count changes.
+
+        Query Parameters:
+            - top_artists (int, optional): The number of artists by total duration to include. Default is 20.
+
+        Returns:
+            JSON response with song counts by genre, song and play totals by decade,
+            the top artists by total duration, and play count percentiles.
+
+        Raises:
+            400 error if top_artists is invalid.
+            500 error if there is an issue computing the analytics.
+
+        """
+        try:
+            top_artists = request.args.get('top_artists', 20)
+            try:
+                top_artists = int(top_artists)
+            except ValueError:
+                raise ValueError("top_artists must be an integer")
+
+            app.logger.info(f"Received request for catalog stats (top_artists={top_artists})")
+            stats = Songs.get_catalog_stats(top_artists=top_artists)
+
+            return make_response(jsonify({
+                "status": "success",
+                "stats": stats
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Invalid catalog stats request: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to compute catalog stats: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while computing catalog stats",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/get-song-from-catalog-by-id/<int:song_id>', methods=['GET'])
     @login_required
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
     def get_song_by_id(song_id: int) -> Response:
         """Route to retrieve a song by its ID.
 
@@ -496,6 +743,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-song-from-catalog-by-compound-key', methods=['GET'])
     @login_required
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
     def get_song_by_compound_key() -> Response:
         """Route to retrieve a song by its compound key (artist, title, year).
 
@@ -560,8 +808,198 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/get-songs-by-ids', methods=['POST'])
+    @login_required
+    def get_songs_by_ids() -> Response:
+        """Route to retrieve many songs by ID in one request.
+
+        Songs are served from the shared song cache, which drops a song whenever it is
+        deleted or played; the rest are loaded with a single database query.
+
+        Expected JSON Input:
+            - song_ids (list[int]): The IDs of the songs to retrieve (at most a few thousand).
+
+        Returns:
+            JSON response with one entry per requested ID, in request order. Found songs
+            have "found": true and the song fields; missing ones only "id" and "found": false.
+
+        Raises:
+            400 error if song_ids is missing, too long or contains an invalid ID.
+            500 error if there is an issue retrieving the songs.
+
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            song_ids = data.get("song_ids")
+
+            if song_ids is None:
+                app.logger.warning("Missing required field: song_ids")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Missing required field: song_ids"
+                }), 400)
+
+            app.logger.info("Received request to retrieve songs by ID")
+
+            playlist_model.validate_song_id_list(song_ids)
+            songs = Songs.get_songs_by_ids(song_ids)
+
+            results = [
+                {**songs[song_id].to_dict(), "found": True} if song_id in songs else {"id": song_id, "found": False}
+                for song_id in song_ids
+            ]
+            found = sum(1 for song_id in song_ids if song_id in songs)
+
+            app.logger.info(f"Successfully retrieved {found} of {len(song_ids)} songs by ID")
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Songs retrieved successfully",
+                "songs": results,
+                "found": found,
+                "not_found": len(song_ids) - found
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Invalid request to retrieve songs by ID: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to retrieve songs by ID: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while retrieving the songs",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/search-songs', methods=['GET'])
+    @login_required
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
+    def search_songs() -> Response:
+        """Route to search the catalog by artist, title and genre.
+
+        Query Parameters:
+            - q (str): The text to search for. Each word matches as a prefix.
+            - limit (int, optional): The number of songs per page (1-100). Default is 20.
+            - offset (int, optional): The number of matching songs to skip. Default is 0.
+
+        Returns:
+            JSON response with the matching songs, best match first.
+
+        Raises:
+            400 error if the query or pagination parameters are invalid.
+            500 error if there is an issue searching the catalog.
+
+        """
+        try:
+            query = request.args.get('q', '')
+            limit = request.args.get('limit', 20, type=int)
+            offset = request.args.get('offset', 0, type=int)
+
+            app.logger.info(f"Received request to search songs for '{query}' (limit={limit}, offset={offset})")
+
+            results = Songs.search_songs(query, limit=limit, offset=offset)
+
+            app.logger.info(f"Search for '{query}' returned {len(results['songs'])} songs")
+            return make_response(jsonify({
+                "status": "success",
+                **results
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Invalid search request: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to search songs: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while searching songs",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/filter-songs-from-catalog', methods=['GET'])
+    @login_required
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
+    def filter_songs() -> Response:
+        """Route to retrieve a page of catalog songs matching a set of filters.
+
+        Query Parameters:
+            - genre (str, optional): Only songs of this genre.
+            - artist (str, optional): Only songs by this artist.
+            - year_min / year_max (int, optional): Inclusive release year range.
+            - duration_min / duration_max (int, optional): Inclusive duration range in seconds.
+            - sort_by (str, optional): id, artist, title, year, genre, duration or play_count. Default is id.
+            - order (str, optional): 'asc' or 'desc'. Default is 'asc'.
+            - limit (int, optional): The number of songs per page (1-500). Default is 50.
+            - cursor (str, optional): The next_cursor returned with the previous page.
+
+        Returns:
+            JSON response with the songs on this page and the cursor of the next page.
+
+        Raises:
+            400 error if any parameter is invalid.
+            500 error if there is an issue querying the catalog.
+
+        """
+        try:
+            order = request.args.get('order', 'asc').lower()
+            if order not in {'asc', 'desc'}:
+                raise ValueError(f"Invalid order: {order}. Must be 'asc' or 'desc'")
+
+            int_params = {}
+            for name in ('year_min', 'year_max', 'duration_min', 'duration_max', 'limit'):
+                value = request.args.get(name)
+                if value is not None:
+                    try:
+                        int_params[name] = int(value)
+                    except ValueError:
+                        raise ValueError(f"{name} must be an integer")
+
+            app.logger.info(f"Received request to filter songs: {dict(request.args)}")
+
+            results = Songs.query_songs(
+                genre=request.args.get('genre'),
+                artist=request.args.get('artist'),
+                sort_by=request.args.get('sort_by', 'id'),
+                descending=order == 'desc',
+                cursor=request.args.get('cursor'),
+                **int_params
+            )
+
+            app.logger.info(f"Successfully retrieved {len(results['songs'])} filtered songs")
+            return make_response(jsonify({
+                "status": "success",
+                **results
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Invalid filter request: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to filter songs: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while filtering songs",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/get-random-song', methods=['GET'])
     @login_required
+    @admission_controlled(admission_limiters.get("random_org"))
     def get_random_song() -> Response:
         """Route to retrieve a random song from the catalog.
 
@@ -601,6 +1039,54 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/radio-next-song', methods=['GET'])
+    @login_required
+    def get_radio_next_song() -> Response:
+        """Route to pick a radio song, weighted by play count.
+
+        Songs are picked with probability proportional to their play count from alias
+        tables built over the catalog, using a local random generator (no random.org call).
+
+        Query Parameters:
+            - genre (str, optional): Only pick songs of this genre.
+
+        Returns:
+            JSON response containing the picked song.
+
+        Raises:
+            400 error if the catalog, or the genre, has no songs.
+            500 error if there is an issue picking the song.
+
+        """
+        try:
+            genre = request.args.get('genre')
+            app.logger.info(f"Received request for the next radio song (genre={genre})")
+
+            song = radio_model.next_song(genre)
+
+            app.logger.info(f"Radio picked: {song.title} by {song.artist}")
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Radio song picked successfully",
+                "song": song.to_dict()
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Cannot pick a radio song: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to pick a radio song: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while picking a radio song",
+                "details": str(e)
+            }), 500)
+
+
     ############################################################
     #
     # Playlist Add / Remove
@@ -679,6 +1165,62 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/add-songs-to-playlist', methods=['POST'])
+    @login_required
+    def add_songs_to_playlist() -> Response:
+        """Route to add several songs to the end of the playlist in one request.
+
+        The songs are validated with a single batch lookup; if any is invalid, none is added.
+
+        Expected JSON Input:
+            - song_ids (list[int]): The IDs of the songs to add, in order.
+
+        Returns:
+            JSON response indicating success of the addition.
+
+        Raises:
+            400 error if song_ids is missing or any song cannot be added.
+            500 error if there is an issue adding the songs to the playlist.
+
+        """
+        try:
+            app.logger.info("Received request to add songs to playlist")
+
+            data = request.get_json(silent=True) or {}
+            song_ids = data.get("song_ids")
+
+            if song_ids is None:
+                app.logger.warning("Missing required field: song_ids")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Missing required field: song_ids"
+                }), 400)
+
+            playlist_model.add_songs_to_playlist(song_ids)
+            app.logger.info(f"Successfully added {len(song_ids)} songs to playlist")
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Added {len(song_ids)} songs to playlist",
+                "playlist_length": playlist_model.get_playlist_length()
+            }), 201)
+
+        except ValueError as e:
+            app.logger.warning(f"Cannot add songs to playlist: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to add songs to playlist: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while adding the songs to the playlist",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/remove-song-from-playlist', methods=['DELETE'])
     @login_required
     def remove_song_by_song_id() -> Response:
@@ -1059,6 +1601,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/go-to-random-track', methods=['POST'])
     @login_required
+    @admission_controlled(admission_limiters.get("random_org"))
     def go_to_random_track() -> Response:
         """Route to set the playlist to start playing from a random track number.
 
@@ -1097,34 +1640,243 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
-    ############################################################
-    #
-    # View Playlist
-    #
-    ############################################################
-
-
-    @app.route('/api/get-all-songs-from-playlist', methods=['GET'])
+    @app.route('/api/go-to-next-track', methods=['POST'])
     @login_required
-    def get_all_songs_from_playlist() -> Response:
-        """Retrieve all songs in the playlist.
+    def go_to_next_track() -> Response:
+        """Route to skip to the next track (in shuffle order if shuffle is enabled).
 
         Returns:
-            JSON response containing the list of songs.
+            JSON response with the new current track number.
 
         Raises:
-            500 error if there is an issue retrieving the playlist.
+            400 error if the playlist is empty.
+            500 error if there is an issue changing tracks.
 
         """
         try:
-            app.logger.info("Received request to retrieve all songs from the playlist.")
-
-            songs = playlist_model.get_all_songs()
+            app.logger.info("Received request to go to the next track")
+            playlist_model.go_to_next_track()
+            track_number = playlist_model.get_current_track_number()
+            app.logger.info(f"Playlist set to track number {track_number}")
 
-            app.logger.info(f"Successfully retrieved {len(songs)} songs from the playlist.")
             return make_response(jsonify({
                 "status": "success",
-                "songs": songs
+                "message": f"Now playing from track number {track_number}"
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Failed to go to the next track: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Internal error while going to the next track: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while changing the track number",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/go-to-previous-track', methods=['POST'])
+    @login_required
+    def go_to_previous_track() -> Response:
+        """Route to go back to the previous track (in shuffle order if shuffle is enabled).
+
+        Returns:
+            JSON response with the new current track number.
+
+        Raises:
+            400 error if the playlist is empty.
+            500 error if there is an issue changing tracks.
+
+        """
+        try:
+            app.logger.info("Received request to go to the previous track")
+            playlist_model.go_to_previous_track()
+            track_number = playlist_model.get_current_track_number()
+            app.logger.info(f"Playlist set to track number {track_number}")
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Now playing from track number {track_number}"
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Failed to go to the previous track: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Internal error while going to the previous track: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while changing the track number",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/seek-to-time/<int:seconds>', methods=['POST'])
+    @login_required
+    def seek_to_time(seconds: int) -> Response:
+        """Route to make the track playing a given number of seconds into the playlist current.
+
+        Path Parameter:
+            - seconds (int): The time offset from the start of the playlist.
+
+        Returns:
+            JSON response with the track number, song ID and offset into that track.
+
+        Raises:
+            400 error if the playlist is empty or the time is past the end.
+            500 error if there is an issue seeking.
+
+        """
+        try:
+            app.logger.info(f"Received request to seek to {seconds} seconds")
+            position = playlist_model.seek_to_time(seconds)
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Now playing track number {position['track_number']} from {position['offset_seconds']} seconds",
+                **position
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Failed to seek to {seconds} seconds: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Internal error while seeking to {seconds} seconds: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while seeking",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/get-time-remaining', methods=['GET'])
+    @login_required
+    def get_time_remaining() -> Response:
+        """Route to get the playing time from the current track to the end of the playlist.
+
+        Returns:
+            JSON response with the remaining time in seconds.
+
+        Raises:
+            400 error if the playlist is empty.
+            500 error if there is an issue computing the remaining time.
+
+        """
+        try:
+            app.logger.info("Received request to get the time remaining")
+            remaining = playlist_model.time_remaining()
+
+            return make_response(jsonify({
+                "status": "success",
+                "time_remaining_seconds": remaining
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Failed to get the time remaining: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Internal error while getting the time remaining: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while getting the time remaining",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/shuffle', methods=['POST'])
+    @login_required
+    def set_shuffle() -> Response:
+        """Route to turn shuffle mode on or off.
+
+        Expected JSON Input:
+            - enabled (bool): Whether shuffle should be on.
+
+        Returns:
+            JSON response indicating the new shuffle state.
+
+        Raises:
+            400 error if the input is invalid.
+            500 error if there is an issue changing the shuffle mode.
+
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            enabled = data.get("enabled")
+
+            if not isinstance(enabled, bool):
+                app.logger.warning("Invalid shuffle request: 'enabled' must be a boolean")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "'enabled' must be a boolean"
+                }), 400)
+
+            app.logger.info(f"Received request to {'enable' if enabled else 'disable'} shuffle")
+            if enabled:
+                playlist_model.enable_shuffle()
+            else:
+                playlist_model.disable_shuffle()
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Shuffle {'enabled' if enabled else 'disabled'}",
+                "shuffle_enabled": enabled
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Internal error while changing shuffle mode: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while changing shuffle mode",
+                "details": str(e)
+            }), 500)
+
+
+    ############################################################
+    #
+    # View Playlist
+    #
+    ############################################################
+
+
+    @app.route('/api/get-all-songs-from-playlist', methods=['GET'])
+    @login_required
+    @response_cache.cached(version=playlist_version, ttl=response_cache_ttl)
+    def get_all_songs_from_playlist() -> Response:
+        """Retrieve all songs in the playlist.
+
+        Returns:
+            JSON response containing the list of songs.
+
+        Raises:
+            500 error if there is an issue retrieving the playlist.
+
+        """
+        try:
+            app.logger.info("Received request to retrieve all songs from the playlist.")
+
+            songs = playlist_model.get_all_songs()
+
+            app.logger.info(f"Successfully retrieved {len(songs)} songs from the playlist.")
+            return make_response(jsonify({
+                "status": "success",
+                "songs": songs
             }), 200)
 
         except Exception as e:
@@ -1138,6 +1890,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-song-from-playlist-by-track-number/<int:track_number>', methods=['GET'])
     @login_required
+    @response_cache.cached(version=playlist_version, ttl=response_cache_ttl)
     def get_song_by_track_number(track_number: int) -> Response:
         """Retrieve a song from the playlist by track number.
 
@@ -1181,6 +1934,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-current-song', methods=['GET'])
     @login_required
+    @response_cache.cached(version=playlist_version, ttl=response_cache_ttl)
     def get_current_song() -> Response:
         """Retrieve the current song being played.
 
@@ -1213,6 +1967,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-playlist-length-duration', methods=['GET'])
     @login_required
+    @response_cache.cached(version=playlist_version, ttl=response_cache_ttl)
     def get_playlist_length_and_duration() -> Response:
         """Retrieve the length (number of songs) and total duration of the playlist.
 
@@ -1460,6 +2215,74 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
 
 
+    @app.route('/api/reorder-playlist', methods=['POST'])
+    @login_required
+    def reorder_playlist() -> Response:
+        """Reorder the playlist in one atomic operation.
+
+        Expected JSON Input (one of):
+            - song_ids (list[int]): Every song ID in the playlist, in the new order.
+            - moves (list[dict]): Moves to apply together, each with "song_id" and "track_number".
+              Moved songs land on their track numbers; the rest keep their relative order.
+
+        Returns:
+            Response: JSON response with the new playlist order.
+
+        Raises:
+            400 error if neither or both fields are given, or the ordering or moves are invalid.
+            500 error if an error occurs while reordering the playlist.
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+
+            if ("song_ids" in data) == ("moves" in data):
+                app.logger.warning("Reorder request must contain exactly one of song_ids or moves")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Provide exactly one of: song_ids, moves"
+                }), 400)
+
+            if "song_ids" in data:
+                app.logger.info("Received request to reorder the playlist")
+                playlist_model.reorder_playlist(data["song_ids"])
+            else:
+                moves = data["moves"]
+                app.logger.info("Received request to apply moves to the playlist")
+                try:
+                    moves = [(move["song_id"], move["track_number"]) for move in moves]
+                except (KeyError, TypeError):
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": "Each move must be an object with song_id and track_number"
+                    }), 400)
+                playlist_model.move_songs(moves)
+
+            song_ids = playlist_model.get_song_ids()
+
+            app.logger.info("Successfully reordered the playlist")
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Playlist reordered",
+                "song_ids": song_ids
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Cannot reorder playlist: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to reorder playlist: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while reordering the playlist",
+                "details": str(e)
+            }), 500)
+
+
+
     ############################################################
     #
     # Leaderboard / Stats
@@ -1468,28 +2291,56 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
 
     @app.route('/api/song-leaderboard', methods=['GET'])
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
     def get_song_leaderboard() -> Response:
         """
         Route to retrieve a leaderboard of songs sorted by play count.
 
+        Without a window, songs are ranked by lifetime play count. With a window, they are
+        ranked by plays in that window, read from in-memory rolling counters.
+
+        Query Parameters:
+            - window (str, optional): One of 1h, 24h or 7d.
+            - limit (int, optional): The number of songs in a windowed leaderboard (default 10).
+
         Returns:
             JSON response with a sorted leaderboard of songs.
 
         Raises:
+            400 error if the window or limit is invalid.
             500 error if there is an issue generating the leaderboard.
 
         """
         try:
-            app.logger.info("Received request to generate song leaderboard")
+            window = request.args.get('window')
+            app.logger.info(f"Received request to generate song leaderboard (window={window})")
 
-            leaderboard_data = Songs.get_all_songs(sort_by_play_count=True)
+            if window is None:
+                leaderboard_data = Songs.get_all_songs(sort_by_play_count=True)
+            else:
+                limit = request.args.get('limit', 10)
+                try:
+                    limit = int(limit)
+                except ValueError:
+                    raise ValueError("limit must be an integer")
+                if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+                    raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+                leaderboard_data = play_tracker.get_leaderboard(window, limit)
 
             app.logger.info(f"Successfully generated song leaderboard with {len(leaderboard_data)} entries")
             return make_response(jsonify({
                 "status": "success",
+                "window": window,
                 "leaderboard": leaderboard_data
             }), 200)
 
+        except ValueError as e:
+            app.logger.warning(f"Invalid leaderboard request: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
         except Exception as e:
             app.logger.error(f"Failed to generate song leaderboard: {e}")
             return make_response(jsonify({
@@ -1498,13 +2349,233 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "details": str(e)
             }), 500)
 
+    @app.route('/api/hot-songs', methods=['GET'])
+    @response_cache.cached(version=catalog_version, ttl=response_cache_ttl)
+    def get_hot_songs() -> Response:
+        """
+        Route to retrieve the songs that are trending now.
+
+        Songs are ranked by an exponentially decayed play count: each play counts 1 when it
+        happens and half as much every HOT_SCORE_HALF_LIFE seconds after.
+
+        Query Parameters:
+            - limit (int, optional): The number of songs to return (default 10).
+
+        Returns:
+            JSON response with the hottest songs and their current scores.
+
+        Raises:
+            400 error if the limit is invalid.
+            500 error if there is an issue reading the scores.
+
+        """
+        try:
+            limit = request.args.get('limit', 10)
+            app.logger.info(f"Received request for hot songs (limit={limit})")
+
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValueError("limit must be an integer")
+            if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+                raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+            hot_songs = play_tracker.get_hot_songs(limit)
+
+            app.logger.info(f"Successfully retrieved {len(hot_songs)} hot songs")
+            return make_response(jsonify({
+                "status": "success",
+                "songs": hot_songs
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Invalid hot songs request: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to retrieve hot songs: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while retrieving hot songs",
+                "details": str(e)
+            }), 500)
+
+    ############################################################
+    #
+    # Diagnostics
+    #
+    ############################################################
+
+
+    @app.route('/api/memory-usage', methods=['GET'])
+    @login_required
+    def get_memory_usage() -> Response:
+        """Route to report the approximate memory held by the playlist and its caches.
+
+        Returns:
+            JSON response with the size of each structure and the tracemalloc status.
+
+        Raises:
+            500 error if there is an issue measuring memory usage.
+
+        """
+        try:
+            app.logger.info("Received request to report memory usage")
+
+            usage = playlist_model.get_memory_usage()
+
+            return make_response(jsonify({
+                "status": "success",
+                "memory": usage,
+                "song_cache": Songs.get_song_cache_usage(),
+                "response_cache": response_cache.get_stats(),
+                "tracemalloc": {
+                    "tracing": memory_utils.is_tracing(),
+                    "snapshots": memory_utils.list_snapshots(),
+                    **memory_utils.get_traced_memory()
+                }
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to report memory usage: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while reporting memory usage",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/memory-snapshot', methods=['POST'])
+    @login_required
+    def take_memory_snapshot() -> Response:
+        """Route to take a tracemalloc snapshot, starting tracemalloc if needed.
+
+        Returns:
+            JSON response with the id of the new snapshot and the traced memory.
+
+        Raises:
+            500 error if there is an issue taking the snapshot.
+
+        """
+        try:
+            app.logger.info("Received request to take a memory snapshot")
+
+            snapshot = memory_utils.take_snapshot()
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Snapshot {snapshot['snapshot_id']} taken",
+                "snapshot": snapshot
+            }), 201)
+
+        except Exception as e:
+            app.logger.error(f"Failed to take memory snapshot: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while taking the memory snapshot",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/memory-snapshot-diff', methods=['GET'])
+    @login_required
+    def get_memory_snapshot_diff() -> Response:
+        """Route to diff two tracemalloc snapshots.
+
+        Query Parameters:
+            - first (int, optional): The id of the older snapshot. Defaults to the one taken before `second`.
+            - second (int, optional): The id of the newer snapshot. Defaults to the most recent.
+            - limit (int, optional): The number of allocation sites to return. Default is 10.
+            - key_type (str, optional): 'lineno', 'filename' or 'traceback'. Default is 'lineno'.
+
+        Returns:
+            JSON response with the top allocation sites between the two snapshots.
+
+        Raises:
+            400 error if the parameters are invalid or the snapshots are not available.
+            500 error if there is an issue computing the diff.
+
+        """
+        try:
+            first = request.args.get('first', type=int)
+            second = request.args.get('second', type=int)
+            limit = request.args.get('limit', 10, type=int)
+            key_type = request.args.get('key_type', 'lineno')
+
+            app.logger.info(f"Received request to diff memory snapshots {first} and {second}")
+
+            stats = memory_utils.compare_snapshots(first, second, limit=limit, key_type=key_type)
+
+            return make_response(jsonify({
+                "status": "success",
+                "top_allocations": stats
+            }), 200)
+
+        except ValueError as e:
+            app.logger.warning(f"Cannot diff memory snapshots: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+
+        except Exception as e:
+            app.logger.error(f"Failed to diff memory snapshots: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while diffing memory snapshots",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/memory-snapshots', methods=['DELETE'])
+    @login_required
+    def clear_memory_snapshots() -> Response:
+        """Route to discard all tracemalloc snapshots and stop tracing.
+
+        Returns:
+            JSON response indicating success of the operation.
+
+        Raises:
+            500 error if there is an issue clearing the snapshots.
+
+        """
+        try:
+            app.logger.info("Received request to clear memory snapshots")
+
+            memory_utils.clear_snapshots()
+
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Memory snapshots cleared and tracing stopped"
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to clear memory snapshots: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while clearing memory snapshots",
+                "details": str(e)
+            }), 500)
+
+    # Caches filled in the background once the server is listening (see CACHE_WARMUP)
+    app.extensions["warmup_tasks"] = {
+        "catalog_stats": Songs.get_catalog_stats,
+        "random_org_client": lambda: importlib.import_module("requests"),
+    }
+
+    app.logger.info(f"App initialized: {startup_timer.summary()}")
     return app
 
 if __name__ == '__main__':
     app = create_app()
     app.logger.info("Starting Flask app...")
+    host, port = '0.0.0.0', int(os.getenv("PORT", 5000))
+    if app.config.get("CACHE_WARMUP"):
+        start_warmup(app, app.extensions["warmup_tasks"], host, port)
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        app.run(debug=True, host=host, port=port, use_reloader=app.config.get("USE_RELOADER", False))
     except Exception as e:
         app.logger.error(f"Flask app encountered an error: {e}")
     finally:
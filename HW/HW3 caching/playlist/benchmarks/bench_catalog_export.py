@@ -0,0 +1,82 @@
+"""Throughput and peak memory of the streaming catalog export and import.
+
+Run from the service root:
+
+    python -m benchmarks.bench_catalog_export --songs 1000000
+
+The catalog is exported to a gzip NDJSON file and then imported into an empty
+database. With --memory, peak memory is measured with tracemalloc; that covers
+Python objects only (not SQLite's page cache) and slows both phases down.
+
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app import create_app
+from benchmarks.bench_song_search import load_catalog
+from config import TestConfig
+from playlist.db import db
+from playlist.models.song_model import Songs
+from playlist.utils.ndjson_utils import iter_gzip_ndjson, iter_ndjson
+
+
+def make_config(path: str):
+    class BenchConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLITE_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536}
+    return BenchConfig
+
+
+def measure(label: str, func, trace_memory: bool) -> None:
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = ""
+    if trace_memory:
+        peak = f"peak={tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f} MiB  "
+        tracemalloc.stop()
+    print(f"{label}: {elapsed:.1f}s  {peak}{result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, default=200000)
+    parser.add_argument("--memory", action="store_true", help="also report peak traced memory")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        export_path = os.path.join(tmpdir, "songs.ndjson.gz")
+
+        app = create_app(make_config(os.path.join(tmpdir, "source.db")))
+        with app.app_context():
+            load_catalog(args.songs)
+            print(f"Loaded {args.songs} songs")
+
+            def export():
+                with open(export_path, "wb") as f:
+                    for chunk in iter_gzip_ndjson(Songs.export_songs()):
+                        f.write(chunk)
+                return f"{os.path.getsize(export_path) / 2 ** 20:.1f} MiB written"
+
+            measure("export", export, args.memory)
+            db.engine.dispose()
+
+        app = create_app(make_config(os.path.join(tmpdir, "target.db")))
+        with app.app_context():
+            def restore():
+                with open(export_path, "rb") as f:
+                    return Songs.import_songs(iter_ndjson(f))
+
+            measure("import", restore, args.memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Throughput of listing the whole catalog, before and after the plain-row read path.
+
+Run from the service root:
+
+    python -m benchmarks.bench_song_listing --songs 1000000
+
+"before" is the previous Songs.get_all_songs, reproduced below: it loads an ORM
+instance per row and copies it into a dictionary. "after" is the current
+Songs.get_all_songs, which selects the columns and builds the dictionaries from
+plain rows; Songs.get_song_rows skips the dictionaries as well. Each variant runs
+in a fresh session, so no identity map is reused between rounds.
+
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from app import create_app
+from benchmarks.bench_catalog_export import make_config
+from benchmarks.bench_song_search import load_catalog
+from playlist.db import db
+from playlist.models.song_model import Songs
+
+
+def orm_get_all_songs(sort_by_play_count: bool = False) -> list[dict]:
+    query = Songs.query
+    if sort_by_play_count:
+        query = query.order_by(Songs.play_count.desc())
+    return [
+        {
+            "id": song.id,
+            "artist": song.artist,
+            "title": song.title,
+            "year": song.year,
+            "genre": song.genre,
+            "duration": song.duration,
+            "play_count": song.play_count,
+        }
+        for song in query.all()
+    ]
+
+
+VARIANTS = {
+    "before: ORM instances -> dicts": orm_get_all_songs,
+    "after:  get_all_songs (rows -> dicts)": Songs.get_all_songs,
+    "after:  get_song_rows (tuples)": Songs.get_song_rows,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--sorted", action="store_true", help="sort by play count, as the leaderboard does")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = create_app(make_config(os.path.join(tmpdir, "bench.db")))
+        with app.app_context():
+            load_catalog(args.songs)
+            print(f"Loaded {args.songs} songs")
+
+            for label, list_songs in VARIANTS.items():
+                timings = []
+                for _ in range(args.rounds):
+                    db.session.remove()
+                    started = time.perf_counter()
+                    count = len(list_songs(sort_by_play_count=args.sorted))
+                    timings.append(time.perf_counter() - started)
+                    assert count == args.songs
+                best = min(timings)
+                print(f"{label:40s} best={best:.2f}s  median={statistics.median(timings):.2f}s  "
+                      f"{args.songs / best / 1000:.0f}k rows/s")
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
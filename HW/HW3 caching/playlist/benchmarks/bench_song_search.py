@@ -0,0 +1,90 @@
+"""Latency of Songs.search_songs on a large synthetic catalog.
+
+Run from the service root:
+
+    python -m benchmarks.bench_song_search --songs 1000000
+
+The catalog is loaded through the Songs table, so the FTS5 index is populated by
+the same triggers the service uses.
+
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app import create_app
+from config import TestConfig
+from playlist.db import db
+from playlist.models.song_model import Songs
+
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "ve", "tor", "bel", "shi", "no", "dan", "que", "zu", "fen", "gar", "hol",
+             "ix", "jam", "pur", "sol", "tre", "win", "yo", "cal", "dro", "ep", "fli", "gro", "mun", "ost", "ver"]
+# A few thousand distinct words, so that queries are about as selective as on a real catalog
+WORDS = sorted({a + b + c for a in SYLLABLES for b in SYLLABLES for c in ("", *SYLLABLES[:4])})
+GENRES = ["Rock", "Pop", "Jazz", "Grunge", "Hip Hop", "Country", "Blues", "Electronic"]
+
+
+def load_catalog(num_songs: int, batch_size: int = 50000) -> None:
+    rng = random.Random(42)
+    insert = "INSERT INTO Songs (artist, title, year, genre, duration, play_count) VALUES (?, ?, ?, ?, ?, 0)"
+    with db.engine.begin() as conn:
+        for start in range(0, num_songs, batch_size):
+            rows = [
+                (
+                    f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i % 5000}",
+                    " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title() + f" {i}",
+                    rng.randint(1950, 2024),
+                    rng.choice(GENRES),
+                    rng.randint(90, 600)
+                )
+                for i in range(start, min(start + batch_size, num_songs))
+            ]
+            conn.exec_driver_sql(insert, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        class BenchConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+            SQLITE_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536}
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            started = time.perf_counter()
+            load_catalog(args.songs)
+            print(f"Loaded {args.songs} songs in {time.perf_counter() - started:.1f}s")
+
+            rng = random.Random(7)
+            queries = [
+                " ".join(rng.choice(WORDS)[:rng.randint(3, 6)] for _ in range(rng.randint(1, 2)))
+                for _ in range(args.queries)
+            ]
+
+            timings = []
+            for query in queries:
+                started = time.perf_counter()
+                Songs.search_songs(query, limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+                db.session.remove()
+
+            timings.sort()
+            print(
+                f"{args.queries} queries: median={statistics.median(timings):.2f}ms  "
+                f"p95={timings[int(len(timings) * 0.95) - 1]:.2f}ms  max={timings[-1]:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
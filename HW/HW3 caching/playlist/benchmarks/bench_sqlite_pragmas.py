@@ -0,0 +1,116 @@
+"""Concurrent read/write throughput of the Songs table with and without the SQLite pragmas.
+
+Run from the service root:
+
+    python -m benchmarks.bench_sqlite_pragmas --readers 8 --writers 2 --seconds 5
+
+Readers look up random songs by ID; writers increment play counts one commit at a
+time, the same pattern as Songs.update_play_count.
+
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+from config import ProductionConfig
+from playlist.utils.sql_utils import register_sqlite_pragmas
+
+
+def build_catalog(engine, num_songs: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE Songs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, artist TEXT NOT NULL, title TEXT NOT NULL, "
+            "year INTEGER NOT NULL, genre TEXT NOT NULL, duration INTEGER NOT NULL, "
+            "play_count INTEGER NOT NULL DEFAULT 0)"
+        ))
+        conn.execute(
+            text("INSERT INTO Songs (artist, title, year, genre, duration) VALUES (:a, :t, :y, :g, :d)"),
+            [
+                {"a": f"Artist {i % 500}", "t": f"Title {i}", "y": 1950 + i % 70, "g": "Rock", "d": 120 + i % 300}
+                for i in range(num_songs)
+            ]
+        )
+
+
+def run(pragmas: dict, readers: int, writers: int, seconds: float, num_songs: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", pool_size=readers + writers)
+        register_sqlite_pragmas(engine, pragmas)
+        build_catalog(engine, num_songs)
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def reader():
+            done = 0
+            with engine.connect() as conn:
+                while time.perf_counter() < deadline:
+                    conn.execute(text("SELECT * FROM Songs WHERE id = :id"), {"id": random.randint(1, num_songs)}).one()
+                    conn.rollback()
+                    done += 1
+            with lock:
+                counts["reads"] += done
+
+        def writer():
+            done = errors = 0
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            text("UPDATE Songs SET play_count = play_count + 1 WHERE id = :id"),
+                            {"id": random.randint(1, num_songs)}
+                        )
+                    done += 1
+                except Exception:
+                    errors += 1
+            with lock:
+                counts["writes"] += done
+                counts["errors"] += errors
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        engine.dispose()
+
+    return {
+        "reads_per_sec": counts["reads"] / seconds,
+        "writes_per_sec": counts["writes"] / seconds,
+        "errors": counts["errors"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--songs", type=int, default=10000)
+    args = parser.parse_args()
+
+    profiles = {
+        "default (rollback journal)": {},
+        "ProductionConfig.SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS,
+    }
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds}s, {args.songs} songs")
+    for name, pragmas in profiles.items():
+        result = run(pragmas, args.readers, args.writers, args.seconds, args.songs)
+        print(
+            f"{name:<34} reads/s={result['reads_per_sec']:>10.0f}  "
+            f"writes/s={result['writes_per_sec']:>8.0f}  errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
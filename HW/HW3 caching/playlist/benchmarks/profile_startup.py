@@ -0,0 +1,128 @@
+"""Startup profile: import time, create_app phases and time to first healthy response.
+
+Run from the service root:
+
+    python -m benchmarks.profile_startup
+
+Import times come from `python -X importtime`. create_app is timed on a fresh
+database and again on the same database, where the schema check skips the
+schema setup. Finally the server is started as `python app.py` and /api/health
+is polled until it answers, with and without the development reloader.
+
+"""
+import argparse
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from config import TestConfig
+
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_imports(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=SERVICE_ROOT, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Names are indented by two spaces per level of nesting, after one separator space
+        name = name.rstrip()[1:]
+        rows.append((int(cumulative_us), int(self_us), name))
+
+    # Modules are listed after everything they import, so app's imports are the rows
+    # between the previous top-level module (imported by the interpreter itself) and app
+    app_row = next(index for index, (_, _, name) in enumerate(rows) if name.strip() == "app")
+    first_row = max(
+        (index + 1 for index, (_, _, name) in enumerate(rows[:app_row]) if not name.startswith(" ")),
+        default=0
+    )
+    print(f"import app: {rows[app_row][0] / 1000:.1f}ms")
+    print(f"  top {top} direct imports of app by cumulative time:")
+    direct = [row for row in rows[first_row:app_row] if len(row[2]) - len(row[2].lstrip()) == 2]
+    for cumulative, _, name in sorted(direct, reverse=True)[:top]:
+        print(f"    {cumulative / 1000:8.1f}ms  {name.strip()}")
+
+
+def profile_create_app(tmpdir: str) -> None:
+    from app import create_app
+
+    class ProfileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'profile.db')}"
+        SQLALCHEMY_READONLY_DATABASE_URI = None
+        SQLITE_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+
+    for label in ("create_app (new database)", "create_app (schema current)"):
+        app = create_app(ProfileConfig)
+        print(f"{label}: {app.extensions['startup_timer'].summary()}")
+        with app.app_context():
+            from playlist.db import db
+            db.engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(database_path: str, use_reloader: bool, timeout: float = 60.0) -> float:
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "PORT": str(port),
+        "FLASK_USE_RELOADER": str(use_reloader).lower(),
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=SERVICE_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("The server did not become healthy")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=10, help="number of packages to list")
+    parser.add_argument("--runs", type=int, default=3, help="server starts per measurement")
+    args = parser.parse_args()
+
+    profile_imports(args.top)
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        profile_create_app(tmpdir)
+
+        database_path = os.path.join(tmpdir, "server.db")
+        for use_reloader in (False, True):
+            timings = [time_to_healthy(database_path, use_reloader) for _ in range(args.runs)]
+            print(
+                f"time to first healthy response (reloader {'on' if use_reloader else 'off'}): "
+                f"first={timings[0] * 1000:.0f}ms  restart={min(timings[1:] or timings) * 1000:.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
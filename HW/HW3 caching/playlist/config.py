@@ -14,7 +14,85 @@ class ProductionConfig():
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
 
+    # Applied to every new SQLite connection. WAL lets readers run alongside a writer,
+    # and synchronous=NORMAL is durable under WAL while skipping the fsync on every commit.
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -20000)),  # Negative values are KiB, so ~20MB
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),  # 256MB
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),  # Milliseconds
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+    SQLITE_WAL_CHECKPOINT_INTERVAL = int(os.getenv("SQLITE_WAL_CHECKPOINT_INTERVAL", 300))  # Seconds, 0 disables
+
+    # Read-only engine used by read-only model methods. Defaults to a mode=ro
+    # connection to the primary SQLite file when unset; set to "" to disable.
+    SQLALCHEMY_READONLY_DATABASE_URI = os.getenv("READONLY_DATABASE_URL")
+
+    # Concurrency limits per route group. Routes that call random.org are capped so
+    # that a slow upstream cannot tie up every server thread.
+    ADMISSION_LIMITS = {
+        "random_org": {
+            "max_concurrent": int(os.getenv("RANDOM_ORG_MAX_CONCURRENT", 4)),
+            "max_queue": int(os.getenv("RANDOM_ORG_MAX_QUEUE", 8)),
+            "queue_timeout": float(os.getenv("RANDOM_ORG_QUEUE_TIMEOUT", 1.0)),
+            "retry_after": int(os.getenv("RANDOM_ORG_RETRY_AFTER", 5)),
+        },
+    }
+
+    # Startup. The schema check skips create_all when the database schema is already current,
+    # the warm-up fills caches in the background once the server is listening, and the
+    # reloader (which imports and initializes the app twice) is for development only.
+    SCHEMA_VERSION_CHECK = os.getenv("SCHEMA_VERSION_CHECK", "true").lower() == "true"
+    CACHE_WARMUP = os.getenv("CACHE_WARMUP", "false").lower() == "true"
+    USE_RELOADER = os.getenv("FLASK_USE_RELOADER", "false").lower() == "true"
+
+    # Plays are buffered in memory and written to the plays table in batches, every
+    # PLAY_FLUSH_INTERVAL seconds or as soon as PLAY_FLUSH_BATCH_SIZE plays are waiting.
+    PLAY_FLUSH_INTERVAL = float(os.getenv("PLAY_FLUSH_INTERVAL", 5))
+    PLAY_FLUSH_BATCH_SIZE = int(os.getenv("PLAY_FLUSH_BATCH_SIZE", 500))
+
+    # Playlist songs are reloaded in the background before their cache entries expire: every
+    # SONG_CACHE_REFRESH_INTERVAL seconds (0 disables), entries expiring within the window are
+    # reloaded, at most SONG_CACHE_REFRESH_BUDGET songs per pass.
+    SONG_CACHE_REFRESH_INTERVAL = float(os.getenv("SONG_CACHE_REFRESH_INTERVAL", 5))
+    SONG_CACHE_REFRESH_WINDOW = float(os.getenv("SONG_CACHE_REFRESH_WINDOW", 15))
+    SONG_CACHE_REFRESH_BUDGET = int(os.getenv("SONG_CACHE_REFRESH_BUDGET", 200))
+
+    # The song cache is snapshotted to local disk every SONG_CACHE_SNAPSHOT_INTERVAL
+    # seconds (0 only on shutdown) and reloaded at startup. An empty path disables snapshots.
+    SONG_CACHE_SNAPSHOT_PATH = os.getenv("SONG_CACHE_SNAPSHOT_PATH", "/app/db/song_cache_snapshot.json")
+    SONG_CACHE_SNAPSHOT_INTERVAL = float(os.getenv("SONG_CACHE_SNAPSHOT_INTERVAL", 60))
+
+    # Encoded GET responses are cached in an LRU of at most RESPONSE_CACHE_MAX_BYTES body bytes,
+    # keyed by the catalog or playlist version. Entries also expire after RESPONSE_CACHE_TTL
+    # seconds, which bounds how long a song cache fill that raced a write can be served.
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 5))
+
 class TestConfig():
     """Testing configuration."""
     TESTING = True
+    SECRET_KEY = "test-secret-key"
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    SQLITE_PRAGMAS = {
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    }
+    SQLITE_WAL_CHECKPOINT_INTERVAL = 0
+    SQLALCHEMY_READONLY_DATABASE_URI = ""
+    ADMISSION_LIMITS = {
+        "random_org": {"max_concurrent": 4, "max_queue": 8, "queue_timeout": 1.0, "retry_after": 5},
+    }
+    SCHEMA_VERSION_CHECK = True
+    CACHE_WARMUP = False
+    PLAY_FLUSH_INTERVAL = 0
+    PLAY_FLUSH_BATCH_SIZE = 500
+    SONG_CACHE_REFRESH_INTERVAL = 0
+    SONG_CACHE_REFRESH_WINDOW = 15
+    SONG_CACHE_REFRESH_BUDGET = 200
+    SONG_CACHE_SNAPSHOT_PATH = ""
+    SONG_CACHE_SNAPSHOT_INTERVAL = 0
+    RESPONSE_CACHE_MAX_BYTES = 1024 * 1024
+    RESPONSE_CACHE_TTL = 5
@@ -1,3 +1,88 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from flask import Flask, current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+
+# Key of the optional read-only engine (a SQLite mode=ro URI or a replica) in app.extensions
+READONLY_ENGINE_KEY = "readonly_engine"
+
+_use_readonly: ContextVar[bool] = ContextVar("use_readonly", default=False)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the read-only engine while a read-only block is active.
+
+    Flushes and DML statements always go to the primary engine, so ORM objects loaded
+    from the read-only engine can still be modified and committed as usual. If no
+    read-only engine is configured, everything goes to the primary engine.
+
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and _use_readonly.get()
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            engine = get_readonly_engine()
+            if engine is not None:
+                return engine
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def init_readonly_engine(app: Flask, uri: str) -> Engine:
+    """Creates the read-only engine for an app.
+
+    Args:
+        app (Flask): The app the engine belongs to.
+        uri (str): The read-only database URI.
+
+    Returns:
+        Engine: The new read-only engine.
+
+    """
+    engine = create_engine(uri)
+    app.extensions[READONLY_ENGINE_KEY] = engine
+    return engine
+
+
+def get_readonly_engine() -> Optional[Engine]:
+    """Returns the current app's read-only engine, or None if it does not have one.
+
+    """
+    return current_app.extensions.get(READONLY_ENGINE_KEY)
+
+
+@contextmanager
+def readonly_session():
+    """Routes the queries issued inside the block to the read-only engine.
+
+    """
+    token = _use_readonly.set(True)
+    try:
+        yield db.session
+    finally:
+        _use_readonly.reset(token)
+
+
+def read_only(func):
+    """Decorator that runs a model method's queries against the read-only engine.
 
-db = SQLAlchemy()
\ No newline at end of file
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with readonly_session():
+            return func(*args, **kwargs)
+    return wrapper
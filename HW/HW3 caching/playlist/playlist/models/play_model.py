@@ -0,0 +1,467 @@
+from collections import Counter, deque
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from playlist.db import db
+from playlist.models.song_model import Songs
+from playlist.utils.logger import configure_logger
+from playlist.utils.ranking import CountRanking
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Leaderboard windows: (window length, bucket length) in seconds. Counts cover the
+# window to the nearest bucket, so a play leaves the window at most one bucket late.
+PLAY_WINDOWS = {
+    "1h": (3600, 60),
+    "24h": (24 * 3600, 15 * 60),
+    "7d": (7 * 24 * 3600, 3600),
+}
+MAX_LEADERBOARD_LIMIT = 100
+
+PLAY_FLUSH_BATCH_SIZE = int(os.getenv("PLAY_FLUSH_BATCH_SIZE", 500))
+
+# A play's contribution to a song's hot score halves every HOT_SCORE_HALF_LIFE seconds.
+# Stored scores are only comparable under one half-life, so changing it resets the ranking.
+HOT_SCORE_HALF_LIFE = float(os.getenv("HOT_SCORE_HALF_LIFE", 24 * 3600))
+
+
+class Plays(db.Model):
+    """Represents one play of a song.
+
+    The table is append-only: rows are written in batches by PlayTracker and never
+    updated. It has no foreign key to Songs so that the history outlives deleted songs.
+    """
+
+    __tablename__ = "plays"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    song_id = db.Column(db.Integer, nullable=False)
+    played_at = db.Column(db.Float, nullable=False)  # Unix timestamp
+
+    __table_args__ = (
+        db.Index("ix_plays_played_at", "played_at"),
+        db.Index("ix_plays_song_id_played_at", "song_id", "played_at"),
+    )
+
+
+class SongHotScores(db.Model):
+    """Represents a song's exponentially decayed play score.
+
+    The score is stored in log space relative to the Unix epoch: hot_score is
+    log(sum(exp(rate * played_at))) over the song's plays, where rate is ln(2) / half-life.
+    The decayed score at time t is exp(hot_score - rate * t), so ordering by hot_score
+    orders songs by their current decayed score at any t, and adding a play is one
+    log-add-exp with no periodic decay pass.
+    """
+
+    __tablename__ = "song_hot_scores"
+
+    song_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    hot_score = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_song_hot_scores_hot_score", "hot_score"),
+    )
+
+
+def log_add_exp(a: float, b: float) -> float:
+    """Returns log(exp(a) + exp(b)) without overflowing."""
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    return max(a, b) + math.log1p(math.exp(-abs(a - b)))
+
+
+class RollingPlayCounter:
+    """
+    Play counts per song over a sliding time window.
+
+    Plays are counted in fixed-length time buckets. Each bucket's counts are also
+    folded into a CountRanking, and subtracted again when the bucket slides out of
+    the window, so the top songs can be read in O(K) at any time.
+
+    """
+
+    def __init__(self, window_seconds: int, bucket_seconds: int):
+        """Initializes an empty counter.
+
+        Args:
+            window_seconds (int): The length of the window.
+            bucket_seconds (int): The length of each bucket.
+
+        """
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.ranking = CountRanking()
+        self._buckets: deque = deque()  # (bucket start, Counter of song IDs), oldest first
+
+    def add(self, song_id: int, played_at: float) -> None:
+        """Counts a play.
+
+        Plays are expected in roughly increasing time order; a play older than the
+        newest bucket is counted in the newest bucket.
+
+        Args:
+            song_id (int): The ID of the song played.
+            played_at (float): The Unix timestamp of the play.
+
+        """
+        start = played_at - played_at % self.bucket_seconds
+        if not self._buckets or start > self._buckets[-1][0]:
+            self._buckets.append((start, Counter()))
+        self._buckets[-1][1][song_id] += 1
+        self.ranking.increment(song_id)
+
+    def expire(self, now: float) -> None:
+        """Drops the buckets that lie entirely before the window ending at now.
+
+        Each expired play costs one O(1) decrement, so expiry is amortized O(1) per play.
+
+        Args:
+            now (float): The current Unix timestamp.
+
+        """
+        cutoff = now - self.window_seconds
+        while self._buckets and self._buckets[0][0] + self.bucket_seconds <= cutoff:
+            _, counts = self._buckets.popleft()
+            for song_id, count in counts.items():
+                for _ in range(count):
+                    self.ranking.decrement(song_id)
+
+    def clear(self) -> None:
+        """Removes every count."""
+        self._buckets.clear()
+        self.ranking.clear()
+
+
+class PlayTracker:
+    """
+    Records plays to the plays table in batches and keeps rolling play counts in memory.
+
+    Each play also raises the song's decayed hot score. Score updates are buffered with the
+    plays and written in the same transaction.
+
+    """
+
+    def __init__(self, engine: Engine, flush_interval: float = 0, batch_size: int = PLAY_FLUSH_BATCH_SIZE,
+                 clock: Callable[[], float] = time.time, half_life: float = HOT_SCORE_HALF_LIFE):
+        """Initializes the tracker with empty counters.
+
+        Args:
+            engine (Engine): The engine the plays are written to.
+            flush_interval (float): The number of seconds between background flushes (0 disables the thread).
+            batch_size (int): The number of buffered plays that triggers an immediate flush.
+            clock (Callable[[], float]): The clock giving the current Unix timestamp.
+            half_life (float): The number of seconds after which a play counts half in the hot score.
+
+        """
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer: list[dict] = []
+        self.decay_rate = math.log(2) / half_life
+        self._pending_hot_scores: dict[int, float] = {}  # song_id -> log-space score of unflushed plays
+        self._counters = {
+            window: RollingPlayCounter(window_seconds, bucket_seconds)
+            for window, (window_seconds, bucket_seconds) in PLAY_WINDOWS.items()
+        }
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def record_play(self, song_id: int, played_at: Optional[float] = None) -> None:
+        """Counts a play and buffers it for the next batch write.
+
+        Args:
+            song_id (int): The ID of the song played.
+            played_at (float, optional): The Unix timestamp of the play. Defaults to now.
+
+        """
+        played_at = played_at if played_at is not None else self._clock()
+
+        with self._lock:
+            self._buffer.append({"song_id": song_id, "played_at": played_at})
+            self._pending_hot_scores[song_id] = log_add_exp(
+                self._pending_hot_scores.get(song_id, -math.inf), self.decay_rate * played_at
+            )
+            for counter in self._counters.values():
+                counter.add(song_id, played_at)
+            buffer_full = len(self._buffer) >= self.batch_size
+
+        if buffer_full:
+            try:
+                self.flush()
+            except SQLAlchemyError:
+                pass  # Logged by flush; the plays stay buffered for the next attempt
+
+    def flush(self) -> int:
+        """Writes the buffered plays and hot score updates in one transaction.
+
+        Returns:
+            int: The number of plays written.
+
+        Raises:
+            SQLAlchemyError: If the write fails. The plays are kept for the next flush.
+
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                hot_scores, self._pending_hot_scores = self._pending_hot_scores, {}
+            if not batch and not hot_scores:
+                return 0
+
+            try:
+                with self.engine.begin() as connection:
+                    if batch:
+                        connection.execute(Plays.__table__.insert(), batch)
+                    if hot_scores:
+                        self._write_hot_scores(connection, hot_scores)
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to write {len(batch)} plays: {e}")
+                with self._lock:
+                    self._buffer[:0] = batch
+                    for song_id, score in hot_scores.items():
+                        self._pending_hot_scores[song_id] = log_add_exp(
+                            self._pending_hot_scores.get(song_id, -math.inf), score
+                        )
+                raise
+
+        logger.info(f"Wrote {len(batch)} plays and {len(hot_scores)} hot scores")
+        return len(batch)
+
+    @staticmethod
+    def _write_hot_scores(connection, hot_scores: dict[int, float]) -> None:
+        """Adds the pending log-space scores to the stored ones with one read and one upsert."""
+        stored = dict(connection.execute(
+            select(SongHotScores.song_id, SongHotScores.hot_score)
+            .where(SongHotScores.song_id.in_(hot_scores))
+        ).all())
+        rows = [
+            {"song_id": song_id, "hot_score": log_add_exp(stored.get(song_id, -math.inf), score)}
+            for song_id, score in hot_scores.items()
+        ]
+        statement = sqlite_insert(SongHotScores.__table__)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["song_id"], set_={"hot_score": statement.excluded.hot_score}
+            ),
+            rows
+        )
+
+    def load_recent(self) -> int:
+        """Rebuilds the rolling counters from the plays in the longest window.
+
+        Returns:
+            int: The number of plays loaded.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+
+        """
+        now = self._clock()
+        since = now - max(window_seconds for window_seconds, _ in PLAY_WINDOWS.values())
+        statement = (
+            select(Plays.song_id, Plays.played_at)
+            .where(Plays.played_at >= since)
+            .order_by(Plays.played_at)
+        )
+
+        try:
+            with self.engine.connect() as connection:
+                rows = connection.execute(statement).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while loading recent plays: {e}")
+            raise
+
+        with self._lock:
+            for counter in self._counters.values():
+                counter.clear()
+                for song_id, played_at in rows:
+                    counter.add(song_id, played_at)
+                counter.expire(now)
+
+        logger.info(f"Loaded {len(rows)} recent plays into the rolling counters")
+        return len(rows)
+
+    def get_top_songs(self, window: str, limit: int) -> list[tuple[int, int]]:
+        """Returns the most played song IDs in a window, in O(limit).
+
+        Args:
+            window (str): One of PLAY_WINDOWS.
+            limit (int): The number of songs to return.
+
+        Returns:
+            list[tuple[int, int]]: Up to limit (song ID, plays) pairs, most played first.
+
+        Raises:
+            ValueError: If the window is unknown.
+
+        """
+        counter = self._get_counter(window)
+        with self._lock:
+            counter.expire(self._clock())
+            return counter.ranking.top(limit)
+
+    def get_leaderboard(self, window: str, limit: int = 10) -> list[dict]:
+        """
+        Returns the most played songs in a window, with their song details.
+
+        Songs deleted from the catalog are skipped.
+
+        Args:
+            window (str): One of PLAY_WINDOWS.
+            limit (int): The number of songs to return (at most MAX_LEADERBOARD_LIMIT).
+
+        Returns:
+            list[dict]: The songs, most played first, each with a "plays" count for the window.
+
+        Raises:
+            ValueError: If the window or limit is invalid.
+            SQLAlchemyError: If a database error occurs.
+
+        """
+        if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+
+        fetch = limit
+        while True:
+            top = self.get_top_songs(window, fetch)
+            songs = Songs.get_songs_by_ids(song_id for song_id, _ in top)
+            leaderboard = [
+                {**songs[song_id].to_dict(), "plays": plays}
+                for song_id, plays in top if song_id in songs
+            ]
+            # Deleted songs leave gaps; look further down the ranking until the list is full
+            if len(leaderboard) >= limit or len(top) < fetch:
+                return leaderboard[:limit]
+            fetch *= 2
+
+    def get_hot_songs(self, limit: int = 10) -> list[dict]:
+        """
+        Returns the songs with the highest decayed play scores, with their song details.
+
+        The top is read from the hot score index, so the cost depends on limit rather than
+        the catalog size. Plays not yet flushed are merged in, and deleted songs are skipped.
+
+        Args:
+            limit (int): The number of songs to return (at most MAX_LEADERBOARD_LIMIT).
+
+        Returns:
+            list[dict]: The songs, hottest first, each with its current "hot_score": the sum
+                        of its plays, each weighted by 0.5 per half-life since it was played.
+
+        Raises:
+            ValueError: If the limit is invalid.
+            SQLAlchemyError: If a database error occurs.
+
+        """
+        if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+
+        fetch = limit
+        while True:
+            # Holding the flush lock keeps a flush from moving pending plays into the table mid-read
+            with self._flush_lock:
+                with self._lock:
+                    pending = dict(self._pending_hot_scores)
+                    now = self._clock()
+
+                try:
+                    with self.engine.connect() as connection:
+                        top = connection.execute(
+                            select(SongHotScores.song_id, SongHotScores.hot_score)
+                            .order_by(SongHotScores.hot_score.desc())
+                            .limit(fetch)
+                        ).all()
+                        scores = dict(top)
+                        unranked = [song_id for song_id in pending if song_id not in scores]
+                        if unranked:
+                            scores.update(connection.execute(
+                                select(SongHotScores.song_id, SongHotScores.hot_score)
+                                .where(SongHotScores.song_id.in_(unranked))
+                            ).all())
+                except SQLAlchemyError as e:
+                    logger.error(f"Database error while reading hot songs: {e}")
+                    raise
+
+            # Unflushed plays only raise scores, and every song outside the stored top and the
+            # pending set scores no higher than the stored top, so the merged top is exact
+            for song_id, score in pending.items():
+                scores[song_id] = log_add_exp(scores.get(song_id, -math.inf), score)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:fetch]
+
+            songs = Songs.get_songs_by_ids(song_id for song_id, _ in ranked)
+            hot_songs = [
+                {**songs[song_id].to_dict(), "hot_score": math.exp(score - self.decay_rate * now)}
+                for song_id, score in ranked if song_id in songs
+            ]
+            if len(hot_songs) >= limit or len(top) < fetch:
+                return hot_songs[:limit]
+            fetch *= 2
+
+    def _get_counter(self, window: str) -> RollingPlayCounter:
+        counter = self._counters.get(window)
+        if counter is None:
+            raise ValueError(f"Invalid window: {window}. Must be one of: {', '.join(PLAY_WINDOWS)}")
+        return counter
+
+    def clear(self) -> None:
+        """Drops the buffered plays and every rolling count."""
+        with self._lock:
+            self._buffer.clear()
+            self._pending_hot_scores.clear()
+            for counter in self._counters.values():
+                counter.clear()
+        logger.info("Cleared play counters")
+
+    def start(self) -> None:
+        """Starts the background flush thread if it is not already running.
+
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="play-flusher", daemon=True)
+        self._thread.start()
+        logger.info(f"Started play flusher (every {self.flush_interval}s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the background thread and writes any buffered plays.
+
+        Args:
+            timeout (float): The number of seconds to wait for the thread to exit.
+
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except SQLAlchemyError:
+            pass
+        logger.info("Stopped play flusher")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Play flush failed: {e}")
@@ -1,35 +1,70 @@
+import heapq
 import logging
 import os
+import random
+import secrets
+import threading
 import time
-from typing import List
+from typing import List, Optional
 
+from flask import Flask
+
+from playlist.models.play_model import PlayTracker
 from playlist.models.song_model import Songs
 from playlist.utils.api_utils import get_random
+from playlist.utils.fenwick import FenwickTree
+from playlist.utils.locks import ReadWriteLock, SingleFlight, reads_shared_state, writes_shared_state
 from playlist.utils.logger import configure_logger
+from playlist.utils.memory_utils import get_deep_size
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# The most song IDs accepted by a single batch lookup
+MAX_BATCH_SONG_IDS = int(os.getenv("MAX_BATCH_SONG_IDS", 5000))
+
+
 class PlaylistModel:
     """
     A class to manage a playlist of songs.
 
     """
 
-    def __init__(self):
+    def __init__(self, play_tracker: Optional[PlayTracker] = None):
         """Initializes the PlaylistModel with an empty playlist and the current track set to 1.
 
-        The playlist is a list of Songs, and the current track number is 1-indexed.
-        The TTL (Time To Live) for song caching is set to a default value from the environment variable "TTL",
-        which defaults to 60 seconds if not set.
+        The playlist is a list of song IDs, and the current track number is 1-indexed.
+        Songs are read through the Songs song cache, which every caller shares and which drops
+        a song when it is deleted or played. Concurrent cache misses for the same song share one
+        database load; callers wait for it for at most "SONG_LOAD_TIMEOUT" seconds (default 5).
+
+        Args:
+            play_tracker (PlayTracker, optional): Records each play for the windowed leaderboards.
 
         """
+        self.play_tracker = play_tracker
         self.current_track_number = 1
         self.playlist: List[int] = []
-        self._song_cache: dict[int, Songs] = {}
-        self._ttl: dict[int, float] = {}
-        self.ttl_seconds = int(os.getenv("TTL", 60))  # Default TTL is 60 seconds
+
+        # The playlist and playback state are guarded by a read/write lock so concurrent
+        # reads never block each other
+        self._lock = ReadWriteLock()
+        self._song_loads = SingleFlight(timeout=float(os.getenv("SONG_LOAD_TIMEOUT", 5)))
+
+        # Shuffle state: a permutation of the playlist's song IDs, each ID's position in it,
+        # and the position of the current song. The seed is drawn once per session.
+        self.shuffle_enabled = False
+        self.shuffle_seed: Optional[int] = None
+        self._shuffle_rng: Optional[random.Random] = None
+        self._shuffle_order: List[int] = []
+        self._shuffle_index: dict[int, int] = {}
+        self._shuffle_position = 0
+
+        # Track durations by song ID and a Fenwick tree of them in playlist order,
+        # so time offsets can be mapped to tracks in O(log n)
+        self._durations: dict[int, int] = {}
+        self._duration_tree = FenwickTree()
 
 
     ##################################################
@@ -38,10 +73,12 @@ class PlaylistModel:
 
     def _get_song_from_cache_or_db(self, song_id: int) -> Songs:
         """
-        Retrieves a song by ID, using the internal cache if possible.
+        Retrieves a song by ID, using the song cache if possible.
 
-        This method checks whether a cached version of the song is available
-        and still valid. If not, it queries the database, updates the cache, and returns the song.
+        Cached songs come from the Songs song cache. On a miss the song is loaded from the
+        database, which also caches it; concurrent misses for the same song wait for the
+        first one's query instead of sending their own. Songs.get_song_by_id returns a
+        detached copy, so the song handed to those waiters is not tied to any session.
 
         Args:
             song_id (int): The unique ID of the song to retrieve.
@@ -51,24 +88,109 @@ class PlaylistModel:
 
         Raises:
             ValueError: If the song cannot be found in the database.
+            TimeoutError: If the load this call waited for took longer than SONG_LOAD_TIMEOUT.
         """
-        now = time.time()
-
-        if song_id in self._song_cache and self._ttl.get(song_id, 0) > now:
+        song = Songs.get_cached_song(song_id)
+        if song is not None:
             logger.debug(f"Song ID {song_id} retrieved from cache")
-            return self._song_cache[song_id]
+            return song
+
+        return self._song_loads.do(song_id, lambda: self._load_song(song_id))
 
+    def _load_song(self, song_id: int) -> Songs:
+        """
+        Loads a song from the database into the song cache. Runs once per single-flight load.
+
+        Args:
+            song_id (int): The unique ID of the song to load.
+
+        Returns:
+            Songs: The loaded song.
+
+        Raises:
+            ValueError: If the song cannot be found in the database.
+        """
+        # get_song_by_id checks the cache again: a load that finished just before this one
+        # started may already have filled it
         try:
             song = Songs.get_song_by_id(song_id)
-            logger.info(f"Song ID {song_id} loaded from DB")
+            logger.info(f"Song ID {song_id} loaded")
         except ValueError as e:
             logger.error(f"Song ID {song_id} not found in DB: {e}")
             raise ValueError(f"Song ID {song_id} not found in database") from e
-
-        self._song_cache[song_id] = song
-        self._ttl[song_id] = now + self.ttl_seconds
         return song
 
+    def _get_songs_from_cache_or_db(self, song_ids: List[int]) -> dict[int, Songs]:
+        """
+        Retrieves several songs by ID, using the song cache if possible.
+
+        Cached songs are served from the Songs song cache; all the misses are loaded
+        with one database query and added to it.
+
+        Args:
+            song_ids (List[int]): The IDs of the songs to retrieve.
+
+        Returns:
+            dict[int, Songs]: The songs found, keyed by ID. IDs with no song are absent.
+        """
+        return Songs.get_songs_by_ids(song_ids)
+
+    def refresh_expiring_songs(self, window_seconds: float, budget: int) -> int:
+        """
+        Reloads the cached songs of the playlist that expire within the refresh window.
+
+        Songs are reloaded soonest-expiring first (songs missing from the cache count as
+        already expired), at most budget of them, with one batch query. Their TTLs restart,
+        so playback keeps hitting warm entries. Songs no longer in the catalog are left to
+        expire.
+
+        Args:
+            window_seconds (float): Refresh songs whose cache entry expires within this many seconds.
+            budget (int): The most songs to reload.
+
+        Returns:
+            int: The number of songs reloaded.
+        """
+        with self._lock.read_locked():
+            song_ids = list(self.playlist)
+
+        now = time.time()
+        expiries = Songs.get_cached_song_expiries(song_ids)
+        due = [
+            (expiries.get(song_id, 0), song_id) for song_id in song_ids
+            if expiries.get(song_id, 0) - now <= window_seconds
+        ]
+        if not due or budget <= 0:
+            return 0
+
+        refresh_ids = [song_id for _, song_id in heapq.nsmallest(budget, due)]
+        loaded = Songs.reload_songs(refresh_ids)
+
+        logger.info(f"Refreshed {len(loaded)} of {len(due)} expiring playlist songs")
+        return len(loaded)
+
+    def get_songs_by_ids(self, song_ids: List[int]) -> List[Optional[Songs]]:
+        """
+        Retrieves several songs by ID in one call, using the song cache if possible.
+
+        Args:
+            song_ids (List[int]): The IDs of the songs to retrieve, at most MAX_BATCH_SONG_IDS.
+                Duplicates are allowed.
+
+        Returns:
+            List[Optional[Songs]]: The songs in the order of song_ids, with None for IDs that
+                do not exist.
+
+        Raises:
+            ValueError: If song_ids is not a list, is too long, or contains an invalid ID.
+        """
+        self.validate_song_id_list(song_ids)
+
+        songs = self._get_songs_from_cache_or_db(song_ids)
+        logger.info(f"Batch lookup found {len(songs)} of {len(set(song_ids))} distinct songs")
+        return [songs.get(song_id) for song_id in song_ids]
+
+    @writes_shared_state
     def add_song_to_playlist(self, song_id: int) -> None:
         """
         Adds a song to the playlist by ID, using the cache or database lookup.
@@ -94,9 +216,58 @@ class PlaylistModel:
             raise
 
         self.playlist.append(song.id)
+        self._durations[song.id] = song.duration
+        self._duration_tree.append(song.duration)
+        if self.shuffle_enabled:
+            self._add_to_shuffle(song.id)
         logger.info(f"Successfully added to playlist: {song.artist} - {song.title} ({song.year})")
 
+    @writes_shared_state
+    def add_songs_to_playlist(self, song_ids: List[int]) -> None:
+        """
+        Adds several songs to the end of the playlist, in order, as one operation.
+
+        The songs are looked up with one cache pass and one database query. Either all of
+        them are added or, if any is invalid, none is.
+
+        Args:
+            song_ids (List[int]): The IDs of the songs to add, at most MAX_BATCH_SONG_IDS.
+
+        Raises:
+            ValueError: If an ID is invalid, repeated, already in the playlist or not in the database.
+        """
+        logger.info("Received request to add a batch of songs to the playlist")
+
+        self.validate_song_id_list(song_ids)
+
+        if len(set(song_ids)) != len(song_ids):
+            logger.error("Song IDs to add contain duplicates")
+            raise ValueError("Song IDs to add contain duplicates")
+
+        in_playlist = set(self.playlist)
+        existing = [song_id for song_id in song_ids if song_id in in_playlist]
+        if existing:
+            logger.error(f"Songs with IDs {existing} already exist in the playlist")
+            raise ValueError(f"Songs with IDs {existing} already exist in the playlist")
 
+        songs = self._get_songs_from_cache_or_db(song_ids)
+        missing = [song_id for song_id in song_ids if song_id not in songs]
+        if missing:
+            logger.error(f"Songs with IDs {missing} not found in database")
+            raise ValueError(f"Songs with IDs {missing} not found in database")
+
+        for song_id in song_ids:
+            song = songs[song_id]
+            self.playlist.append(song_id)
+            self._durations[song_id] = song.duration
+            self._duration_tree.append(song.duration)
+            if self.shuffle_enabled:
+                self._add_to_shuffle(song_id)
+
+        logger.info(f"Successfully added {len(song_ids)} songs to the playlist")
+
+
+    @writes_shared_state
     def remove_song_by_song_id(self, song_id: int) -> None:
         """Removes a song from the playlist by its song ID.
 
@@ -117,8 +288,13 @@ class PlaylistModel:
             raise ValueError(f"Song with ID {song_id} not found in the playlist")
 
         self.playlist.remove(song_id)
+        self._durations.pop(song_id, None)
+        self._rebuild_duration_tree()
+        if self.shuffle_enabled:
+            self._remove_from_shuffle(song_id)
         logger.info(f"Successfully removed song with ID {song_id} from the playlist")
 
+    @writes_shared_state
     def remove_song_by_track_number(self, track_number: int) -> None:
         """Removes a song from the playlist by its track number (1-indexed).
 
@@ -136,8 +312,13 @@ class PlaylistModel:
         playlist_index = track_number - 1
 
         logger.info(f"Successfully removed song at track number {track_number}")
-        del self.playlist[playlist_index]
+        song_id = self.playlist.pop(playlist_index)
+        self._durations.pop(song_id, None)
+        self._rebuild_duration_tree()
+        if self.shuffle_enabled:
+            self._remove_from_shuffle(song_id)
 
+    @writes_shared_state
     def clear_playlist(self) -> None:
         """Clears all songs from the playlist.
 
@@ -153,6 +334,11 @@ class PlaylistModel:
             logger.warning("Clearing an empty playlist")
 
         self.playlist.clear()
+        self._durations.clear()
+        self._duration_tree = FenwickTree()
+        self._shuffle_order.clear()
+        self._shuffle_index.clear()
+        self._shuffle_position = 0
         logger.info("Successfully cleared the playlist")
 
 
@@ -161,6 +347,7 @@ class PlaylistModel:
     ##################################################
 
 
+    @reads_shared_state
     def get_all_songs(self) -> List[Songs]:
         """Returns a list of all songs in the playlist using cached song data.
 
@@ -174,6 +361,17 @@ class PlaylistModel:
         logger.info("Retrieving all songs in the playlist")
         return [self._get_song_from_cache_or_db(song_id) for song_id in self.playlist]
 
+    @reads_shared_state
+    def get_song_ids(self) -> List[int]:
+        """Returns the song IDs in playlist order, without loading the songs.
+
+        Returns:
+            List[int]: A copy of the playlist's song IDs.
+
+        """
+        return list(self.playlist)
+
+    @reads_shared_state
     def get_song_by_song_id(self, song_id: int) -> Songs:
         """Retrieves a song from the playlist by its song ID using the cache or DB.
 
@@ -193,6 +391,7 @@ class PlaylistModel:
         logger.info(f"Successfully retrieved song: {song.artist} - {song.title} ({song.year})")
         return song
 
+    @reads_shared_state
     def get_song_by_track_number(self, track_number: int) -> Songs:
         """Retrieves a song from the playlist by its track number (1-indexed).
 
@@ -215,6 +414,7 @@ class PlaylistModel:
         logger.info(f"Successfully retrieved song: {song.artist} - {song.title} ({song.year})")
         return song
 
+    @reads_shared_state
     def get_current_song(self) -> Songs:
         """Returns the current song being played.
 
@@ -226,8 +426,28 @@ class PlaylistModel:
         """
         self.check_if_empty()
         logger.info("Retrieving the current song being played")
+        if self.shuffle_enabled:
+            return self._get_song_from_cache_or_db(self._shuffle_order[self._shuffle_position])
         return self.get_song_by_track_number(self.current_track_number)
 
+    @reads_shared_state
+    def get_current_track_number(self) -> int:
+        """Returns the track number of the current song.
+
+        In shuffle mode this looks the current song up in the playlist, so it is O(n).
+
+        Returns:
+            int: The track number (1-indexed) of the current song.
+
+        Raises:
+            ValueError: If the playlist is empty.
+        """
+        self.check_if_empty()
+        if self.shuffle_enabled:
+            return self.playlist.index(self._shuffle_order[self._shuffle_position]) + 1
+        return self.current_track_number
+
+    @reads_shared_state
     def get_playlist_length(self) -> int:
         """Returns the number of songs in the playlist.
 
@@ -239,6 +459,7 @@ class PlaylistModel:
         logger.info(f"Retrieving playlist length: {length} songs")
         return length
 
+    @reads_shared_state
     def get_playlist_duration(self) -> int:
         """
         Returns the total duration of the playlist in seconds using cached songs.
@@ -256,6 +477,7 @@ class PlaylistModel:
     ##################################################
 
 
+    @writes_shared_state
     def go_to_track_number(self, track_number: int) -> None:
         """Sets the current track number to the specified track number.
 
@@ -271,21 +493,76 @@ class PlaylistModel:
         logger.info(f"Setting current track number to {track_number}")
         self.current_track_number = track_number
 
+        if self.shuffle_enabled:
+            # Swap the chosen song into the current slot of the shuffle order
+            self._swap_shuffle_positions(self._shuffle_index[self.playlist[track_number - 1]], self._shuffle_position)
+
     def go_to_random_track(self) -> None:
         """Sets the current track number to a randomly selected track.
 
+        Raises:
+            ValueError: If the playlist is empty.
+
+        """
+        with self._lock.write_locked():
+            self.check_if_empty()
+
+            if self.shuffle_enabled:
+                # The shuffle order is already random, so skip ahead without calling random.org
+                self.go_to_next_track()
+                self.current_track_number = self.get_current_track_number()
+                logger.info(f"Setting current track number to next shuffled track: {self.current_track_number}")
+                return
+
+            playlist_length = self.get_playlist_length()
+
+        # Get a random index using the random.org API. The lock is not held during the
+        # request, so the playlist may have shrunk by the time it returns.
+        random_track = get_random(playlist_length)
+
+        with self._lock.write_locked():
+            self.check_if_empty()
+            random_track = min(random_track, self.get_playlist_length())
+            logger.info(f"Setting current track number to random track: {random_track}")
+            self.current_track_number = random_track
+
+    @writes_shared_state
+    def go_to_next_track(self) -> None:
+        """Skips to the next track, in shuffle order if shuffle is enabled.
+
+        Wraps around to the first track (or a freshly shuffled cycle) after the last one.
+
         Raises:
             ValueError: If the playlist is empty.
 
         """
         self.check_if_empty()
+        if self.shuffle_enabled:
+            self._advance_shuffle()
+            logger.info(f"Skipped to shuffle position {self._shuffle_position}")
+        else:
+            self.current_track_number = (self.current_track_number % self.get_playlist_length()) + 1
+            logger.info(f"Skipped to track number {self.current_track_number}")
 
-        # Get a random index using the random.org API
-        random_track = get_random(self.get_playlist_length())
+    @writes_shared_state
+    def go_to_previous_track(self) -> None:
+        """Goes back to the previous track, in shuffle order if shuffle is enabled.
 
-        logger.info(f"Setting current track number to random track: {random_track}")
-        self.current_track_number = random_track
+        Wraps around to the last track before the first one.
 
+        Raises:
+            ValueError: If the playlist is empty.
+
+        """
+        self.check_if_empty()
+        if self.shuffle_enabled:
+            self._shuffle_position = (self._shuffle_position - 1) % len(self._shuffle_order)
+            logger.info(f"Went back to shuffle position {self._shuffle_position}")
+        else:
+            self.current_track_number = (self.current_track_number - 2) % self.get_playlist_length() + 1
+            logger.info(f"Went back to track number {self.current_track_number}")
+
+    @writes_shared_state
     def move_song_to_beginning(self, song_id: int) -> None:
         """Moves a song to the beginning of the playlist.
 
@@ -302,9 +579,11 @@ class PlaylistModel:
 
         self.playlist.remove(song_id)
         self.playlist.insert(0, song_id)
+        self._rebuild_duration_tree()
 
         logger.info(f"Successfully moved song with ID {song_id} to the beginning")
 
+    @writes_shared_state
     def move_song_to_end(self, song_id: int) -> None:
         """Moves a song to the end of the playlist.
 
@@ -321,9 +600,11 @@ class PlaylistModel:
 
         self.playlist.remove(song_id)
         self.playlist.append(song_id)
+        self._rebuild_duration_tree()
 
         logger.info(f"Successfully moved song with ID {song_id} to the end")
 
+    @writes_shared_state
     def move_song_to_track_number(self, song_id: int, track_number: int) -> None:
         """Moves a song to a specific track number in the playlist.
 
@@ -344,9 +625,11 @@ class PlaylistModel:
 
         self.playlist.remove(song_id)
         self.playlist.insert(playlist_index, song_id)
+        self._rebuild_duration_tree()
 
         logger.info(f"Successfully moved song with ID {song_id} to track number {track_number}")
 
+    @writes_shared_state
     def swap_songs_in_playlist(self, song1_id: int, song2_id: int) -> None:
         """Swaps the positions of two songs in the playlist.
 
@@ -370,15 +653,117 @@ class PlaylistModel:
         index1, index2 = self.playlist.index(song1_id), self.playlist.index(song2_id)
 
         self.playlist[index1], self.playlist[index2] = self.playlist[index2], self.playlist[index1]
+        if len(self._duration_tree) == len(self.playlist):
+            self._duration_tree.set(index1, self._get_track_duration(song2_id))
+            self._duration_tree.set(index2, self._get_track_duration(song1_id))
 
         logger.info(f"Successfully swapped songs with IDs {song1_id} and {song2_id}")
 
+    @writes_shared_state
+    def reorder_playlist(self, song_ids: List[int]) -> None:
+        """Replaces the playlist order with a new ordering of the same songs in O(n).
+
+        The current song stays current, at its new track number.
+
+        Args:
+            song_ids (List[int]): Every song ID in the playlist, each exactly once, in the new order.
+
+        Raises:
+            ValueError: If the playlist is empty or song_ids is not a reordering of the playlist.
+
+        """
+        logger.info("Reordering the playlist")
+        self.check_if_empty()
+
+        if not isinstance(song_ids, list) or len(song_ids) != len(self.playlist) \
+                or set(song_ids) != set(self.playlist):
+            logger.error("New order does not contain exactly the songs in the playlist")
+            raise ValueError("New order must contain every song in the playlist exactly once")
+
+        self._apply_order(song_ids)
+        logger.info(f"Successfully reordered {len(song_ids)} songs")
+
+    @writes_shared_state
+    def move_songs(self, moves: List[tuple]) -> None:
+        """Moves several songs to new track numbers at once in O(n).
+
+        Each moved song ends up at its target track number; the songs that are not moved
+        keep their relative order and fill the remaining tracks. For a single move this is
+        the same as move_song_to_track_number. The moves are validated before any is applied.
+
+        Args:
+            moves (List[tuple]): (song_id, track_number) pairs, with distinct song IDs
+                and distinct track numbers (1-indexed).
+
+        Raises:
+            ValueError: If the playlist is empty or any move is invalid.
+
+        """
+        logger.info("Applying a batch of moves to the playlist")
+        self.check_if_empty()
+
+        if not isinstance(moves, list) or not moves:
+            logger.error("Moves must be a non-empty list")
+            raise ValueError("Moves must be a non-empty list")
+
+        in_playlist = set(self.playlist)
+        targets: dict[int, int] = {}
+        moved: set = set()
+        for move in moves:
+            try:
+                song_id, track_number = move
+            except (TypeError, ValueError):
+                logger.error(f"Invalid move: {move}")
+                raise ValueError(f"Invalid move: {move}. Expected a song ID and a track number")
+
+            if isinstance(song_id, bool) or not isinstance(song_id, int) or song_id not in in_playlist:
+                logger.error(f"Song with id {song_id} not found in playlist")
+                raise ValueError(f"Song with id {song_id} not found in playlist")
+            if isinstance(track_number, bool) or not isinstance(track_number, int) \
+                    or not 1 <= track_number <= len(self.playlist):
+                logger.error(f"Invalid track number: {track_number}")
+                raise ValueError(f"Invalid track number: {track_number}")
+            if song_id in moved:
+                logger.error(f"Song with id {song_id} is moved more than once")
+                raise ValueError(f"Song with id {song_id} is moved more than once")
+            if track_number in targets:
+                logger.error(f"Track number {track_number} is the target of more than one move")
+                raise ValueError(f"Track number {track_number} is the target of more than one move")
+
+            targets[track_number] = song_id
+            moved.add(song_id)
+
+        remaining = iter([song_id for song_id in self.playlist if song_id not in moved])
+        new_order = [targets[track_number] if track_number in targets else next(remaining)
+                     for track_number in range(1, len(self.playlist) + 1)]
+
+        self._apply_order(new_order)
+        logger.info(f"Successfully applied {len(moves)} moves")
+
+    def _apply_order(self, song_ids: List[int]) -> None:
+        """Installs a new playlist order, keeping the current song current.
+
+        Args:
+            song_ids (List[int]): The validated new order.
+
+        """
+        current_song_id = None
+        if 1 <= self.current_track_number <= len(self.playlist):
+            current_song_id = self.playlist[self.current_track_number - 1]
+
+        self.playlist = list(song_ids)
+        self._rebuild_duration_tree()
+
+        if current_song_id is not None:
+            self.current_track_number = self.playlist.index(current_song_id) + 1
+
 
     ##################################################
     # Playlist Playback Functions
     ##################################################
 
 
+    @writes_shared_state
     def play_current_song(self) -> None:
         """Plays the current song and advances the playlist.
 
@@ -387,15 +772,27 @@ class PlaylistModel:
 
         """
         self.check_if_empty()
-        current_song = self.get_song_by_track_number(self.current_track_number)
 
-        logger.info(f"Playing song: {current_song.title} (ID: {current_song.id}) at track number: {self.current_track_number}")
+        if self.shuffle_enabled:
+            current_song = self._get_song_from_cache_or_db(self._shuffle_order[self._shuffle_position])
+            logger.info(f"Playing song: {current_song.title} (ID: {current_song.id}) at shuffle position: {self._shuffle_position}")
+        else:
+            current_song = self.get_song_by_track_number(self.current_track_number)
+            logger.info(f"Playing song: {current_song.title} (ID: {current_song.id}) at track number: {self.current_track_number}")
+
         current_song.update_play_count()
         logger.info(f"Updated play count for song: {current_song.title} (ID: {current_song.id})")
+        if self.play_tracker is not None:
+            self.play_tracker.record_play(current_song.id)
 
-        self.current_track_number = (self.current_track_number % self.get_playlist_length()) + 1
-        logger.info(f"Advanced to track number: {self.current_track_number}")
+        if self.shuffle_enabled:
+            self._advance_shuffle()
+            logger.info(f"Advanced to shuffle position: {self._shuffle_position}")
+        else:
+            self.current_track_number = (self.current_track_number % self.get_playlist_length()) + 1
+            logger.info(f"Advanced to track number: {self.current_track_number}")
 
+    @writes_shared_state
     def play_entire_playlist(self) -> None:
         """Plays all songs in the playlist from the beginning.
 
@@ -407,11 +804,13 @@ class PlaylistModel:
         logger.info("Starting to play the entire playlist.")
 
         self.current_track_number = 1
+        self._shuffle_position = 0
         for _ in range(self.get_playlist_length()):
             self.play_current_song()
 
         logger.info("Finished playing the entire playlist.")
 
+    @writes_shared_state
     def play_rest_of_playlist(self) -> None:
         """Plays the remaining songs in the playlist from the current track onward.
 
@@ -420,13 +819,19 @@ class PlaylistModel:
 
         """
         self.check_if_empty()
-        logger.info(f"Playing the rest of the playlist from track number: {self.current_track_number}")
-
-        for _ in range(self.get_playlist_length() - self.current_track_number + 1):
+        if self.shuffle_enabled:
+            logger.info(f"Playing the rest of the playlist from shuffle position: {self._shuffle_position}")
+            remaining = len(self._shuffle_order) - self._shuffle_position
+        else:
+            logger.info(f"Playing the rest of the playlist from track number: {self.current_track_number}")
+            remaining = self.get_playlist_length() - self.current_track_number + 1
+
+        for _ in range(remaining):
             self.play_current_song()
 
         logger.info("Finished playing the rest of the playlist.")
 
+    @writes_shared_state
     def rewind_playlist(self) -> None:
         """Resets the playlist to the first track.
 
@@ -436,9 +841,281 @@ class PlaylistModel:
         """
         self.check_if_empty()
         self.current_track_number = 1
+        self._shuffle_position = 0
         logger.info("Rewound playlist to the first track.")
 
 
+    ##################################################
+    # Time Offset Functions
+    ##################################################
+
+
+    @reads_shared_state
+    def find_track_at_time(self, seconds: int) -> dict:
+        """Finds the track playing a given number of seconds into the playlist in O(log n).
+
+        Args:
+            seconds (int): The time offset from the start of the playlist, in playlist order.
+
+        Returns:
+            dict: The track number, song ID and offset into that track in seconds.
+
+        Raises:
+            ValueError: If the playlist is empty or the time is negative or past the end.
+
+        """
+        self.check_if_empty()
+        try:
+            seconds = int(seconds)
+            if seconds < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            logger.error(f"Invalid time offset: {seconds}")
+            raise ValueError(f"Invalid time offset: {seconds}")
+
+        tree = self._get_duration_tree()
+        if seconds >= tree.total():
+            logger.error(f"Time offset {seconds} is past the end of the playlist ({tree.total()} seconds)")
+            raise ValueError(f"Time offset {seconds} is past the end of the playlist ({tree.total()} seconds)")
+
+        index = tree.find(seconds)
+        return {
+            "track_number": index + 1,
+            "song_id": self.playlist[index],
+            "offset_seconds": seconds - tree.prefix_sum(index)
+        }
+
+    @writes_shared_state
+    def seek_to_time(self, seconds: int) -> dict:
+        """Makes the track playing a given number of seconds into the playlist the current track.
+
+        Args:
+            seconds (int): The time offset from the start of the playlist, in playlist order.
+
+        Returns:
+            dict: The track number, song ID and offset into that track in seconds.
+
+        Raises:
+            ValueError: If the playlist is empty or the time is negative or past the end.
+
+        """
+        position = self.find_track_at_time(seconds)
+        logger.info(f"Seeking to {seconds} seconds: track {position['track_number']} at {position['offset_seconds']} seconds")
+        self.go_to_track_number(position["track_number"])
+        return position
+
+    @reads_shared_state
+    def time_remaining(self) -> int:
+        """Returns the playing time from the start of the current track to the end of the playlist.
+
+        This is O(log n) in playlist order. In shuffle mode it sums the songs left in the
+        current shuffle cycle instead.
+
+        Returns:
+            int: The remaining time in seconds.
+
+        Raises:
+            ValueError: If the playlist is empty.
+
+        """
+        self.check_if_empty()
+        if self.shuffle_enabled:
+            remaining = sum(
+                self._get_track_duration(song_id)
+                for song_id in self._shuffle_order[self._shuffle_position:]
+            )
+        else:
+            tree = self._get_duration_tree()
+            remaining = tree.total() - tree.prefix_sum(self.current_track_number - 1)
+
+        logger.info(f"Time remaining in the playlist: {remaining} seconds")
+        return remaining
+
+    def _get_track_duration(self, song_id: int) -> int:
+        """Returns a track's duration, falling back to the song cache for untracked songs.
+
+        Args:
+            song_id (int): The ID of the song.
+
+        Returns:
+            int: The duration in seconds.
+
+        """
+        duration = self._durations.get(song_id)
+        if duration is None:
+            duration = self._get_song_from_cache_or_db(song_id).duration
+        return duration
+
+    def _rebuild_duration_tree(self) -> None:
+        """Rebuilds the duration tree in O(n) after tracks were removed or moved.
+
+        If the playlist holds songs whose durations are not tracked (because it was replaced
+        directly), the tree is left empty and readers build it on demand.
+
+        """
+        if all(song_id in self._durations for song_id in self.playlist):
+            self._duration_tree = FenwickTree(self._durations[song_id] for song_id in self.playlist)
+        else:
+            self._duration_tree = FenwickTree()
+
+    def _get_duration_tree(self) -> FenwickTree:
+        """Returns the duration tree, building a temporary one if the playlist was replaced directly.
+
+        Returns:
+            FenwickTree: The durations in playlist order.
+
+        """
+        if len(self._duration_tree) == len(self.playlist):
+            return self._duration_tree
+        return FenwickTree(self._get_track_duration(song_id) for song_id in self.playlist)
+
+
+    ##################################################
+    # Shuffle Functions
+    ##################################################
+
+
+    @writes_shared_state
+    def enable_shuffle(self, seed: Optional[int] = None) -> None:
+        """Turns on shuffle mode, starting from a fresh permutation of the playlist.
+
+        The random generator is seeded once per session, so shuffling never calls random.org.
+        The current song (if any) stays current and the rest of the playlist follows it in
+        random order; no song repeats until every song in the cycle has been played. If shuffle
+        is already on, the current cycle is kept and nothing changes.
+
+        Args:
+            seed (int, optional): The seed to use if the session has not been seeded yet.
+                                  Defaults to a seed drawn from the OS entropy source.
+
+        """
+        if self.shuffle_enabled:
+            logger.info("Shuffle is already enabled")
+            return
+
+        if self._shuffle_rng is None:
+            self.shuffle_seed = seed if seed is not None else secrets.randbits(64)
+            self._shuffle_rng = random.Random(self.shuffle_seed)
+            logger.info("Seeded the shuffle generator for this session")
+
+        current_song_id = None
+        if self.playlist and 1 <= self.current_track_number <= len(self.playlist):
+            current_song_id = self.playlist[self.current_track_number - 1]
+
+        self._reshuffle()
+        if current_song_id is not None:
+            self._swap_shuffle_positions(self._shuffle_index[current_song_id], 0)
+
+        self.shuffle_enabled = True
+        logger.info(f"Enabled shuffle for {len(self._shuffle_order)} songs")
+
+    @writes_shared_state
+    def disable_shuffle(self) -> None:
+        """Turns off shuffle mode, continuing in playlist order from the current song.
+
+        """
+        if self.shuffle_enabled and self._shuffle_order:
+            self.current_track_number = self.get_current_track_number()
+
+        self.shuffle_enabled = False
+        self._shuffle_order.clear()
+        self._shuffle_index.clear()
+        self._shuffle_position = 0
+        logger.info("Disabled shuffle")
+
+    @reads_shared_state
+    def get_shuffle_order(self) -> List[int]:
+        """Returns the song IDs in the current shuffle cycle's play order.
+
+        Returns:
+            List[int]: The shuffled song IDs (empty if shuffle is disabled).
+
+        """
+        return list(self._shuffle_order)
+
+    def _reshuffle(self) -> None:
+        """Builds a new Fisher-Yates permutation of the playlist and starts a new cycle.
+
+        """
+        order = list(self.playlist)
+        for i in range(len(order) - 1, 0, -1):
+            j = self._shuffle_rng.randint(0, i)
+            order[i], order[j] = order[j], order[i]
+
+        self._shuffle_order = order
+        self._shuffle_index = {song_id: position for position, song_id in enumerate(order)}
+        self._shuffle_position = 0
+
+    def _advance_shuffle(self) -> None:
+        """Moves to the next position in the shuffle order, reshuffling after the last one.
+
+        """
+        self._shuffle_position += 1
+        if self._shuffle_position >= len(self._shuffle_order):
+            logger.info("Finished a shuffle cycle, reshuffling")
+            self._reshuffle()
+
+    def _swap_shuffle_positions(self, first: int, second: int) -> None:
+        """Swaps two entries of the shuffle order and updates their indexes.
+
+        Args:
+            first (int): The first position (0-indexed).
+            second (int): The second position (0-indexed).
+
+        """
+        order = self._shuffle_order
+        order[first], order[second] = order[second], order[first]
+        self._shuffle_index[order[first]] = first
+        self._shuffle_index[order[second]] = second
+
+    def _add_to_shuffle(self, song_id: int) -> None:
+        """Inserts a newly added song at a random position among the songs not yet played.
+
+        This is one step of the inside-out Fisher-Yates shuffle, so it is O(1).
+
+        Args:
+            song_id (int): The ID of the song that was added to the playlist.
+
+        """
+        self._shuffle_order.append(song_id)
+        last = len(self._shuffle_order) - 1
+        self._shuffle_index[song_id] = last
+
+        if last > self._shuffle_position:
+            target = self._shuffle_rng.randint(self._shuffle_position + 1, last)
+            self._swap_shuffle_positions(last, target)
+
+    def _remove_from_shuffle(self, song_id: int) -> None:
+        """Removes a song from the shuffle order in O(1) by swapping it out before popping it.
+
+        The boundary between played and unplayed songs is kept, so no song is skipped or
+        repeated in the current cycle. If the current song is removed, a random unplayed song
+        takes its place.
+
+        Args:
+            song_id (int): The ID of the song that was removed from the playlist.
+
+        """
+        position = self._shuffle_index[song_id]
+        last = len(self._shuffle_order) - 1
+
+        if position < self._shuffle_position:
+            # Fill the hole with the last played song, then move the hole to the current slot
+            self._swap_shuffle_positions(position, self._shuffle_position - 1)
+            self._swap_shuffle_positions(self._shuffle_position - 1, self._shuffle_position)
+            self._shuffle_position -= 1
+            position = self._shuffle_position + 1
+
+        self._swap_shuffle_positions(position, last)
+        self._shuffle_order.pop()
+        del self._shuffle_index[song_id]
+
+        if self._shuffle_order and self._shuffle_position >= len(self._shuffle_order):
+            self._reshuffle()
+        elif not self._shuffle_order:
+            self._shuffle_position = 0
+
+
     ##################################################
     # Utility Functions
     ##################################################
@@ -451,6 +1128,7 @@ class PlaylistModel:
     #
     ####################################################################################################
 
+    @reads_shared_state
     def validate_song_id(self, song_id: int, check_in_playlist: bool = True) -> int:
         """
         Validates the given song ID.
@@ -488,6 +1166,30 @@ class PlaylistModel:
 
         return song_id
 
+    def validate_song_id_list(self, song_ids: List[int]) -> None:
+        """
+        Validates a list of song IDs for a batch operation.
+
+        Args:
+            song_ids (List[int]): The song IDs to validate.
+
+        Raises:
+            ValueError: If song_ids is not a list, has more than MAX_BATCH_SONG_IDS entries,
+                        or contains anything but non-negative integers.
+        """
+        if not isinstance(song_ids, list):
+            logger.error("Song IDs must be a list")
+            raise ValueError("Song IDs must be a list")
+        if len(song_ids) > MAX_BATCH_SONG_IDS:
+            logger.error(f"Too many song IDs: {len(song_ids)}")
+            raise ValueError(f"At most {MAX_BATCH_SONG_IDS} song IDs can be requested at once")
+
+        for song_id in song_ids:
+            if isinstance(song_id, bool) or not isinstance(song_id, int) or song_id < 0:
+                logger.error(f"Invalid song id: {song_id}")
+                raise ValueError(f"Invalid song id: {song_id}")
+
+    @reads_shared_state
     def validate_track_number(self, track_number: int) -> int:
         """
         Validates the given track number, ensuring it is within the playlist's range.
@@ -512,6 +1214,44 @@ class PlaylistModel:
 
         return track_number
 
+    def get_state_version(self) -> int:
+        """
+        Returns a number that changes whenever the playlist or playback state may have changed.
+
+        Every change is made under the write lock, so this counts the write lock releases.
+
+        Returns:
+            int: The state version.
+
+        """
+        return self._lock.write_count
+
+    @reads_shared_state
+    def get_memory_usage(self) -> dict:
+        """
+        Approximates the memory held by the playlist.
+
+        The song cache is shared by every caller and reported by Songs.get_song_cache_usage.
+
+        Returns:
+            dict: The approximate size in bytes and the number of entries of each structure.
+
+        """
+        usage = {
+            "playlist": {
+                "entries": len(self.playlist),
+                "bytes": get_deep_size(self.playlist)
+            },
+            "shuffle": {
+                "entries": len(self._shuffle_order),
+                "bytes": get_deep_size(self._shuffle_order) + get_deep_size(self._shuffle_index)
+            }
+        }
+        usage["total_bytes"] = sum(structure["bytes"] for structure in usage.values())
+        logger.info(f"Playlist model memory usage: {usage['total_bytes']} bytes")
+        return usage
+
+    @reads_shared_state
     def check_if_empty(self) -> None:
         """
         Checks if the playlist is empty and raises a ValueError if it is.
@@ -523,3 +1263,84 @@ class PlaylistModel:
         if not self.playlist:
             logger.error("Playlist is empty")
             raise ValueError("Playlist is empty")
+
+
+class SongCacheRefresher:
+    """
+    Background thread that refreshes the playlist's songs in the song cache ahead of expiry.
+
+    Every interval it reloads the playlist songs whose entries expire within the refresh
+    window, up to the load budget. As long as the interval is shorter than the window and
+    the budget covers the songs expiring per interval, playback never meets a cold entry.
+
+    """
+
+    def __init__(self, app: Flask, playlist_model: PlaylistModel, interval_seconds: float,
+                 window_seconds: float, budget: int):
+        """Initializes the refresher.
+
+        Args:
+            app (Flask): The app whose context the reloads run in.
+            playlist_model (PlaylistModel): The playlist whose songs are refreshed.
+            interval_seconds (float): The number of seconds between refresh passes.
+            window_seconds (float): How long before expiry an entry becomes due.
+            budget (int): The most songs reloaded per pass.
+
+        """
+        self.app = app
+        self.playlist_model = playlist_model
+        self.interval_seconds = interval_seconds
+        self.window_seconds = window_seconds
+        self.budget = budget
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        if interval_seconds >= window_seconds:
+            logger.warning(
+                f"Song cache refresh interval ({interval_seconds}s) is not shorter than the refresh "
+                f"window ({window_seconds}s), so some entries will expire before they are refreshed"
+            )
+
+    def refresh(self) -> int:
+        """Runs one refresh pass.
+
+        Returns:
+            int: The number of songs reloaded.
+
+        """
+        with self.app.app_context():
+            return self.playlist_model.refresh_expiring_songs(self.window_seconds, self.budget)
+
+    def start(self) -> None:
+        """Starts the background thread if it is not already running.
+
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="song-cache-refresher", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Started song cache refresher (every {self.interval_seconds}s, "
+            f"window {self.window_seconds}s, budget {self.budget})"
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the background thread.
+
+        Args:
+            timeout (float): The number of seconds to wait for the thread to exit.
+
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Stopped song cache refresher")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Song cache refresh failed: {e}")
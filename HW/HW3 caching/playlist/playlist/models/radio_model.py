@@ -0,0 +1,137 @@
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+from typing import Optional
+
+from playlist.models.song_model import Songs
+from playlist.utils.alias import AliasTable
+from playlist.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class RadioModel:
+    """
+    A class to pick radio songs in proportion to their play counts.
+
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """Initializes the RadioModel with no stations built yet.
+
+        Stations are alias tables of song IDs, one for the whole catalog and one per genre.
+        They are rebuilt on the first pick after the catalog version (including play counts)
+        changes, but at most once every min_rebuild_seconds (environment variable
+        "RADIO_MIN_REBUILD_SECONDS", default 5), since every play changes it.
+
+        Args:
+            seed (int, optional): The seed of the local random generator.
+                                  Defaults to a seed drawn from the OS entropy source.
+
+        """
+        self.seed = seed if seed is not None else secrets.randbits(64)
+        self.min_rebuild_seconds = float(os.getenv("RADIO_MIN_REBUILD_SECONDS", 5))
+        self.rebuilds = 0
+
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._built_at = 0.0
+        self._stations: dict[Optional[str], tuple[list[int], AliasTable]] = {}
+
+    def next_song(self, genre: Optional[str] = None) -> Songs:
+        """
+        Picks a song with probability proportional to its play count.
+
+        If every song in the station has been played zero times, the pick is uniform.
+        No network calls are made: draws come from the local seeded generator.
+
+        Args:
+            genre (str, optional): Only pick songs of this genre.
+
+        Returns:
+            Songs: The picked song.
+
+        Raises:
+            ValueError: If the catalog (or the genre) has no songs.
+        """
+        station_name = genre.strip() if genre is not None else None
+        logger.info(f"Picking a radio song (genre={station_name})")
+
+        song_id = self._draw(station_name)
+        try:
+            return Songs.get_song_by_id(song_id)
+        except ValueError:
+            # The song was deleted since the stations were built; rebuild and draw again
+            logger.warning(f"Radio picked deleted song ID {song_id}, rebuilding stations")
+            song_id = self._draw(station_name, force_rebuild=True)
+            return Songs.get_song_by_id(song_id)
+
+    def _draw(self, station_name: Optional[str], force_rebuild: bool = False) -> int:
+        """Draws a song ID from a station, rebuilding the stations first if they are stale.
+
+        Args:
+            station_name (str, optional): The genre, or None for the whole catalog.
+            force_rebuild (bool): If True, rebuild regardless of the version and interval.
+
+        Returns:
+            int: The drawn song ID.
+
+        Raises:
+            ValueError: If the station has no songs.
+        """
+        version = Songs.get_catalog_version(include_play_counts=True)
+
+        with self._lock:
+            stale = version != self._version and time.monotonic() - self._built_at >= self.min_rebuild_seconds
+            if force_rebuild or self._version is None or stale:
+                self._build_stations(version)
+
+            station = self._stations.get(station_name)
+            if station is None:
+                if station_name is None:
+                    logger.warning("Cannot pick a radio song because the song catalog is empty.")
+                    raise ValueError("The song catalog is empty.")
+                logger.warning(f"Cannot pick a radio song: no songs in genre '{station_name}'")
+                raise ValueError(f"No songs in genre '{station_name}'")
+
+            song_ids, table = station
+            return song_ids[table.sample(self._rng)]
+
+    def _build_stations(self, version: int) -> None:
+        """Rebuilds every station's alias table from one catalog scan, in O(n).
+
+        Args:
+            version (int): The catalog version the tables are built from.
+
+        """
+        started = time.perf_counter()
+        rows = Songs.get_song_rows(("id", "genre", "play_count"))
+
+        grouped: dict[Optional[str], tuple[list[int], list[int]]] = {None: ([], [])}
+        for song_id, genre, play_count in rows:
+            for name in (None, genre):
+                song_ids, weights = grouped.setdefault(name, ([], []))
+                song_ids.append(song_id)
+                weights.append(play_count)
+
+        stations = {}
+        for name, (song_ids, weights) in grouped.items():
+            if not song_ids:
+                continue
+            if not any(weights):
+                weights = [1] * len(song_ids)
+            stations[name] = (song_ids, AliasTable(weights))
+
+        self._stations = stations
+        self._version = version
+        self._built_at = time.monotonic()
+        self.rebuilds += 1
+        logger.info(
+            f"Built {len(stations)} radio stations over {len(rows)} songs at catalog version {version} "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
@@ -1,16 +1,105 @@
+import base64
+import json
 import logging
-
+import math
+import os
+import re
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import event, func, select, text, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import make_transient_to_detached
 
-from playlist.db import db
+from playlist.db import db, get_readonly_engine, read_only
 from playlist.utils.logger import configure_logger
 from playlist.utils.api_utils import get_random
+from playlist.utils.memory_utils import get_deep_size
+from playlist.utils.snapshot import read_snapshot, write_snapshot
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# FTS5 index over the searchable song columns, kept in sync with the Songs table by triggers.
+# It is an external-content table, so it stores only the index, not a second copy of the rows.
+SEARCH_TABLE = "songs_fts"
+SEARCH_COLUMNS = ("artist", "title", "genre")
+SEARCH_WEIGHTS = (2.0, 3.0, 1.0)  # bm25 column weights: title matches rank highest, then artist
+MAX_SEARCH_LIMIT = 100
+
+# Columns returned by the plain-row list methods (Songs.get_all_songs, Songs.get_song_rows)
+LIST_COLUMNS = ("id", "artist", "title", "year", "genre", "duration", "play_count")
+
+# Columns the catalog can be sorted by in Songs.query_songs
+SORTABLE_COLUMNS = ("id", "artist", "title", "year", "genre", "duration", "play_count")
+MAX_QUERY_LIMIT = 500
+
+# Columns written by Songs.export_songs and accepted by Songs.import_songs
+EXPORT_COLUMNS = ("id", "artist", "title", "year", "genre", "duration", "play_count")
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 5000))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 2000))
+
+SEARCH_INDEX_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        artist, title, genre,
+        content='Songs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON Songs BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, artist, title, genre)
+        VALUES (new.id, new.artist, new.title, new.genre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON Songs BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, artist, title, genre)
+        VALUES ('delete', old.id, old.artist, old.title, old.genre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF artist, title, genre ON Songs BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, artist, title, genre)
+        VALUES ('delete', old.id, old.artist, old.title, old.genre);
+        INSERT INTO {SEARCH_TABLE}(rowid, artist, title, genre)
+        VALUES (new.id, new.artist, new.title, new.genre);
+    END""",
+)
+
+# Counters bumped by triggers on writes to Songs, so caches derived from the catalog can check
+# for changes with one cheap query. Row 1 counts catalog writes (inserts, deletes and updates
+# of the song details); row 2 counts play count updates, so plays do not invalidate caches of
+# the song details. They survive restarts and table resets.
+CATALOG_VERSION_TABLE = "catalog_version"
+CATALOG_VERSION_ROW = 1
+PLAY_COUNT_VERSION_ROW = 2
+
+CATALOG_VERSION_DDL = (
+    f"CREATE TABLE IF NOT EXISTS {CATALOG_VERSION_TABLE} (id INTEGER PRIMARY KEY, version INTEGER NOT NULL)",
+    f"INSERT OR IGNORE INTO {CATALOG_VERSION_TABLE} (id, version) VALUES ({CATALOG_VERSION_ROW}, 0)",
+    f"INSERT OR IGNORE INTO {CATALOG_VERSION_TABLE} (id, version) VALUES ({PLAY_COUNT_VERSION_ROW}, 0)",
+    # Replaced by the column-specific update triggers below
+    f"DROP TRIGGER IF EXISTS {CATALOG_VERSION_TABLE}_au",
+    *(
+        f"""CREATE TRIGGER IF NOT EXISTS {CATALOG_VERSION_TABLE}_{suffix} AFTER {operation} ON Songs BEGIN
+            UPDATE {CATALOG_VERSION_TABLE} SET version = version + 1 WHERE id = {row};
+        END"""
+        for suffix, operation, row in (
+            ("ai", "INSERT", CATALOG_VERSION_ROW),
+            ("ad", "DELETE", CATALOG_VERSION_ROW),
+            ("au_song", "UPDATE OF artist, title, year, genre, duration", CATALOG_VERSION_ROW),
+            ("au_play_count", "UPDATE OF play_count", PLAY_COUNT_VERSION_ROW),
+        )
+    ),
+)
+
+# Bumped when the layout of the song cache snapshot changes; older snapshots are ignored
+SONG_CACHE_SNAPSHOT_FORMAT = 2
+
+# Play count percentiles reported by Songs.get_catalog_stats
+PLAY_COUNT_PERCENTILES = (50, 90, 95, 99)
+MAX_TOP_ARTISTS = 1000
+
+
 class Songs(db.Model):
     """Represents a song in the catalog.
 
@@ -31,21 +120,75 @@ class Songs(db.Model):
     duration = db.Column(db.Integer, nullable=False)
     play_count = db.Column(db.Integer, nullable=False, default=0)
 
+    # Catalog analytics cached by catalog version, keyed by the number of top artists
+    _stats_cache = {}
+    _stats_cache_lock = threading.Lock()
+
+    # Read-through cache of song rows shared by every lookup, indexed by ID and by compound key
+    _song_cache = {}  # song_id -> (LIST_COLUMNS row, expiry timestamp, catalog version it was loaded at)
+    _song_key_index = {}  # normalized (artist, title, year) -> song_id
+    _song_cache_lock = threading.Lock()
+    song_cache_ttl_seconds = int(os.getenv("SONG_CACHE_TTL", 60))  # Default TTL is 60 seconds
+    song_cache_max_size = int(os.getenv("SONG_CACHE_MAX_SIZE", 10000))
+
+    # Composite indexes backing the compound key lookup and the query_songs filters
+    __table_args__ = (
+        db.Index("ix_songs_artist_title_year", "artist", "title", "year"),
+        db.Index("ix_songs_genre_year", "genre", "year"),
+        db.Index("ix_songs_year_duration", "year", "duration"),
+        db.Index("ix_songs_duration", "duration"),
+        db.Index("ix_songs_play_count", "play_count"),
+    )
+
     def validate(self) -> None:
         """Validates the song instance before committing to the database.
 
         Raises:
             ValueError: If any required fields are invalid.
         """
-        if not self.artist or not isinstance(self.artist, str):
+        self.validate_fields(self.artist, self.title, self.year, self.genre, self.duration)
+
+    def to_dict(self) -> dict:
+        """Returns the song's LIST_COLUMNS as a dictionary."""
+        return {column: getattr(self, column) for column in LIST_COLUMNS}
+
+    def to_row(self) -> tuple:
+        """Returns the song's LIST_COLUMNS as a tuple."""
+        return tuple(getattr(self, column) for column in LIST_COLUMNS)
+
+    @classmethod
+    def from_row(cls, row) -> "Songs":
+        """
+        Builds a detached song from a LIST_COLUMNS row, such as a cached or snapshotted one.
+
+        The song is not added to any session, so it can be handed to any caller or thread.
+
+        Args:
+            row: The LIST_COLUMNS values.
+
+        Returns:
+            Songs: The song.
+        """
+        song = cls(**dict(zip(LIST_COLUMNS, row)))
+        make_transient_to_detached(song)
+        return song
+
+    @staticmethod
+    def validate_fields(artist, title, year, genre, duration) -> None:
+        """Validates song field values without building a model instance.
+
+        Raises:
+            ValueError: If any required fields are invalid.
+        """
+        if not artist or not isinstance(artist, str):
             raise ValueError("Artist must be a non-empty string.")
-        if not self.title or not isinstance(self.title, str):
+        if not title or not isinstance(title, str):
             raise ValueError("Title must be a non-empty string.")
-        if not isinstance(self.year, int) or self.year <= 1900:
+        if not isinstance(year, int) or year <= 1900:
             raise ValueError("Year must be an integer greater than 1900.")
-        if not self.genre or not isinstance(self.genre, str):
+        if not genre or not isinstance(genre, str):
             raise ValueError("Genre must be a non-empty string.")
-        if not isinstance(self.duration, int) or self.duration <= 0:
+        if not isinstance(duration, int) or duration <= 0:
             raise ValueError("Duration must be a positive integer.")
 
     @classmethod
@@ -88,6 +231,7 @@ class Songs(db.Model):
 
             db.session.add(song)
             db.session.commit()
+            cls.invalidate_cached_song(song.id, cls.normalize_compound_key(artist, title, year))
             logger.info(f"Song successfully added: {artist} - {title} ({year})")
 
         except IntegrityError:
@@ -122,6 +266,7 @@ class Songs(db.Model):
 
             db.session.delete(song)
             db.session.commit()
+            cls.invalidate_cached_song(song_id)
             logger.info(f"Successfully deleted song with ID {song_id}")
 
         except SQLAlchemyError as e:
@@ -130,9 +275,13 @@ class Songs(db.Model):
             raise
 
     @classmethod
+    @read_only
     def get_song_by_id(cls, song_id: int) -> "Songs":
         """
-        Retrieves a song from the catalog by its ID.
+        Retrieves a song from the catalog by its ID, using the song cache if possible.
+
+        The song is always a detached copy, whether it came from the cache or the database,
+        so it can be shared between threads without touching a session.
 
         Args:
             song_id (int): The ID of the song to retrieve.
@@ -146,25 +295,38 @@ class Songs(db.Model):
         """
         logger.info(f"Attempting to retrieve song with ID {song_id}")
 
+        song = cls.get_cached_song(song_id)
+        if song is not None:
+            logger.debug(f"Song with ID {song_id} retrieved from cache")
+            return song
+
         try:
+            # Read before the row, so the entry's version is never newer than its data
+            version = cls.get_catalog_version(include_play_counts=True)
             song = cls.query.get(song_id)
 
             if not song:
                 logger.info(f"Song with ID {song_id} not found")
                 raise ValueError(f"Song with ID {song_id} not found")
 
+            cls._cache_songs([song], version)
             logger.info(f"Successfully retrieved song: {song.artist} - {song.title} ({song.year})")
-            return song
+            return cls.from_row(song.to_row())
 
         except SQLAlchemyError as e:
             logger.error(f"Database error while retrieving song by ID {song_id}: {e}")
             raise
 
     @classmethod
+    @read_only
     def get_song_by_compound_key(cls, artist: str, title: str, year: int) -> "Songs":
         """
         Retrieves a song from the catalog by its compound key (artist, title, year).
 
+        The artist and title are matched after stripping surrounding whitespace, as they are
+        stored by create_song. Cached songs are found through the compound key index. Like
+        get_song_by_id, the song is always a detached copy.
+
         Args:
             artist (str): The artist of the song.
             title (str): The title of the song.
@@ -179,15 +341,26 @@ class Songs(db.Model):
         """
         logger.info(f"Attempting to retrieve song with artist '{artist}', title '{title}', and year {year}")
 
+        key = cls.normalize_compound_key(artist, title, year)
+        with cls._song_cache_lock:
+            song_id = cls._song_key_index.get(key)
+        song = cls.get_cached_song(song_id) if song_id is not None else None
+        if song is not None:
+            logger.debug(f"Song with artist '{artist}', title '{title}', and year {year} retrieved from cache")
+            return song
+
         try:
-            song = cls.query.filter_by(artist=artist.strip(), title=title.strip(), year=year).first()
+            artist, title, year = key
+            version = cls.get_catalog_version(include_play_counts=True)
+            song = cls.query.filter_by(artist=artist, title=title, year=year).first()
 
             if not song:
                 logger.info(f"Song with artist '{artist}', title '{title}', and year {year} not found")
                 raise ValueError(f"Song with artist '{artist}', title '{title}', and year {year} not found")
 
+            cls._cache_songs([song], version)
             logger.info(f"Successfully retrieved song: {song.artist} - {song.title} ({song.year})")
-            return song
+            return cls.from_row(song.to_row())
 
         except SQLAlchemyError as e:
             logger.error(
@@ -197,10 +370,314 @@ class Songs(db.Model):
             raise
 
     @classmethod
+    @read_only
+    def get_songs_by_ids(cls, song_ids: Iterable[int]) -> dict[int, "Songs"]:
+        """
+        Retrieves the songs with the given IDs, from the song cache or in a single IN query.
+
+        Like get_song_by_id, the songs are always detached copies.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs to retrieve.
+
+        Returns:
+            dict[int, Songs]: The songs found, keyed by ID. IDs with no song are absent.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        song_ids = set(song_ids)
+        if not song_ids:
+            return {}
+
+        logger.info(f"Attempting to retrieve {len(song_ids)} songs by ID")
+
+        songs = {}
+        for song_id in song_ids:
+            song = cls.get_cached_song(song_id)
+            if song is not None:
+                songs[song_id] = song
+        misses = song_ids.difference(songs)
+        if not misses:
+            logger.info(f"Retrieved {len(songs)} songs by ID from cache")
+            return songs
+
+        try:
+            version = cls.get_catalog_version(include_play_counts=True)
+            loaded = cls.query.filter(cls.id.in_(misses)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving songs by ID: {e}")
+            raise
+
+        cls._cache_songs(loaded, version)
+        songs.update((song.id, cls.from_row(song.to_row())) for song in loaded)
+        logger.info(f"Retrieved {len(songs)} of {len(song_ids)} songs by ID ({len(misses)} from DB)")
+        return songs
+
+    ##################################################
+    # Song Cache
+    ##################################################
+
+    @staticmethod
+    def normalize_compound_key(artist: str, title: str, year: int) -> tuple:
+        """
+        Returns the compound key (artist, title, year) in the form songs are stored with.
+
+        Args:
+            artist (str): The artist of the song.
+            title (str): The title of the song.
+            year (int): The year the song was released.
+
+        Returns:
+            tuple: The stripped artist and title, and the year.
+        """
+        return artist.strip(), title.strip(), year
+
+    @classmethod
+    def get_cached_song(cls, song_id: int) -> Optional["Songs"]:
+        """
+        Returns a cached song as a new detached instance, or None if it is not cached or expired.
+
+        Each call builds its own instance, so callers and sessions never share one object.
+
+        Args:
+            song_id (int): The ID of the song.
+
+        Returns:
+            Songs: The cached song, or None.
+        """
+        with cls._song_cache_lock:
+            entry = cls._song_cache.get(song_id)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return cls.from_row(entry[0])
+
+    @classmethod
+    def _cache_songs(cls, songs: Iterable["Songs"], version: int) -> None:
+        """
+        Adds songs loaded from the database to the song cache.
+
+        Args:
+            songs (Iterable[Songs]): The loaded songs.
+            version (int): The catalog version (including play counts) read before loading them.
+        """
+        cls._cache_rows((song.to_row() for song in songs), version)
+
+    @classmethod
+    def _cache_rows(cls, rows: Iterable[tuple], version: int) -> None:
+        """
+        Adds LIST_COLUMNS rows to the song cache with a full TTL.
+
+        Args:
+            rows (Iterable[tuple]): The song rows.
+            version (int): The catalog version (including play counts) the rows are at least as new as.
+        """
+        now = time.time()
+        with cls._song_cache_lock:
+            for row in rows:
+                song_id = row[0]
+                if song_id not in cls._song_cache and len(cls._song_cache) >= cls.song_cache_max_size:
+                    cls._evict_cached_songs(now)
+                cls._song_cache[song_id] = (tuple(row), now + cls.song_cache_ttl_seconds, version)
+                cls._song_key_index[tuple(row[1:4])] = song_id
+
+    @classmethod
+    def get_cached_song_expiries(cls, song_ids: Iterable[int]) -> dict[int, float]:
+        """
+        Returns when each of the given songs expires from the song cache.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs.
+
+        Returns:
+            dict[int, float]: The expiry timestamp of each cached song. Songs not cached are absent.
+        """
+        with cls._song_cache_lock:
+            return {
+                song_id: cls._song_cache[song_id][1]
+                for song_id in song_ids if song_id in cls._song_cache
+            }
+
+    @classmethod
+    @read_only
+    def reload_songs(cls, song_ids: Iterable[int]) -> dict[int, "Songs"]:
+        """
+        Reloads songs from the database with one IN query, restarting their cache TTLs.
+
+        Unlike get_songs_by_ids, cached songs are reloaded too.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs to reload.
+
+        Returns:
+            dict[int, Songs]: The songs found, keyed by ID. IDs with no song are absent.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        song_ids = set(song_ids)
+        if not song_ids:
+            return {}
+
+        try:
+            version = cls.get_catalog_version(include_play_counts=True)
+            loaded = cls.query.filter(cls.id.in_(song_ids)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while reloading songs: {e}")
+            raise
+
+        cls._cache_songs(loaded, version)
+        logger.info(f"Reloaded {len(loaded)} of {len(song_ids)} songs into the song cache")
+        return {song.id: cls.from_row(song.to_row()) for song in loaded}
+
+    @classmethod
+    def _evict_cached_songs(cls, now: float) -> None:
+        """
+        Drop expired cache entries, then the oldest ones if the cache is still full.
+
+        Must be called with the cache lock held.
+
+        Args:
+            now (float): The current time.
+        """
+        for song_id in [song_id for song_id, entry in cls._song_cache.items() if entry[1] <= now]:
+            cls._pop_cached_song(song_id)
+
+        while len(cls._song_cache) >= cls.song_cache_max_size:
+            cls._pop_cached_song(next(iter(cls._song_cache)))
+
+    @classmethod
+    def _pop_cached_song(cls, song_id: int) -> None:
+        """Removes a song and its compound key from the cache. Must be called with the cache lock held."""
+        entry = cls._song_cache.pop(song_id, None)
+        if entry is not None:
+            _, artist, title, year = entry[0][:4]
+            if cls._song_key_index.get((artist, title, year)) == song_id:
+                del cls._song_key_index[(artist, title, year)]
+
+    @classmethod
+    def invalidate_cached_song(cls, song_id: int, compound_key: Optional[tuple] = None) -> None:
+        """
+        Remove a song from the song cache.
+
+        Args:
+            song_id (int): The ID of the song.
+            compound_key (tuple, optional): A normalized compound key to forget as well,
+                                            whichever song it currently points to.
+        """
+        with cls._song_cache_lock:
+            cls._pop_cached_song(song_id)
+            if compound_key is not None:
+                cached_id = cls._song_key_index.pop(compound_key, None)
+                if cached_id is not None:
+                    cls._pop_cached_song(cached_id)
+        logger.debug(f"Invalidated cached song with ID {song_id}")
+
+    @classmethod
+    def clear_song_cache(cls) -> None:
+        """
+        Remove every song from the song cache.
+
+        """
+        with cls._song_cache_lock:
+            cls._song_cache.clear()
+            cls._song_key_index.clear()
+        logger.info("Cleared the song cache")
+
+    @classmethod
+    def get_song_cache_usage(cls) -> dict:
+        """
+        Approximates the memory held by the song cache.
+
+        Returns:
+            dict: The number of entries and their approximate size in bytes.
+
+        """
+        with cls._song_cache_lock:
+            return {
+                "entries": len(cls._song_cache),
+                "bytes": get_deep_size(cls._song_cache) + get_deep_size(cls._song_key_index)
+            }
+
+    @classmethod
+    def save_cache_snapshot(cls, path: str) -> int:
+        """
+        Writes the song cache to a snapshot file, the most recently loaded songs first.
+
+        Each song is saved with the catalog version (including play counts) it was loaded
+        at, so a restore can tell which songs may have changed since.
+
+        Args:
+            path (str): The snapshot file.
+
+        Returns:
+            int: The number of songs written.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        with cls._song_cache_lock:
+            entries = sorted(cls._song_cache.values(), key=lambda entry: entry[1], reverse=True)
+        rows = [[*row, version] for row, _, version in entries]
+
+        size = write_snapshot(path, {
+            "format": SONG_CACHE_SNAPSHOT_FORMAT,
+            "saved_at": time.time(),
+            "columns": [*LIST_COLUMNS, "catalog_version"],
+            "songs": rows,
+        })
+        logger.info(f"Saved {len(rows)} cached songs to {path} ({size} bytes)")
+        return len(rows)
+
+    @classmethod
+    def load_cache_snapshot(cls, path: str) -> int:
+        """
+        Fills the song cache from a snapshot written by save_cache_snapshot.
+
+        Songs loaded at the current catalog version are used as they are. Any other song
+        may have been edited, played or deleted since, so all of those are reloaded with
+        one batch query, which drops deleted songs. Entries get a full TTL either way.
+
+        Args:
+            path (str): The snapshot file.
+
+        Returns:
+            int: The number of songs loaded into the cache (0 if there is no usable snapshot).
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        snapshot = read_snapshot(path)
+        if snapshot is None:
+            return 0
+        if (snapshot.get("format") != SONG_CACHE_SNAPSHOT_FORMAT
+                or snapshot.get("columns") != [*LIST_COLUMNS, "catalog_version"]):
+            logger.warning(f"Ignoring song cache snapshot at {path} with an unknown format")
+            return 0
+
+        rows = snapshot.get("songs", [])[:cls.song_cache_max_size]
+        catalog_version = cls.get_catalog_version(include_play_counts=True)
+        current = [row[:-1] for row in rows if row[-1] == catalog_version]
+        stale_ids = [row[0] for row in rows if row[-1] != catalog_version]
+
+        cls._cache_rows(current, catalog_version)
+        revalidated = len(cls.reload_songs(stale_ids)) if stale_ids else 0
+
+        logger.info(
+            f"Loaded {len(current) + revalidated} songs into the song cache from {path}: "
+            f"{len(current)} current, {revalidated} of {len(stale_ids)} revalidated at catalog version {catalog_version}"
+        )
+        return len(current) + revalidated
+
+    @classmethod
+    @read_only
     def get_all_songs(cls, sort_by_play_count: bool = False) -> list[dict]:
         """
         Retrieves all songs from the catalog as dictionaries.
 
+        Only the listed columns are selected and the dictionaries are built straight from
+        the result rows, without loading ORM instances.
+
         Args:
             sort_by_play_count (bool): If True, sort the songs by play count in descending order.
 
@@ -212,37 +689,184 @@ class Songs(db.Model):
         """
         logger.info("Attempting to retrieve all songs from the catalog")
 
+        rows = cls.get_song_rows(sort_by_play_count=sort_by_play_count)
+
+        if not rows:
+            logger.warning("The song catalog is empty.")
+            return []
+
+        results = [dict(zip(LIST_COLUMNS, row)) for row in rows]
+
+        logger.info(f"Retrieved {len(results)} songs from the catalog")
+        return results
+
+    @classmethod
+    @read_only
+    def get_song_rows(cls, columns: tuple = LIST_COLUMNS, sort_by_play_count: bool = False) -> list[tuple]:
+        """
+        Retrieves the given columns of every song as plain tuples.
+
+        This is the lightest way to read the whole catalog: no ORM instances, identity-map
+        entries or dictionaries are created.
+
+        Args:
+            columns (tuple): The columns to select, in order (a subset of LIST_COLUMNS).
+            sort_by_play_count (bool): If True, sort the songs by play count in descending order.
+
+        Returns:
+            list[tuple]: One tuple of column values per song.
+
+        Raises:
+            ValueError: If a column is not in LIST_COLUMNS.
+            SQLAlchemyError: If any database error occurs.
+        """
+        unknown = [column for column in columns if column not in LIST_COLUMNS]
+        if not columns or unknown:
+            raise ValueError(f"Invalid columns: {', '.join(unknown) or 'none given'}. Must be from: {', '.join(LIST_COLUMNS)}")
+
+        statement = select(*[getattr(cls, column) for column in columns])
+        if sort_by_play_count:
+            statement = statement.order_by(cls.play_count.desc())
+
         try:
-            query = cls.query
-            if sort_by_play_count:
-                query = query.order_by(cls.play_count.desc())
-
-            songs = query.all()
-
-            if not songs:
-                logger.warning("The song catalog is empty.")
-                return []
-
-            results = [
-                {
-                    "id": song.id,
-                    "artist": song.artist,
-                    "title": song.title,
-                    "year": song.year,
-                    "genre": song.genre,
-                    "duration": song.duration,
-                    "play_count": song.play_count,
-                }
-                for song in songs
-            ]
-
-            logger.info(f"Retrieved {len(results)} songs from the catalog")
-            return results
+            return [tuple(row) for row in db.session.execute(statement)]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving song rows: {e}")
+            raise
+
+    @staticmethod
+    def encode_cursor(sort_value, song_id: int) -> str:
+        """
+        Encodes the position after a row as an opaque keyset pagination cursor.
+
+        Args:
+            sort_value: The row's value in the sort column.
+            song_id (int): The row's ID, which breaks ties between equal sort values.
+
+        Returns:
+            str: The URL-safe cursor.
+        """
+        return base64.urlsafe_b64encode(json.dumps([sort_value, song_id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """
+        Decodes a cursor created by encode_cursor.
+
+        Args:
+            cursor (str): The cursor.
+
+        Returns:
+            tuple: The sort value and song ID of the last row of the previous page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            sort_value, song_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return sort_value, int(song_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @classmethod
+    @read_only
+    def query_songs(
+        cls,
+        genre: Optional[str] = None,
+        artist: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        duration_min: Optional[int] = None,
+        duration_max: Optional[int] = None,
+        sort_by: str = "id",
+        descending: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """
+        Retrieves a page of songs matching the given filters.
+
+        Filters are combined with AND; ranges are inclusive. Pages are keyset-paginated:
+        pass the returned next_cursor to get the following page. Unlike offsets, the cost
+        of a page does not grow with its position in the catalog.
+
+        Args:
+            genre (str, optional): Only songs of this genre.
+            artist (str, optional): Only songs by this artist.
+            year_min (int, optional): Only songs released in or after this year.
+            year_max (int, optional): Only songs released in or before this year.
+            duration_min (int, optional): Only songs at least this many seconds long.
+            duration_max (int, optional): Only songs at most this many seconds long.
+            sort_by (str): The column to sort by. Ties are broken by ID.
+            descending (bool): If True, sort in descending order.
+            limit (int): The maximum number of songs to return (at most MAX_QUERY_LIMIT).
+            cursor (str, optional): The next_cursor of the previous page.
+
+        Returns:
+            dict: The songs on this page and the cursor of the next page (None on the last page).
+
+        Raises:
+            ValueError: If any argument is invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Invalid sort_by: {sort_by}. Must be one of: {', '.join(SORTABLE_COLUMNS)}")
+        if not 1 <= limit <= MAX_QUERY_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_QUERY_LIMIT}")
+
+        logger.info(
+            f"Querying songs: genre={genre}, artist={artist}, year=[{year_min}, {year_max}], "
+            f"duration=[{duration_min}, {duration_max}], sort_by={sort_by}, descending={descending}"
+        )
+
+        columns = [cls.id, cls.artist, cls.title, cls.year, cls.genre, cls.duration, cls.play_count]
+        query = db.session.query(*columns)
+
+        if genre is not None:
+            query = query.filter(cls.genre == genre.strip())
+        if artist is not None:
+            query = query.filter(cls.artist == artist.strip())
+        if year_min is not None:
+            query = query.filter(cls.year >= year_min)
+        if year_max is not None:
+            query = query.filter(cls.year <= year_max)
+        if duration_min is not None:
+            query = query.filter(cls.duration >= duration_min)
+        if duration_max is not None:
+            query = query.filter(cls.duration <= duration_max)
+
+        sort_column = getattr(cls, sort_by)
+        if cursor is not None:
+            last_value, last_id = cls.decode_cursor(cursor)
+            if sort_by == "id":
+                query = query.filter(cls.id < last_id if descending else cls.id > last_id)
+            else:
+                position = tuple_(sort_column, cls.id)
+                query = query.filter(position < (last_value, last_id) if descending else position > (last_value, last_id))
+
+        if sort_by == "id":
+            order_by = [cls.id.desc() if descending else cls.id]
+        elif descending:
+            order_by = [sort_column.desc(), cls.id.desc()]
+        else:
+            order_by = [sort_column, cls.id]
 
+        try:
+            # Fetch one extra row to know whether there is another page
+            rows = query.order_by(*order_by).limit(limit + 1).all()
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving all songs: {e}")
+            logger.error(f"Database error while querying songs: {e}")
             raise
 
+        songs = [row._asdict() for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = songs[-1]
+            next_cursor = cls.encode_cursor(last[sort_by], last["id"])
+
+        logger.info(f"Query returned {len(songs)} songs")
+        return {"songs": songs, "next_cursor": next_cursor}
+
     @classmethod
     def get_random_song(cls) -> dict:
         """
@@ -281,6 +905,7 @@ class Songs(db.Model):
 
             song.play_count += 1
             db.session.commit()
+            Songs.invalidate_cached_song(self.id)
 
             logger.info(f"Play count incremented for song with ID: {self.id}")
 
@@ -288,3 +913,509 @@ class Songs(db.Model):
             logger.error(f"Database error while updating play count for song with ID {self.id}: {e}")
             db.session.rollback()
             raise
+
+    ##################################################
+    # Export / Import
+    ##################################################
+
+    @classmethod
+    def export_songs(cls, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[dict]:
+        """
+        Streams every song in the catalog, ordered by ID, as a dictionary.
+
+        Rows are read from a server-side cursor batch_size at a time, so memory use does not
+        grow with the catalog. The read-only engine is used when one is configured.
+
+        Args:
+            batch_size (int): The number of rows fetched from the cursor at a time.
+
+        Yields:
+            dict: The next song, with the columns in EXPORT_COLUMNS.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        logger.info("Exporting the song catalog")
+        engine = get_readonly_engine() or db.engine
+        columns = [getattr(cls, column) for column in EXPORT_COLUMNS]
+        count = 0
+
+        try:
+            with engine.connect() as connection:
+                result = connection.execution_options(yield_per=batch_size).execute(
+                    select(*columns).order_by(cls.id)
+                )
+                for row in result:
+                    count += 1
+                    yield row._asdict()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while exporting songs: {e}")
+            raise
+
+        logger.info(f"Exported {count} songs")
+
+    @classmethod
+    def import_songs(cls, records: Iterable[dict], batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+        """
+        Adds songs from an iterable of dictionaries, such as the output of export_songs.
+
+        Records are validated and inserted batch_size at a time, so the input can be
+        streamed. The whole import runs in one transaction: if any record is invalid,
+        nothing is imported. Records whose ID or compound key (artist, title, year)
+        already exists are skipped. IDs and play counts are kept when present.
+
+        Args:
+            records (Iterable[dict]): The songs to import.
+            batch_size (int): The number of records inserted per statement.
+
+        Returns:
+            dict: The number of songs imported and skipped.
+
+        Raises:
+            ValueError: If a record is invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        logger.info("Importing songs into the catalog")
+        imported = skipped = 0
+        batch = []
+
+        try:
+            for line_number, record in enumerate(records, start=1):
+                batch.append(cls._validate_import_record(record, line_number))
+                if len(batch) >= batch_size:
+                    inserted = cls._insert_import_batch(batch)
+                    imported += inserted
+                    skipped += len(batch) - inserted
+                    batch = []
+
+            if batch:
+                inserted = cls._insert_import_batch(batch)
+                imported += inserted
+                skipped += len(batch) - inserted
+
+            db.session.commit()
+
+        except ValueError as e:
+            logger.warning(f"Import failed validation, rolling back: {e}")
+            db.session.rollback()
+            raise
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while importing songs: {e}")
+            db.session.rollback()
+            raise
+
+        logger.info(f"Imported {imported} songs, skipped {skipped} existing songs")
+        return {"imported": imported, "skipped": skipped}
+
+    @classmethod
+    def _validate_import_record(cls, record: dict, line_number: int) -> dict:
+        """
+        Checks one import record and returns the column values to insert.
+
+        Args:
+            record (dict): The record to check.
+            line_number (int): The record's position in the input, for error messages.
+
+        Returns:
+            dict: The validated column values.
+
+        Raises:
+            ValueError: If the record is invalid.
+        """
+        unknown = set(record) - set(EXPORT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Record {line_number} has unknown fields: {', '.join(sorted(unknown))}")
+
+        values = {
+            "artist": record.get("artist"),
+            "title": record.get("title"),
+            "year": record.get("year"),
+            "genre": record.get("genre"),
+            "duration": record.get("duration"),
+        }
+        try:
+            cls.validate_fields(**values)
+        except ValueError as e:
+            raise ValueError(f"Record {line_number} is invalid: {e}") from e
+
+        for column in ("artist", "title", "genre"):
+            values[column] = values[column].strip()
+
+        for column in ("id", "play_count"):
+            value = record.get(column)
+            if value is not None:
+                if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                    raise ValueError(f"Record {line_number} is invalid: {column} must be a non-negative integer.")
+        values["id"] = record.get("id")
+        values["play_count"] = record.get("play_count") or 0
+        return values
+
+    @classmethod
+    def _insert_import_batch(cls, batch: list[dict]) -> int:
+        """
+        Inserts one batch of validated records, skipping songs that already exist.
+
+        Args:
+            batch (list[dict]): The validated records.
+
+        Returns:
+            int: The number of songs inserted.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        # One indexed lookup finds every compound key of the batch that is already taken
+        keys = {(values["artist"], values["title"], values["year"]) for values in batch}
+        existing = set(
+            db.session.query(cls.artist, cls.title, cls.year)
+            .filter(tuple_(cls.artist, cls.title, cls.year).in_(keys))
+            .all()
+        )
+
+        rows = []
+        for values in batch:
+            key = (values["artist"], values["title"], values["year"])
+            if key not in existing:
+                existing.add(key)
+                rows.append(values)
+
+        if not rows:
+            return 0
+
+        # Rows with and without an ID have different column sets, so insert them separately;
+        # rows whose ID is already taken are skipped by ON CONFLICT DO NOTHING
+        inserted = 0
+        for group in ([row for row in rows if row["id"] is not None],
+                      [{k: v for k, v in row.items() if k != "id"} for row in rows if row["id"] is None]):
+            if group:
+                result = db.session.execute(sqlite_insert(cls.__table__).on_conflict_do_nothing(), group)
+                inserted += result.rowcount
+        return inserted
+
+    ##################################################
+    # Catalog Analytics
+    ##################################################
+
+    @classmethod
+    def ensure_catalog_version(cls) -> None:
+        """
+        Creates the catalog version counter and its triggers if they do not exist yet.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        with db.engine.begin() as connection:
+            _create_catalog_version(connection)
+
+    @classmethod
+    @read_only
+    def get_catalog_version(cls, include_play_counts: bool = False) -> int:
+        """
+        Returns the catalog version, which changes whenever a song is created, deleted or edited.
+
+        Play count updates do not change it unless include_play_counts is set, so caches of
+        the song details survive plays.
+
+        Args:
+            include_play_counts (bool): If True, the version also changes on every play count update.
+
+        Returns:
+            int: The current catalog version.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        if not include_play_counts:
+            version = db.session.execute(
+                text(f"SELECT version FROM {CATALOG_VERSION_TABLE} WHERE id = {CATALOG_VERSION_ROW}")
+            ).scalar()
+            return version or 0
+
+        # Both counters only grow, so their sum changes whenever either one does
+        version = db.session.execute(
+            text(f"SELECT SUM(version) FROM {CATALOG_VERSION_TABLE} WHERE id IN ({CATALOG_VERSION_ROW}, {PLAY_COUNT_VERSION_ROW})")
+        ).scalar()
+        return version or 0
+
+    @classmethod
+    def get_catalog_stats(cls, top_artists: int = 20) -> dict:
+        """
+        Computes catalog analytics, served from cache until the catalog or a play count changes.
+
+        The aggregates are computed by the database with GROUP BY, so only the
+        grouped rows are transferred, never the whole table.
+
+        Args:
+            top_artists (int): The number of artists with the longest total duration to include.
+
+        Returns:
+            dict: Song counts by genre, song and play totals by decade, the top artists by
+                  total duration, and play count percentiles.
+
+        Raises:
+            ValueError: If top_artists is out of range.
+            SQLAlchemyError: If a database error occurs.
+        """
+        if not 1 <= top_artists <= MAX_TOP_ARTISTS:
+            raise ValueError(f"top_artists must be between 1 and {MAX_TOP_ARTISTS}")
+
+        version = cls.get_catalog_version(include_play_counts=True)
+        with cls._stats_cache_lock:
+            cached = cls._stats_cache.get(top_artists)
+        if cached is not None and cached["catalog_version"] == version:
+            logger.debug(f"Catalog stats for version {version} retrieved from cache")
+            return cached
+
+        logger.info(f"Computing catalog stats for version {version}")
+        try:
+            stats = cls._compute_catalog_stats(top_artists)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while computing catalog stats: {e}")
+            raise
+
+        # Tag with the version read before computing: a write in between only causes a recompute
+        stats["catalog_version"] = version
+        with cls._stats_cache_lock:
+            cls._stats_cache[top_artists] = stats
+        return stats
+
+    @classmethod
+    @read_only
+    def _compute_catalog_stats(cls, top_artists: int) -> dict:
+        """
+        Runs the analytics queries.
+
+        Args:
+            top_artists (int): The number of artists to include.
+
+        Returns:
+            dict: The catalog analytics (without the catalog version).
+        """
+        genres = db.session.query(cls.genre, func.count().label("songs")) \
+            .group_by(cls.genre).order_by(func.count().desc(), cls.genre).all()
+
+        decade = (cls.year // 10 * 10).label("decade")
+        decades = db.session.query(decade, func.count().label("songs"), func.sum(cls.play_count).label("plays")) \
+            .group_by(decade).order_by(decade).all()
+
+        total_duration = func.sum(cls.duration).label("total_duration")
+        artists = db.session.query(cls.artist, func.count().label("songs"), total_duration) \
+            .group_by(cls.artist).order_by(total_duration.desc(), cls.artist).limit(top_artists).all()
+
+        # A histogram of play counts (answered from the play_count index) is enough for exact percentiles
+        histogram = db.session.query(cls.play_count, func.count()) \
+            .group_by(cls.play_count).order_by(cls.play_count).all()
+
+        return {
+            "song_count": sum(count for _, count in histogram),
+            "genres": [row._asdict() for row in genres],
+            "decades": [row._asdict() for row in decades],
+            "top_artists": [row._asdict() for row in artists],
+            "play_count_percentiles": cls._percentiles_from_histogram(histogram, PLAY_COUNT_PERCENTILES),
+        }
+
+    @staticmethod
+    def _percentiles_from_histogram(histogram: list, percentiles: tuple) -> dict:
+        """
+        Computes nearest-rank percentiles from (value, count) pairs sorted by value.
+
+        Args:
+            histogram (list): The (value, count) pairs.
+            percentiles (tuple): The percentiles to compute (0-100).
+
+        Returns:
+            dict: The value at each percentile, keyed 'p<percentile>', plus 'max' (all None if empty).
+        """
+        total = sum(count for _, count in histogram)
+        results = {f"p{percentile}": None for percentile in percentiles}
+        results["max"] = histogram[-1][0] if histogram else None
+        if not total:
+            return results
+
+        ranks = sorted((max(1, math.ceil(percentile / 100 * total)), percentile) for percentile in percentiles)
+        seen = 0
+        rank_index = 0
+        for value, count in histogram:
+            seen += count
+            while rank_index < len(ranks) and ranks[rank_index][0] <= seen:
+                results[f"p{ranks[rank_index][1]}"] = value
+                rank_index += 1
+        return results
+
+    @classmethod
+    def clear_stats_cache(cls) -> None:
+        """
+        Discards all cached catalog analytics.
+
+        """
+        with cls._stats_cache_lock:
+            cls._stats_cache.clear()
+        logger.info("Cleared the catalog stats cache")
+
+    ##################################################
+    # Full-Text Search
+    ##################################################
+
+    @staticmethod
+    def get_extra_ddl() -> tuple:
+        """
+        Returns the DDL the Songs table relies on that is not part of the model metadata.
+
+        Returns:
+            tuple: The search index and catalog version statements.
+        """
+        return SEARCH_INDEX_DDL + CATALOG_VERSION_DDL
+
+    @classmethod
+    def ensure_indexes(cls) -> None:
+        """
+        Creates any of the table's declared indexes that do not exist yet.
+
+        create_all only creates indexes along with a new table, so this brings
+        existing databases up to date.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        for index in cls.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+    @classmethod
+    def ensure_search_index(cls) -> None:
+        """
+        Creates the FTS5 search index and its triggers if they do not exist yet.
+
+        New Songs tables get the index through the after_create hook; this covers
+        databases created before the index existed, which are backfilled with a rebuild.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        with db.engine.begin() as connection:
+            if connection.dialect.name != "sqlite":
+                return
+
+            exists = connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+            ).first()
+            _create_search_index(connection)
+
+            if not exists:
+                logger.info("Backfilling the song search index")
+                connection.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+    @staticmethod
+    def build_search_query(query: str) -> str:
+        """
+        Converts free text into an FTS5 MATCH expression.
+
+        Each word is quoted (so FTS5 operators in the input are treated as text) and
+        made a prefix match, so "beat" matches "Beatles" and "Beat It".
+
+        Args:
+            query (str): The text to search for.
+
+        Returns:
+            str: The MATCH expression.
+
+        Raises:
+            ValueError: If the query contains no searchable words.
+        """
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            raise ValueError("Search query must contain at least one letter or digit")
+        return " ".join(f'"{term}"*' for term in terms)
+
+    @classmethod
+    @read_only
+    def search_songs(cls, query: str, limit: int = 20, offset: int = 0) -> dict:
+        """
+        Searches the catalog by artist, title and genre, ranked by bm25.
+
+        Args:
+            query (str): The text to search for. Every word must match the start of a word in the song.
+            limit (int): The maximum number of songs to return (at most MAX_SEARCH_LIMIT).
+            offset (int): The number of matching songs to skip.
+
+        Returns:
+            dict: The matching songs, best match first, and whether more results exist.
+
+        Raises:
+            ValueError: If the query, limit or offset is invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+
+        match = cls.build_search_query(query)
+        logger.info(f"Searching songs for {match!r} (limit={limit}, offset={offset})")
+
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        statement = text(f"""
+            SELECT s.id, s.artist, s.title, s.year, s.genre, s.duration, s.play_count
+            FROM {SEARCH_TABLE}
+            JOIN Songs AS s ON s.id = {SEARCH_TABLE}.rowid
+            WHERE {SEARCH_TABLE} MATCH :match
+            ORDER BY bm25({SEARCH_TABLE}, {weights})
+            LIMIT :limit OFFSET :offset
+        """)
+
+        try:
+            # Fetch one extra row to know whether there is another page
+            rows = db.session.execute(statement, {"match": match, "limit": limit + 1, "offset": offset}).mappings().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while searching songs for {query!r}: {e}")
+            raise
+
+        songs = [dict(row) for row in rows[:limit]]
+        logger.info(f"Found {len(songs)} songs matching {query!r}")
+        return {
+            "songs": songs,
+            "limit": limit,
+            "offset": offset,
+            "has_more": len(rows) > limit
+        }
+
+
+def _create_search_index(connection) -> None:
+    """Runs the search index DDL on a SQLite connection.
+
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Songs.__table__, "after_create")
+def _create_search_index_after_create(target, connection, **kw):
+    _create_search_index(connection)
+
+
+@event.listens_for(Songs.__table__, "before_drop")
+def _drop_search_index_before_drop(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def _create_catalog_version(connection) -> None:
+    """Runs the catalog version DDL on a SQLite connection.
+
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in CATALOG_VERSION_DDL:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Songs.__table__, "after_create")
+def _create_catalog_version_after_create(target, connection, **kw):
+    _create_catalog_version(connection)
+    # A recreated table is a new catalog, even if it is empty again
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"UPDATE {CATALOG_VERSION_TABLE} SET version = version + 1 WHERE id = {CATALOG_VERSION_ROW}"
+        )
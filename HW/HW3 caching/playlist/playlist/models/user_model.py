@@ -1,11 +1,15 @@
+from dataclasses import dataclass
 import hashlib
 import logging
 import os
+import threading
+import time
+from typing import Optional
 
 from flask_login import UserMixin
 from sqlalchemy.exc import IntegrityError
 
-from playlist.db import db
+from playlist.db import db, read_only, readonly_session
 from playlist.utils.logger import configure_logger
 
 
@@ -13,6 +17,25 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+@dataclass(frozen=True)
+class UserRecord(UserMixin):
+    """Lightweight, session-independent copy of a user for Flask-Login.
+
+    Holds no password material and is safe to share between requests and threads.
+    """
+    id: int
+    username: str
+
+    def get_id(self) -> str:
+        """
+        Get the ID of the user.
+
+        Returns:
+            str: The username, which Flask-Login stores in the session.
+        """
+        return self.username
+
+
 class Users(db.Model, UserMixin):
     __tablename__ = 'users'
 
@@ -21,6 +44,13 @@ class Users(db.Model, UserMixin):
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
     password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
 
+    # Cache of users loaded by the Flask-Login user loader, keyed by username
+    _user_cache = {}  # username -> UserRecord
+    _user_ttl = {}  # username -> expiry timestamp
+    _user_cache_lock = threading.Lock()
+    user_cache_ttl_seconds = int(os.getenv("USER_CACHE_TTL", 60))  # Default TTL is 60 seconds
+    user_cache_max_size = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+
     @staticmethod
     def _generate_hashed_password(password: str) -> tuple[str, str]:
         """
@@ -64,6 +94,7 @@ class Users(db.Model, UserMixin):
             raise
 
     @classmethod
+    @read_only
     def check_password(cls, username: str, password: str) -> bool:
         """
         Check if a given password matches the stored password for a user.
@@ -102,6 +133,7 @@ class Users(db.Model, UserMixin):
             raise ValueError(f"User {username} not found")
         db.session.delete(user)
         db.session.commit()
+        cls.invalidate_cached_user(username)
         logger.info("User %s deleted successfully", username)
 
     def get_id(self) -> str:
@@ -114,6 +146,7 @@ class Users(db.Model, UserMixin):
         return self.username
 
     @classmethod
+    @read_only
     def get_id_by_username(cls, username: str) -> int:
         """
         Retrieve the ID of a user by username.
@@ -154,4 +187,86 @@ class Users(db.Model, UserMixin):
         user.salt = salt
         user.password = hashed_password
         db.session.commit()
-        logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
+        cls.invalidate_cached_user(username)
+        logger.info("Password updated successfully for user: %s", username)
+
+    @classmethod
+    def get_cached_user(cls, username: str) -> Optional[UserRecord]:
+        """
+        Retrieve a lightweight user record by username, using the TTL cache if possible.
+
+        Used by the Flask-Login user loader so that authenticated requests do not
+        query the users table every time. Unknown usernames are not cached.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            UserRecord: The user record, or None if the user does not exist.
+        """
+        now = time.time()
+
+        with cls._user_cache_lock:
+            if username in cls._user_cache and cls._user_ttl.get(username, 0) > now:
+                logger.debug("User %s retrieved from cache", username)
+                return cls._user_cache[username]
+
+        with readonly_session():
+            row = db.session.query(cls.id, cls.username).filter_by(username=username).first()
+
+        if row is None:
+            logger.info("User %s not found", username)
+            return None
+
+        record = UserRecord(id=row.id, username=row.username)
+
+        with cls._user_cache_lock:
+            if len(cls._user_cache) >= cls.user_cache_max_size:
+                cls._evict_cached_users(now)
+            cls._user_cache[username] = record
+            cls._user_ttl[username] = now + cls.user_cache_ttl_seconds
+
+        logger.debug("User %s loaded from DB and cached", username)
+        return record
+
+    @classmethod
+    def _evict_cached_users(cls, now: float) -> None:
+        """
+        Drop expired cache entries, then the oldest ones if the cache is still full.
+
+        Must be called with the cache lock held.
+
+        Args:
+            now (float): The current time.
+        """
+        for username in [name for name, expires in cls._user_ttl.items() if expires <= now]:
+            cls._user_cache.pop(username, None)
+            cls._user_ttl.pop(username, None)
+
+        while len(cls._user_cache) >= cls.user_cache_max_size:
+            username = next(iter(cls._user_cache))
+            cls._user_cache.pop(username, None)
+            cls._user_ttl.pop(username, None)
+
+    @classmethod
+    def invalidate_cached_user(cls, username: str) -> None:
+        """
+        Remove a user from the user cache.
+
+        Args:
+            username (str): The username of the user.
+        """
+        with cls._user_cache_lock:
+            cls._user_cache.pop(username, None)
+            cls._user_ttl.pop(username, None)
+        logger.debug("Invalidated cached user %s", username)
+
+    @classmethod
+    def clear_user_cache(cls) -> None:
+        """
+        Remove every user from the user cache.
+        """
+        with cls._user_cache_lock:
+            cls._user_cache.clear()
+            cls._user_ttl.clear()
+        logger.info("Cleared the user cache")
@@ -0,0 +1,72 @@
+import random
+from typing import List, Sequence
+
+
+class AliasTable:
+    """
+    Walker's alias table for sampling indexes in proportion to their weights.
+
+    Built in O(n) with Vose's method; each draw is O(1): pick a column uniformly,
+    then keep it or take its alias with one biased coin flip.
+
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        """Builds the table from the given weights.
+
+        Args:
+            weights (Sequence[float]): Non-negative weights, at least one of them positive.
+
+        Raises:
+            ValueError: If there are no weights, any weight is negative, or all are zero.
+
+        """
+        n = len(weights)
+        if n == 0:
+            raise ValueError("Cannot build an alias table without weights")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights must not be negative")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+
+        # Scale so that the average column holds exactly 1
+        scaled = [weight * n / total for weight in weights]
+        self._probability: List[float] = [1.0] * n
+        self._alias: List[int] = list(range(n))
+
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._probability[less] = scaled[less]
+            self._alias[less] = more
+            # The large column donates what the small one lacks
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1 up to rounding error
+        for i in small + large:
+            self._probability[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self._probability)
+
+    def sample(self, rng: random.Random) -> int:
+        """Draws an index in O(1).
+
+        Args:
+            rng (random.Random): The random generator to draw from.
+
+        Returns:
+            int: An index, chosen with probability proportional to its weight.
+
+        """
+        column = rng.randrange(len(self._probability))
+        if rng.random() < self._probability[column]:
+            return column
+        return self._alias[column]
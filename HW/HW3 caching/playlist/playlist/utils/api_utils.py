@@ -1,6 +1,5 @@
 import logging
 import os
-import requests
 
 from playlist.utils.logger import configure_logger
 
@@ -30,6 +29,9 @@ def get_random(max: int) -> int:
     if max < 1:
         raise ValueError("max must be at least 1")
 
+    # Imported on first use: requests is slow to import and most requests never need it
+    import requests
+
     # Construct the full URL dynamically
     url = f"{RANDOM_ORG_BASE_URL}&max={max}"
 
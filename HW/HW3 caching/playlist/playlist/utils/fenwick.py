@@ -0,0 +1,105 @@
+from typing import Iterable, List
+
+
+class FenwickTree:
+    """
+    A Fenwick (binary indexed) tree of non-negative integers.
+
+    Supports O(log n) point updates, appends, prefix sums and prefix-sum searches,
+    and O(n) construction. Positions are 0-indexed.
+
+    """
+
+    def __init__(self, values: Iterable[int] = ()):
+        """Builds the tree from the given values in O(n).
+
+        Args:
+            values (Iterable[int]): The initial values.
+
+        """
+        self._values: List[int] = list(values)
+        self._tree: List[int] = [0] + self._values
+        for i in range(1, len(self._tree)):
+            parent = i + (i & -i)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, index: int) -> int:
+        """Returns the value at a position."""
+        return self._values[index]
+
+    def set(self, index: int, value: int) -> None:
+        """Sets the value at a position in O(log n).
+
+        Args:
+            index (int): The position to update.
+            value (int): The new value.
+
+        """
+        delta = value - self._values[index]
+        self._values[index] = value
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def append(self, value: int) -> None:
+        """Adds a value at the end in O(log n).
+
+        Args:
+            value (int): The value to append.
+
+        """
+        i = len(self._tree)
+        # The new node covers (i - lowbit(i), i], i.e. the value plus the tail of the prefix before it
+        lowbit = i & -i
+        self._tree.append(value + self.prefix_sum(i - 1) - self.prefix_sum(i - lowbit))
+        self._values.append(value)
+
+    def prefix_sum(self, count: int) -> int:
+        """Returns the sum of the first count values in O(log n).
+
+        Args:
+            count (int): The number of leading values to sum.
+
+        Returns:
+            int: The sum.
+
+        """
+        total = 0
+        i = count
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def total(self) -> int:
+        """Returns the sum of all values."""
+        return self.prefix_sum(len(self._values))
+
+    def find(self, target: int) -> int:
+        """Finds the position whose span contains target in O(log n).
+
+        That is the smallest index such that the sum of values up to and including
+        it is greater than target.
+
+        Args:
+            target (int): A value between 0 and total() - 1.
+
+        Returns:
+            int: The position, or len(self) if target is not less than total().
+
+        """
+        position = 0
+        remaining = target
+        step = 1 << len(self._values).bit_length()
+        while step:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] <= remaining:
+                position = next_position
+                remaining -= self._tree[next_position]
+            step >>= 1
+        return position
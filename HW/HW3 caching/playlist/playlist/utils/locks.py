@@ -0,0 +1,265 @@
+from contextlib import contextmanager
+from functools import wraps
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+
+class ReadWriteLock:
+    """
+    A writer-preferring read/write lock.
+
+    Any number of threads may hold the read lock at once; the write lock is exclusive.
+    New readers wait while a writer is waiting so that a steady stream of reads cannot
+    starve writes. Both locks are reentrant for the thread that holds them, and the
+    writer may also take the read lock. A reader may not upgrade to the write lock.
+    write_count counts the released write locks, so it changes after every write.
+
+    """
+
+    def __init__(self):
+        """Initializes the lock in the unlocked state."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._local = threading.local()
+        self.write_count = 0
+
+    def _read_stack(self) -> list:
+        """Returns this thread's stack of held read locks (True if it counted as a reader)."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def acquire_read(self) -> None:
+        """Takes the read lock, waiting while a writer holds or is waiting for the lock."""
+        stack = self._read_stack()
+
+        # Nested reads, and reads by the writer, are already covered by the held lock
+        if stack or self._writer == threading.get_ident():
+            stack.append(False)
+            return
+
+        with self._condition:
+            while self._writer is not None or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        stack.append(True)
+
+    def release_read(self) -> None:
+        """Releases the read lock.
+
+        Raises:
+            RuntimeError: If this thread does not hold the read lock.
+
+        """
+        stack = self._read_stack()
+        if not stack:
+            raise RuntimeError("Cannot release a read lock that is not held")
+
+        if stack.pop():
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Takes the write lock, waiting until there are no readers or other writers.
+
+        Raises:
+            RuntimeError: If this thread holds the read lock but not the write lock.
+
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+
+        if self._read_stack():
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+        with self._condition:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Releases the write lock.
+
+        Raises:
+            RuntimeError: If this thread does not hold the write lock.
+
+        """
+        if self._writer != threading.get_ident():
+            raise RuntimeError("Cannot release a write lock that is not held")
+
+        self._write_depth -= 1
+        if self._write_depth == 0:
+            with self._condition:
+                self.write_count += 1
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """Context manager that holds the read lock."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """Context manager that holds the write lock."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def reads_shared_state(method):
+    """
+    Decorator that runs a method under the read lock stored in the instance's _lock.
+
+    Args:
+        method: The method to wrap.
+
+    Returns:
+        The wrapped method.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read_locked():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def writes_shared_state(method):
+    """
+    Decorator that runs a method under the write lock stored in the instance's _lock.
+
+    Args:
+        method: The method to wrap.
+
+    Returns:
+        The wrapped method.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write_locked():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _Flight:
+    """One in-progress load and the outcome its waiters receive."""
+
+    __slots__ = ("owner", "done", "result", "error", "waiters")
+
+    def __init__(self, owner: int):
+        self.owner = owner
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent loads of the same key into a single call.
+
+    The first caller for a key runs the load; callers that arrive while it is running wait
+    for its outcome instead of running their own, then get the same result or the same
+    exception. Each key has its own event, so loads of different keys never wait on each
+    other, and the shared lock is only held to look up or register a key. Once a load
+    finishes the key is forgotten, so the next caller starts a new load.
+
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """Initializes the group with no loads in flight.
+
+        Args:
+            timeout (float, optional): The default number of seconds a waiter waits for the
+                                       load before giving up. None waits indefinitely.
+
+        """
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._flights: dict = {}
+        self._loads = 0
+        self._shared = 0
+        self._timeouts = 0
+
+    def do(self, key: Hashable, load: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Runs load for key, or waits for the call already running for it.
+
+        Args:
+            key (Hashable): The key being loaded.
+            load (Callable[[], Any]): The function that loads the value.
+            timeout (float, optional): Overrides the default waiter timeout.
+
+        Returns:
+            Any: The value returned by load, in this call or the one waited for.
+
+        Raises:
+            TimeoutError: If this caller waited longer than the timeout. The load keeps running.
+            RuntimeError: If load tries to load the same key again from within itself.
+            Exception: Whatever load raised.
+
+        """
+        me = threading.get_ident()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight(me)
+                self._loads += 1
+                leader = True
+            elif flight.owner == me:
+                raise RuntimeError(f"Recursive load of key {key!r}")
+            else:
+                flight.waiters += 1
+                self._shared += 1
+                leader = False
+
+        if leader:
+            try:
+                flight.result = load()
+                return flight.result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+
+        timeout = self.timeout if timeout is None else timeout
+        if not flight.done.wait(timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise TimeoutError(f"Timed out after {timeout}s waiting for the load of key {key!r}")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def get_stats(self) -> dict:
+        """Returns the number of loads run, calls that shared a load, waiter timeouts, and loads in flight."""
+        with self._lock:
+            return {
+                "loads": self._loads,
+                "shared": self._shared,
+                "timeouts": self._timeouts,
+                "in_flight": len(self._flights),
+            }
@@ -4,23 +4,22 @@ import sys
 from flask import current_app, has_request_context
 
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
-
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+# One console handler shared by every module logger, instead of a new handler per module
+_console_handler = logging.StreamHandler(sys.stderr)
+_console_handler.setLevel(logging.DEBUG)
+# Create a formatter with a timestamp
+_console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+def configure_logger(logger):
+    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+    # Log to stderr through the shared console handler
+    if _console_handler not in logger.handlers:
+        logger.addHandler(_console_handler)
 
     if has_request_context():
         app_logger = current_app.logger
         for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
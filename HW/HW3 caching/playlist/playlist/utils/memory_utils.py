@@ -0,0 +1,207 @@
+from collections import deque
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Number of stack frames recorded per allocation and number of snapshots kept in memory
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", 1))
+MAX_SNAPSHOTS = int(os.getenv("TRACEMALLOC_MAX_SNAPSHOTS", 5))
+
+VALID_KEY_TYPES = {"lineno", "filename", "traceback"}
+
+_snapshots: deque = deque(maxlen=MAX_SNAPSHOTS)
+_snapshot_lock = threading.Lock()
+_next_snapshot_id = 1
+
+
+def get_deep_size(obj, seen: Optional[set] = None) -> int:
+    """
+    Approximates the number of bytes held by an object and everything it references.
+
+    Containers are walked recursively and shared objects are only counted once.
+    For SQLAlchemy model instances only the mapped attribute values are counted;
+    the instance state (and through it the session) is skipped.
+
+    Args:
+        obj: The object to size.
+        seen (set, optional): Ids of objects that have already been counted.
+
+    Returns:
+        int: The approximate size of the object in bytes.
+    """
+    if seen is None:
+        seen = set()
+
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+
+    if isinstance(obj, dict):
+        size += sum(get_deep_size(key, seen) + get_deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(get_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += sum(
+            get_deep_size(value, seen)
+            for key, value in vars(obj).items()
+            if not key.startswith("_sa_")
+        )
+
+    return size
+
+
+def is_tracing() -> bool:
+    """
+    Returns whether tracemalloc is currently tracing allocations.
+
+    Returns:
+        bool: True if tracemalloc is running.
+    """
+    return tracemalloc.is_tracing()
+
+
+def get_traced_memory() -> dict:
+    """
+    Returns the current and peak traced memory.
+
+    Returns:
+        dict: The current and peak traced memory in bytes (both 0 if not tracing).
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    return {"current_bytes": current, "peak_bytes": peak}
+
+
+def take_snapshot() -> dict:
+    """
+    Takes a tracemalloc snapshot, starting tracemalloc first if it is not running.
+
+    Only the most recent MAX_SNAPSHOTS snapshots are kept.
+
+    Returns:
+        dict: Metadata about the snapshot that was taken.
+    """
+    global _next_snapshot_id
+
+    if not tracemalloc.is_tracing():
+        logger.info(f"Starting tracemalloc with {TRACEMALLOC_FRAMES} frame(s) per allocation")
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+    taken_at = time.time()
+    with _snapshot_lock:
+        snapshot_id = _next_snapshot_id
+        _next_snapshot_id += 1
+        _snapshots.append((snapshot_id, taken_at, snapshot))
+
+    logger.info(f"Took tracemalloc snapshot {snapshot_id}")
+    return {
+        "snapshot_id": snapshot_id,
+        "taken_at": taken_at,
+        **get_traced_memory()
+    }
+
+
+def list_snapshots() -> list[dict]:
+    """
+    Lists the snapshots currently held in memory.
+
+    Returns:
+        list[dict]: The id and timestamp of each stored snapshot, oldest first.
+    """
+    with _snapshot_lock:
+        return [{"snapshot_id": snapshot_id, "taken_at": taken_at} for snapshot_id, taken_at, _ in _snapshots]
+
+
+def compare_snapshots(
+    first_id: Optional[int] = None,
+    second_id: Optional[int] = None,
+    limit: int = 10,
+    key_type: str = "lineno"
+) -> list[dict]:
+    """
+    Diffs two snapshots and returns the allocation sites that grew the most.
+
+    Each id defaults on its own: the newer snapshot to the most recent one, and the
+    older snapshot to the one taken just before the newer one.
+
+    Args:
+        first_id (int, optional): The id of the older snapshot.
+        second_id (int, optional): The id of the newer snapshot.
+        limit (int): The maximum number of allocation sites to return.
+        key_type (str): How to group allocations: 'lineno', 'filename' or 'traceback'.
+
+    Returns:
+        list[dict]: The top allocation sites, sorted by absolute size difference.
+
+    Raises:
+        ValueError: If the arguments are invalid or the snapshots are not available.
+    """
+    if key_type not in VALID_KEY_TYPES:
+        raise ValueError(f"Invalid key_type: {key_type}. Must be one of: {', '.join(sorted(VALID_KEY_TYPES))}")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    with _snapshot_lock:
+        by_id = {snapshot_id: snapshot for snapshot_id, _, snapshot in _snapshots}
+        ordered_ids = [snapshot_id for snapshot_id, _, _ in _snapshots]
+
+    if first_id is None and second_id is None and len(ordered_ids) < 2:
+        raise ValueError("At least two snapshots are required to compute a diff")
+    if second_id is None and ordered_ids:
+        second_id = ordered_ids[-1]
+    if first_id is None and second_id in by_id:
+        position = ordered_ids.index(second_id)
+        if position == 0:
+            raise ValueError(f"No snapshot was taken before snapshot {second_id}")
+        first_id = ordered_ids[position - 1]
+
+    if first_id not in by_id or second_id not in by_id:
+        raise ValueError(f"Snapshots {first_id} and {second_id} are not both available")
+
+    logger.info(f"Comparing tracemalloc snapshots {first_id} and {second_id} by {key_type}")
+    stats = by_id[second_id].compare_to(by_id[first_id], key_type)
+
+    return [
+        {
+            "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_bytes": stat.size,
+            "size_diff_bytes": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def clear_snapshots() -> None:
+    """
+    Discards all stored snapshots and stops tracemalloc.
+
+    """
+    with _snapshot_lock:
+        _snapshots.clear()
+
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    logger.info("Cleared tracemalloc snapshots and stopped tracing")
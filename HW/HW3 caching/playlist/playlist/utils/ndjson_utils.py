@@ -0,0 +1,85 @@
+import gzip
+import io
+import json
+import logging
+from typing import BinaryIO, Iterable, Iterator
+import zlib
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Compressed bytes are buffered up to this size before a chunk is yielded
+GZIP_CHUNK_SIZE = 64 * 1024
+
+
+def iter_gzip_ndjson(records: Iterable[dict], compresslevel: int = 6,
+                     chunk_size: int = GZIP_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encodes records as gzip-compressed NDJSON, one chunk at a time.
+
+    Only the compressor state and one output chunk are held in memory, so the
+    records can come straight from a database cursor.
+
+    Args:
+        records (Iterable[dict]): The records to encode, one per line.
+        compresslevel (int): The gzip compression level (1-9).
+        chunk_size (int): The approximate size of each yielded chunk in bytes.
+
+    Yields:
+        bytes: Consecutive pieces of a single gzip stream.
+    """
+    # wbits=31 selects the gzip container rather than raw zlib
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+    buffer = bytearray()
+    count = 0
+
+    for record in records:
+        buffer += compressor.compress(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        count += 1
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += compressor.flush()
+    yield bytes(buffer)
+    logger.info(f"Encoded {count} records as gzip NDJSON")
+
+
+def iter_ndjson(stream: BinaryIO, compressed: bool = True) -> Iterator[dict]:
+    """
+    Decodes an NDJSON stream one line at a time.
+
+    Blank lines are skipped.
+
+    Args:
+        stream (BinaryIO): The (optionally gzip-compressed) input stream.
+        compressed (bool): If True, the stream is gzip-compressed.
+
+    Yields:
+        dict: The decoded record on each line.
+
+    Raises:
+        ValueError: If the stream is not valid gzip or a line is not a JSON object.
+    """
+    if compressed:
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    lines = io.TextIOWrapper(stream, encoding="utf-8")
+
+    line_number = 0
+    try:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number} is not valid JSON: {e}") from e
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {line_number} is not a JSON object")
+            yield record
+    except (OSError, EOFError, zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid input after line {line_number}: {e}") from e
@@ -0,0 +1,137 @@
+from typing import Hashable, Iterator, List, Optional, Tuple
+
+
+class _CountNode:
+    """A group of keys that share the same count, in a list ordered by count."""
+
+    __slots__ = ("count", "keys", "prev", "next")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.keys: dict = {}  # Used as an insertion-ordered set
+        self.prev: Optional["_CountNode"] = None
+        self.next: Optional["_CountNode"] = None
+
+
+class CountRanking:
+    """
+    Counters that can be listed from highest to lowest count without sorting.
+
+    Keys are grouped by count in a doubly linked list of count nodes kept in ascending
+    order (the structure used by O(1) LFU caches). Incrementing or decrementing a key by
+    one moves it to the neighbouring node in O(1), and the top K keys are read from the
+    tail of the list in O(K). Keys whose count reaches zero are dropped.
+
+    """
+
+    def __init__(self):
+        """Initializes an empty ranking."""
+        self._head = _CountNode(0)  # Sentinel below the lowest count
+        self._tail = self._head
+        self._nodes: dict = {}  # key -> _CountNode
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def count(self, key: Hashable) -> int:
+        """Returns a key's count (0 if it is not ranked)."""
+        node = self._nodes.get(key)
+        return node.count if node is not None else 0
+
+    def increment(self, key: Hashable) -> None:
+        """Adds one to a key's count in O(1).
+
+        Args:
+            key (Hashable): The key to increment.
+
+        """
+        node = self._nodes.get(key, self._head)
+        target = node.next
+        if target is None or target.count != node.count + 1:
+            target = self._insert_after(node, node.count + 1)
+
+        if node is not self._head:
+            self._discard(node, key)
+        target.keys[key] = None
+        self._nodes[key] = target
+
+    def decrement(self, key: Hashable) -> None:
+        """Subtracts one from a key's count in O(1), dropping it at zero.
+
+        Args:
+            key (Hashable): The key to decrement.
+
+        Raises:
+            KeyError: If the key is not ranked.
+
+        """
+        node = self._nodes[key]
+        if node.count == 1:
+            del self._nodes[key]
+        else:
+            target = node.prev
+            if target.count != node.count - 1:
+                target = self._insert_after(target, node.count - 1)
+            target.keys[key] = None
+            self._nodes[key] = target
+        self._discard(node, key)
+
+    def iter_top(self) -> Iterator[Tuple[Hashable, int]]:
+        """Yields (key, count) pairs from the highest count down.
+
+        Keys with equal counts are yielded in the order they reached that count.
+        The ranking must not be changed while the iterator is in use.
+
+        Yields:
+            tuple: The next key and its count.
+
+        """
+        node = self._tail
+        while node is not self._head:
+            for key in node.keys:
+                yield key, node.count
+            node = node.prev
+
+    def top(self, k: int) -> List[Tuple[Hashable, int]]:
+        """Returns the k keys with the highest counts in O(k).
+
+        Args:
+            k (int): The number of keys to return.
+
+        Returns:
+            List[tuple]: Up to k (key, count) pairs, highest count first.
+
+        """
+        result = []
+        if k <= 0:
+            return result
+        for item in self.iter_top():
+            result.append(item)
+            if len(result) == k:
+                break
+        return result
+
+    def clear(self) -> None:
+        """Removes every key."""
+        self._head.next = None
+        self._tail = self._head
+        self._nodes.clear()
+
+    def _insert_after(self, node: _CountNode, count: int) -> _CountNode:
+        new = _CountNode(count)
+        new.prev, new.next = node, node.next
+        if node.next is not None:
+            node.next.prev = new
+        else:
+            self._tail = new
+        node.next = new
+        return new
+
+    def _discard(self, node: _CountNode, key: Hashable) -> None:
+        del node.keys[key]
+        if not node.keys:
+            node.prev.next = node.next
+            if node.next is not None:
+                node.next.prev = node.prev
+            else:
+                self._tail = node.prev
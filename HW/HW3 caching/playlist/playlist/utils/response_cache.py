@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from functools import wraps
+import logging
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+from flask import Response, make_response, request
+from flask_login import current_user
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class ResponseCache:
+    """
+    An LRU cache of encoded GET responses, bounded by the total size of their bodies.
+
+    Views decorated with cached() are keyed by endpoint, path, query arguments, the user
+    (for per-user views) and a data version. A hit rebuilds the response from the stored
+    bytes, so neither the view's model calls nor its JSON encoding run again. Changing the
+    data version makes the old entries unreachable; they age out of the LRU.
+
+    """
+
+    def __init__(self, max_bytes: int, max_entry_bytes: Optional[int] = None):
+        """Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The most body bytes held across all entries.
+            max_entry_bytes (int, optional): Larger responses are not cached. Defaults to an eighth of max_bytes.
+
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self._entries: OrderedDict = OrderedDict()  # key -> (body, status, mimetype, expires)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        """Returns a cached (body, status, mimetype), or None if it is missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            tuple: The cached response parts, or None.
+
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[3] is not None and entry[3] <= now):
+                if entry is not None:
+                    self._remove(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[:3]
+
+    def put(self, key: Hashable, body: bytes, status: int, mimetype: str, ttl: Optional[float] = None) -> bool:
+        """Stores a response, evicting the least recently used entries to make room.
+
+        Args:
+            key (Hashable): The cache key.
+            body (bytes): The encoded response body.
+            status (int): The status code.
+            mimetype (str): The content type.
+            ttl (float, optional): The number of seconds the entry stays valid. None keeps it until evicted.
+
+        Returns:
+            bool: True if the response was stored, False if it is too large.
+
+        """
+        if len(body) > self.max_entry_bytes:
+            return False
+
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, status, mimetype, expires)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+        return True
+
+    def _remove(self, key: Hashable) -> None:
+        """Removes an entry. Must be called with the lock held."""
+        body = self._entries.pop(key)[0]
+        self._bytes -= len(body)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Returns the number of entries, their total size, and the hit, miss and eviction counts."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def cached(self, version: Optional[Callable[[], Hashable]] = None, ttl: Optional[float] = None,
+               per_user: bool = False):
+        """
+        Decorator that serves a GET view from the cache.
+
+        Only 200 responses are cached. The version is read before the view runs, so a write
+        that lands while the view computes can only store newer data under an older key,
+        never older data under a newer one. If the version cannot be read, the view runs
+        uncached.
+
+        Args:
+            version (Callable[[], Hashable], optional): Returns the version of the data the view reads.
+            ttl (float, optional): The number of seconds an entry stays valid.
+            per_user (bool): If True, each logged-in user gets their own entries.
+
+        Returns:
+            The decorator.
+
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != "GET":
+                    return view(*args, **kwargs)
+
+                try:
+                    data_version = version() if version is not None else None
+                except Exception as e:
+                    logger.warning(f"Could not read the data version for {request.endpoint}, not caching: {e}")
+                    return view(*args, **kwargs)
+
+                key = (
+                    request.endpoint,
+                    request.path,
+                    tuple(sorted(request.args.items(multi=True))),
+                    current_user.get_id() if per_user and current_user.is_authenticated else None,
+                    data_version,
+                )
+                cached_response = self.get(key)
+                if cached_response is not None:
+                    body, status, mimetype = cached_response
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.put(key, response.get_data(), response.status_code, response.mimetype, ttl)
+                response.headers["X-Cache"] = "MISS"
+                return response
+
+            return wrapper
+
+        return decorator
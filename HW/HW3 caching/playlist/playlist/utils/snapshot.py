@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from flask import Flask
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def write_snapshot(path: str, payload: dict) -> int:
+    """
+    Writes a snapshot to disk as compact JSON, atomically.
+
+    The payload is written to a temporary file in the same directory, synced, and renamed
+    over the old snapshot, so a crash mid-write never leaves a truncated snapshot behind.
+
+    Args:
+        path (str): The snapshot file.
+        payload (dict): The JSON-serializable snapshot.
+
+    Returns:
+        int: The size of the snapshot in bytes.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    fd, temp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+
+def read_snapshot(path: str) -> Optional[dict]:
+    """
+    Reads a snapshot written by write_snapshot.
+
+    Args:
+        path (str): The snapshot file.
+
+    Returns:
+        dict: The snapshot, or None if there is no snapshot or it cannot be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            payload = json.loads(f.read())
+    except FileNotFoundError:
+        logger.info(f"No cache snapshot at {path}")
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache snapshot at {path}: {e}")
+        return None
+
+    if not isinstance(payload, dict):
+        logger.warning(f"Ignoring malformed cache snapshot at {path}")
+        return None
+    return payload
+
+
+class CacheSnapshotter:
+    """
+    Background thread that snapshots a cache at a fixed interval and once more on stop.
+
+    """
+
+    def __init__(self, app: Flask, save: Callable[[], object], interval_seconds: float):
+        """Initializes the snapshotter.
+
+        Args:
+            app (Flask): The app whose context the snapshots are taken in.
+            save (Callable[[], object]): Writes one snapshot.
+            interval_seconds (float): The number of seconds between snapshots (0 only snapshots on stop).
+
+        """
+        self.app = app
+        self.save = save
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def snapshot(self) -> None:
+        """Writes a snapshot, logging rather than raising on failure.
+
+        """
+        try:
+            with self.app.app_context():
+                self.save()
+        except Exception as e:
+            logger.error(f"Cache snapshot failed: {e}")
+
+    def start(self) -> None:
+        """Starts the background thread if it is not already running and snapshots are periodic.
+
+        """
+        if self.interval_seconds <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-snapshotter", daemon=True)
+        self._thread.start()
+        logger.info(f"Started cache snapshotter (every {self.interval_seconds}s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the background thread and writes a final snapshot.
+
+        Args:
+            timeout (float): The number of seconds to wait for the thread to exit.
+
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.snapshot()
+        logger.info("Stopped cache snapshotter")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.snapshot()
@@ -2,6 +2,13 @@ from contextlib import contextmanager
 import logging
 import os
 import sqlite3
+import threading
+from typing import Iterable, Optional
+import zlib
+
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from playlist.utils.logger import configure_logger
 
@@ -97,3 +104,278 @@ def get_db_connection():
         if conn:
             conn.close()
             logger.info("Database connection closed.")
+
+
+# Pragmas that may be applied to every new SQLite connection, with the values they accept.
+# Values are interpolated into the PRAGMA statement, so anything outside this list is rejected.
+ALLOWED_PRAGMAS = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY", "0", "1", "2"},
+    "cache_size": int,
+    "mmap_size": int,
+    "busy_timeout": int,
+    "wal_autocheckpoint": int,
+    "foreign_keys": {"ON", "OFF", "0", "1"},
+    "query_only": {"ON", "OFF", "0", "1"},
+}
+
+
+def validate_pragmas(pragmas: dict) -> dict:
+    """
+    Validates and normalizes a mapping of SQLite pragmas.
+
+    Args:
+        pragmas (dict): Pragma names mapped to the values to set.
+
+    Returns:
+        dict: The normalized pragmas (enum values upper-cased, integers as int).
+
+    Raises:
+        ValueError: If a pragma is not supported or its value is invalid.
+
+    """
+    normalized = {}
+    for name, value in pragmas.items():
+        allowed = ALLOWED_PRAGMAS.get(name)
+        if allowed is None:
+            raise ValueError(f"Unsupported SQLite pragma: {name}")
+
+        if allowed is int:
+            try:
+                normalized[name] = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Pragma {name} must be an integer, got {value!r}")
+        else:
+            value = str(value).upper()
+            if value not in allowed:
+                raise ValueError(f"Invalid value for pragma {name}: {value}")
+            normalized[name] = value
+
+    return normalized
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict) -> None:
+    """
+    Applies pragmas to a raw SQLite DB-API connection.
+
+    journal_mode is applied first, since it has to be set before the connection
+    starts a transaction for synchronous=NORMAL to be safe under WAL.
+
+    Args:
+        dbapi_connection: The sqlite3 connection to configure.
+        pragmas (dict): Validated pragma names mapped to the values to set.
+
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in sorted(pragmas, key=lambda name: name != "journal_mode"):
+            cursor.execute(f"PRAGMA {name}={pragmas[name]}")
+    finally:
+        cursor.close()
+
+
+def register_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """
+    Registers a connect hook on the engine that applies the pragmas to each new connection.
+
+    Does nothing if the engine is not backed by SQLite or no pragmas are configured.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine to configure.
+        pragmas (dict): Pragma names mapped to the values to set.
+
+    Raises:
+        ValueError: If a pragma is not supported or its value is invalid.
+
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    pragmas = validate_pragmas(pragmas)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    logger.info(f"Registered SQLite pragmas on {engine.url}: {pragmas}")
+
+
+def get_readonly_sqlite_uri(uri) -> Optional[str]:
+    """
+    Derives a read-only (mode=ro) URI for a file-backed SQLite database URI.
+
+    Args:
+        uri (str | URL): The primary database URI.
+
+    Returns:
+        str: The read-only URI, or None if the URI is not a file-backed SQLite database.
+
+    """
+    url = make_url(uri)
+    if not url.drivername.startswith("sqlite") or url.database in (None, "", ":memory:"):
+        return None
+    if url.database.startswith("file:"):
+        return None
+
+    return f"{url.drivername}:///file:{url.database}?mode=ro&uri=true"
+
+
+def get_readonly_pragmas(pragmas: dict) -> dict:
+    """
+    Adapts the primary pragmas for a read-only connection.
+
+    journal_mode is dropped (a read-only connection cannot change it) and
+    query_only is set so that writes fail loudly instead of being silently routed.
+
+    Args:
+        pragmas (dict): The pragmas applied to the primary engine.
+
+    Returns:
+        dict: The pragmas to apply to the read-only engine.
+
+    """
+    readonly_pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+    readonly_pragmas["query_only"] = "ON"
+    return readonly_pragmas
+
+
+def checkpoint_wal(engine: Engine, mode: str = "PASSIVE") -> tuple[int, int, int]:
+    """
+    Runs a WAL checkpoint on the engine's database.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine to checkpoint.
+        mode (str): The checkpoint mode: PASSIVE, FULL, RESTART or TRUNCATE.
+
+    Returns:
+        tuple: (busy, log frames, checkpointed frames) as reported by SQLite.
+
+    Raises:
+        ValueError: If the mode is invalid.
+
+    """
+    mode = mode.upper()
+    if mode not in {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}:
+        raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+    with engine.connect() as conn:
+        busy, log_frames, checkpointed = conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+
+    logger.debug(f"WAL checkpoint ({mode}): busy={busy}, log={log_frames}, checkpointed={checkpointed}")
+    return busy, log_frames, checkpointed
+
+
+def compute_schema_version(metadata: MetaData, dialect, extra_ddl: Iterable[str] = ()) -> int:
+    """
+    Derives a schema version from the DDL of every table, index and extra statement.
+
+    Any change to a model's columns or indexes, or to the extra DDL (triggers, virtual
+    tables), produces a different version, so nothing has to be bumped by hand.
+
+    Args:
+        metadata (MetaData): The metadata of the models.
+        dialect: The SQLAlchemy dialect to compile the DDL for.
+        extra_ddl (Iterable[str]): DDL statements that are not part of the metadata.
+
+    Returns:
+        int: A positive 31-bit version, which fits SQLite's user_version.
+    """
+    statements = []
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+    statements.extend(extra_ddl)
+
+    return zlib.crc32("\n".join(statements).encode()) & 0x7FFFFFFF or 1
+
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Reads the schema version stored in a SQLite database's user_version.
+
+    Args:
+        engine (Engine): The engine to read from.
+
+    Returns:
+        int: The stored version (0 if none was stored or the database is not SQLite).
+    """
+    if engine.dialect.name != "sqlite":
+        return 0
+    with engine.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def set_schema_version(engine: Engine, version: int) -> None:
+    """
+    Stores a schema version in a SQLite database's user_version.
+
+    Args:
+        engine (Engine): The engine to write to.
+        version (int): The version to store.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+    logger.info(f"Stored schema version {version}")
+
+
+class WalCheckpointer:
+    """
+    Background thread that checkpoints the SQLite WAL at a fixed interval.
+
+    SQLite only auto-checkpoints on commit, and only when no reader holds an old
+    snapshot, so a busy service can let the WAL grow without bound. Running a
+    PASSIVE checkpoint periodically keeps it in check without blocking writers.
+
+    """
+
+    def __init__(self, engine: Engine, interval_seconds: float, mode: str = "PASSIVE"):
+        """Initializes the checkpointer.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to checkpoint.
+            interval_seconds (float): The number of seconds between checkpoints.
+            mode (str): The checkpoint mode to use.
+
+        """
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.mode = mode
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Starts the background thread if it is not already running.
+
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="wal-checkpointer", daemon=True)
+        self._thread.start()
+        logger.info(f"Started WAL checkpointer (every {self.interval_seconds}s, mode {self.mode})")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the background thread.
+
+        Args:
+            timeout (float): The number of seconds to wait for the thread to exit.
+
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Stopped WAL checkpointer")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                checkpoint_wal(self.engine, self.mode)
+            except Exception as e:
+                logger.error(f"WAL checkpoint failed: {e}")
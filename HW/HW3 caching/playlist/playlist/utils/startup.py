@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+import logging
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+from flask import Flask
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class StartupTimer:
+    """
+    Records how long each phase of application startup takes.
+
+    """
+
+    def __init__(self):
+        """Initializes the timer with no recorded phases."""
+        self.started = time.perf_counter()
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Context manager that records the duration of the block under the given name.
+
+        Args:
+            name (str): The name of the phase.
+
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def total(self) -> float:
+        """Returns the seconds elapsed since the timer was created."""
+        return time.perf_counter() - self.started
+
+    def summary(self) -> dict:
+        """Returns the phase durations and the total, in milliseconds.
+
+        Returns:
+            dict: The duration of each phase and the total.
+
+        """
+        return {
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.timings.items()},
+            "total_ms": round(self.total() * 1000, 2)
+        }
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0, interval: float = 0.05) -> bool:
+    """
+    Waits until a TCP port accepts connections.
+
+    Args:
+        host (str): The host to connect to. '0.0.0.0' is treated as localhost.
+        port (int): The port to connect to.
+        timeout (float): The maximum number of seconds to wait.
+        interval (float): The number of seconds between attempts.
+
+    Returns:
+        bool: True if the port accepted a connection before the timeout.
+    """
+    if host in ("", "0.0.0.0", "::"):
+        host = "127.0.0.1"
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=interval):
+                return True
+        except OSError:
+            time.sleep(interval)
+    return False
+
+
+def start_warmup(app: Flask, tasks: dict[str, Callable[[], object]],
+                 host: Optional[str] = None, port: Optional[int] = None,
+                 timeout: float = 30.0) -> threading.Thread:
+    """
+    Runs cache warm-up tasks in a background thread once the server is listening.
+
+    The server starts answering requests (including health checks) right away; the
+    tasks only fill caches so that the first real requests are fast. A failing task
+    is logged and skipped.
+
+    Args:
+        app (Flask): The app whose context the tasks run in.
+        tasks (dict[str, Callable]): The warm-up tasks by name.
+        host (str, optional): The host the server listens on. If omitted, tasks run immediately.
+        port (int, optional): The port the server listens on.
+        timeout (float): The maximum number of seconds to wait for the server.
+
+    Returns:
+        threading.Thread: The started daemon thread.
+    """
+    def run():
+        if host is not None and port is not None and not wait_for_port(host, port, timeout):
+            logger.warning(f"Server did not start listening on {host}:{port}, skipping cache warm-up")
+            return
+
+        started = time.perf_counter()
+        with app.app_context():
+            for name, task in tasks.items():
+                task_started = time.perf_counter()
+                try:
+                    task()
+                    logger.info(f"Warm-up task '{name}' finished in {(time.perf_counter() - task_started) * 1000:.1f}ms")
+                except Exception as e:
+                    logger.error(f"Warm-up task '{name}' failed: {e}")
+        logger.info(f"Cache warm-up finished in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    thread = threading.Thread(target=run, name="cache-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -3,6 +3,8 @@ import pytest
 from app import create_app
 from config import TestConfig
 from playlist.db import db
+from playlist.models.song_model import Songs
+from playlist.models.user_model import Users
 
 @pytest.fixture
 def app():
@@ -12,6 +14,9 @@ def app():
         yield app
         db.session.remove()
         db.drop_all()
+        Users.clear_user_cache()
+        Songs.clear_stats_cache()
+        Songs.clear_song_cache()
 
 @pytest.fixture
 def client(app):
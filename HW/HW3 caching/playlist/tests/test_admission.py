@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from playlist.models.user_model import Users
+from playlist.utils.admission import AdmissionLimiter, create_limiters
+
+
+@pytest.fixture
+def logged_in_client(client, session):
+    """Fixture providing a test client with a logged-in user."""
+    Users.create_user("testuser", "password")
+    client.post("/api/login", json={"username": "testuser", "password": "password"})
+    return client
+
+
+##########################################################
+# Limiter
+##########################################################
+
+
+def test_limiter_admits_up_to_max_concurrent():
+    """Test that requests are admitted until every slot is taken."""
+    limiter = AdmissionLimiter("test", max_concurrent=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    stats = limiter.get_stats()
+    assert stats["active"] == 2
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == 1
+
+
+def test_limiter_release_frees_slot():
+    """Test that releasing a slot lets the next request in."""
+    limiter = AdmissionLimiter("test", max_concurrent=1)
+
+    assert limiter.try_acquire()
+    limiter.release()
+
+    assert limiter.try_acquire()
+
+
+def test_limiter_queued_request_gets_released_slot():
+    """Test that a queued request is admitted when a slot frees up before its timeout."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=5)
+    limiter.try_acquire()
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limiter.try_acquire()))
+    waiter.start()
+    while limiter.get_stats()["waiting"] == 0:
+        pass
+    limiter.release()
+    waiter.join()
+
+    assert results == [True]
+
+
+def test_limiter_queue_timeout():
+    """Test that a queued request is rejected when its wait times out."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    limiter.try_acquire()
+
+    assert not limiter.try_acquire()
+    assert limiter.get_stats()["waiting"] == 0
+
+
+def test_limiter_rejects_when_queue_full():
+    """Test that requests are rejected immediately when the queue is full."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=0, queue_timeout=5)
+    limiter.try_acquire()
+
+    assert not limiter.try_acquire()
+
+
+@pytest.mark.parametrize("options", [
+    {"max_concurrent": 0},
+    {"max_concurrent": 1, "max_queue": -1},
+])
+def test_limiter_invalid_limits(options):
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        AdmissionLimiter("test", **options)
+
+
+def test_create_limiters():
+    """Test building limiters from the ADMISSION_LIMITS config."""
+    limiters = create_limiters({"a": {"max_concurrent": 1}, "b": {"max_concurrent": 3, "max_queue": 2}})
+
+    assert limiters["b"].max_concurrent == 3
+    assert limiters["b"].max_queue == 2
+
+
+##########################################################
+# Routes
+##########################################################
+
+
+def test_random_route_rejected_when_saturated(app, logged_in_client, mocker):
+    """Test that a saturated route group returns 503 with Retry-After."""
+    mock_go_to_random_track = mocker.patch("app.PlaylistModel.go_to_random_track")
+    limiter = app.extensions["admission_limiters"]["random_org"]
+    mocker.patch.object(limiter, "queue_timeout", 0)
+    for _ in range(limiter.max_concurrent):
+        limiter.try_acquire()
+
+    response = logged_in_client.post("/api/go-to-random-track")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(limiter.retry_after)
+    mock_go_to_random_track.assert_not_called()
+
+
+def test_random_route_admitted_and_released(app, logged_in_client, mocker):
+    """Test that an admitted request runs the route and gives its slot back."""
+    mocker.patch("app.PlaylistModel.get_playlist_length", return_value=2)
+    mocker.patch("app.PlaylistModel.go_to_random_track")
+    limiter = app.extensions["admission_limiters"]["random_org"]
+
+    response = logged_in_client.post("/api/go-to-random-track")
+
+    assert response.status_code == 200
+    assert limiter.get_stats()["active"] == 0
+    assert limiter.get_stats()["admitted"] == 1
@@ -0,0 +1,67 @@
+import random
+from collections import Counter
+
+import pytest
+
+from playlist.utils.alias import AliasTable
+
+
+##########################################################
+# Alias Table
+##########################################################
+
+
+def test_sample_frequencies_match_weights():
+    """Test that draws follow the weights within sampling error."""
+    weights = [1, 2, 3, 4, 10]
+    table = AliasTable(weights)
+    rng = random.Random(3)
+    draws = 200000
+
+    counts = Counter(table.sample(rng) for _ in range(draws))
+
+    total = sum(weights)
+    for index, weight in enumerate(weights):
+        assert counts[index] / draws == pytest.approx(weight / total, abs=0.005)
+
+
+def test_zero_weights_are_never_drawn():
+    """Test that an index with zero weight is never sampled."""
+    table = AliasTable([0, 5, 0, 1])
+    rng = random.Random(0)
+
+    assert {table.sample(rng) for _ in range(10000)} == {1, 3}
+
+
+def test_column_probabilities_preserve_weights():
+    """Test that each index's total probability mass across columns equals its share."""
+    weights = [7, 1, 1, 3, 0, 4]
+    table = AliasTable(weights)
+    n = len(weights)
+
+    mass = [0.0] * n
+    for column in range(n):
+        mass[column] += table._probability[column] / n
+        mass[table._alias[column]] += (1 - table._probability[column]) / n
+
+    for index, weight in enumerate(weights):
+        assert mass[index] == pytest.approx(weight / sum(weights))
+
+
+def test_single_weight():
+    """Test that a one-entry table always returns index 0."""
+    table = AliasTable([3])
+
+    assert len(table) == 1
+    assert table.sample(random.Random()) == 0
+
+
+@pytest.mark.parametrize("weights, message", [
+    ([], "without weights"),
+    ([1, -1], "must not be negative"),
+    ([0, 0], "At least one weight"),
+])
+def test_invalid_weights(weights, message):
+    """Test that unusable weights are rejected."""
+    with pytest.raises(ValueError, match=message):
+        AliasTable(weights)
@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import TestConfig
+from playlist.db import db, get_readonly_engine, readonly_session
+from playlist.models.song_model import Songs
+
+
+@pytest.fixture
+def file_config(tmp_path):
+    """Fixture providing a config for a SQLite file, with a derived read-only engine."""
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+        SQLALCHEMY_READONLY_DATABASE_URI = None
+        SQLITE_PRAGMAS = {"journal_mode": "WAL", "busy_timeout": 5000}
+
+    return FileConfig
+
+
+@pytest.fixture
+def file_app(file_config):
+    """Fixture providing an app backed by a SQLite file."""
+    app = create_app(file_config)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_readonly_engine_derived_from_sqlite_file(file_app):
+    """Test that a mode=ro engine is created for a file-backed database."""
+    engine = get_readonly_engine()
+    assert engine.url.query["mode"] == "ro"
+    assert engine.url.database == f"file:{db.engine.url.database}"
+
+
+def test_no_readonly_engine_for_memory_database(app):
+    """Test that the in-memory test database does not get a read-only engine."""
+    assert get_readonly_engine() is None
+    with readonly_session() as session:
+        assert session.get_bind() is db.engine
+
+
+def test_readonly_session_routes_reads(file_app):
+    """Test that reads inside a read-only block use the read-only engine."""
+    with readonly_session() as session:
+        assert session.get_bind() is get_readonly_engine()
+    assert db.session.get_bind() is db.engine
+
+
+def test_read_only_methods_see_committed_writes(file_app):
+    """Test that read-only model methods read data written through the primary engine."""
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    db.session.remove()
+
+    songs = Songs.get_all_songs()
+
+    assert [song["title"] for song in songs] == ["Bohemian Rhapsody"]
+
+
+def test_writes_after_readonly_load_go_to_primary(file_app):
+    """Test that an object loaded from the read-only engine can be updated and committed."""
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    db.session.remove()
+
+    song = Songs.get_song_by_compound_key("Queen", "Bohemian Rhapsody", 1975)
+    song.update_play_count()
+    db.session.remove()
+
+    assert Songs.get_song_by_id(song.id).play_count == 1
+
+
+def test_readonly_engine_rejects_writes(file_app):
+    """Test that the read-only engine cannot be used to write."""
+    with pytest.raises(OperationalError):
+        with get_readonly_engine().begin() as conn:
+            conn.exec_driver_sql("DELETE FROM Songs")
+
+
+def test_schema_check_skips_create_all_when_current(file_config, file_app, mocker):
+    """Test that a restart against an up-to-date database skips the schema setup."""
+    create_all = mocker.spy(db, "create_all")
+    ensure_search_index = mocker.spy(Songs, "ensure_search_index")
+
+    restarted = create_app(file_config)
+
+    create_all.assert_not_called()
+    ensure_search_index.assert_not_called()
+    assert "schema" in restarted.extensions["startup_timer"].timings
+
+
+def test_schema_check_can_be_disabled(file_config, file_app, mocker):
+    """Test that the schema setup always runs when the check is disabled."""
+    create_all = mocker.spy(db, "create_all")
+
+    class NoCheckConfig(file_config):
+        SCHEMA_VERSION_CHECK = False
+
+    create_app(NoCheckConfig)
+
+    create_all.assert_called_once()
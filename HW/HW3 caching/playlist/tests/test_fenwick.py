@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from playlist.utils.fenwick import FenwickTree
+
+
+##########################################################
+# Fenwick Tree
+##########################################################
+
+
+def test_prefix_sums_match_naive_sums():
+    """Test that prefix sums agree with summing the values directly."""
+    values = [random.Random(1).randint(0, 500) for _ in range(37)]
+    tree = FenwickTree(values)
+
+    assert len(tree) == 37
+    for count in range(len(values) + 1):
+        assert tree.prefix_sum(count) == sum(values[:count])
+
+
+def test_append_matches_bulk_build():
+    """Test that appending values one at a time builds the same tree."""
+    values = list(range(1, 50))
+    tree = FenwickTree()
+    for value in values:
+        tree.append(value)
+
+    assert tree._tree == FenwickTree(values)._tree
+    assert tree.total() == sum(values)
+
+
+def test_set_updates_sums():
+    """Test that point updates are reflected in later prefix sums."""
+    tree = FenwickTree([10, 20, 30])
+    tree.set(1, 5)
+
+    assert tree.get(1) == 5
+    assert tree.prefix_sum(2) == 15
+    assert tree.total() == 45
+
+
+@pytest.mark.parametrize("target, expected", [
+    (0, 0),
+    (9, 0),
+    (10, 1),
+    (29, 1),
+    (30, 3),
+    (59, 3),
+    (60, 4),
+])
+def test_find(target, expected):
+    """Test that find returns the position whose span contains the target, skipping empty ones."""
+    tree = FenwickTree([10, 20, 0, 30])
+    assert tree.find(target) == expected
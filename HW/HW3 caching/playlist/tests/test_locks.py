@@ -0,0 +1,245 @@
+import threading
+import time
+
+import pytest
+
+from playlist.utils.locks import ReadWriteLock, SingleFlight
+
+
+##########################################################
+# Read/Write Lock
+##########################################################
+
+
+def test_readers_do_not_block_each_other():
+    """Test that several threads can hold the read lock at the same time."""
+    lock = ReadWriteLock()
+    barrier = threading.Barrier(3, timeout=2)
+    errors = []
+
+    def reader():
+        with lock.read_locked():
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_writer_excludes_readers():
+    """Test that a reader waits for the writer to release the lock."""
+    lock = ReadWriteLock()
+    events = []
+
+    lock.acquire_write()
+
+    def reader():
+        with lock.read_locked():
+            events.append("read")
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    time.sleep(0.05)
+    events.append("write done")
+    lock.release_write()
+    thread.join()
+
+    assert events == ["write done", "read"]
+
+
+def test_waiting_writer_blocks_new_readers():
+    """Test that new readers queue behind a waiting writer."""
+    lock = ReadWriteLock()
+    events = []
+
+    lock.acquire_read()
+
+    def writer():
+        with lock.write_locked():
+            events.append("write")
+
+    def reader():
+        with lock.read_locked():
+            events.append("read")
+
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    time.sleep(0.05)
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    time.sleep(0.05)
+
+    assert events == []
+    lock.release_read()
+    writer_thread.join()
+    reader_thread.join()
+
+    assert events == ["write", "read"]
+
+
+def test_lock_is_reentrant():
+    """Test that the holder can re-take the lock, and the writer can also read."""
+    lock = ReadWriteLock()
+
+    with lock.write_locked():
+        with lock.write_locked():
+            with lock.read_locked():
+                pass
+
+    with lock.read_locked():
+        with lock.read_locked():
+            pass
+
+    # Fully released: another thread can write
+    thread = threading.Thread(target=lambda: lock.write_locked().__enter__())
+    thread.start()
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+
+
+def test_read_lock_cannot_be_upgraded():
+    """Test that taking the write lock while reading raises instead of deadlocking."""
+    lock = ReadWriteLock()
+
+    with lock.read_locked():
+        with pytest.raises(RuntimeError, match="upgrade"):
+            lock.acquire_write()
+
+
+def test_release_without_acquire():
+    """Test that releasing a lock that is not held raises."""
+    lock = ReadWriteLock()
+
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+
+
+def test_write_count():
+    """Test that write_count changes once per outermost write lock, and not for reads."""
+    lock = ReadWriteLock()
+
+    with lock.read_locked():
+        pass
+    assert lock.write_count == 0
+
+    with lock.write_locked():
+        with lock.write_locked():
+            pass
+        assert lock.write_count == 0
+    assert lock.write_count == 1
+
+
+##########################################################
+# Single Flight
+##########################################################
+
+
+def run_concurrently(count: int, target) -> list:
+    """Runs target in count threads started together and returns their outcomes in order."""
+    barrier = threading.Barrier(count, timeout=2)
+    outcomes = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            outcomes[index] = ("ok", target())
+        except Exception as e:
+            outcomes[index] = ("error", e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_single_flight_shares_one_load():
+    """Test that concurrent callers for one key share a single call to the loader."""
+    group = SingleFlight(timeout=2)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    outcomes = run_concurrently(5, lambda: group.do("key", load))
+
+    assert outcomes == [("ok", "value")] * 5
+    assert len(calls) == 1
+    assert group.get_stats() == {"loads": 1, "shared": 4, "timeouts": 0, "in_flight": 0}
+
+
+def test_single_flight_propagates_errors():
+    """Test that every waiter gets the exception raised by the load."""
+    group = SingleFlight(timeout=2)
+
+    def load():
+        time.sleep(0.1)
+        raise ValueError("not found")
+
+    outcomes = run_concurrently(3, lambda: group.do("key", load))
+
+    assert [status for status, _ in outcomes] == ["error"] * 3
+    assert all(isinstance(error, ValueError) and str(error) == "not found" for _, error in outcomes)
+    assert group.get_stats()["loads"] == 1
+
+
+def test_single_flight_keys_are_independent():
+    """Test that a slow load of one key does not hold up another key."""
+    group = SingleFlight(timeout=2)
+    release = threading.Event()
+    slow = threading.Thread(target=group.do, args=("slow", lambda: release.wait(2)))
+    slow.start()
+    try:
+        assert group.do("fast", lambda: 42) == 42
+    finally:
+        release.set()
+        slow.join()
+
+
+def test_single_flight_waiter_timeout():
+    """Test that a waiter gives up after its timeout while the load keeps running."""
+    group = SingleFlight(timeout=0.05)
+    release = threading.Event()
+    results = []
+    leader = threading.Thread(target=lambda: results.append(group.do("key", lambda: release.wait(2) and "late")))
+    leader.start()
+    while not group.get_stats()["in_flight"]:
+        time.sleep(0.001)
+
+    with pytest.raises(TimeoutError, match="Timed out"):
+        group.do("key", lambda: "unused")
+
+    release.set()
+    leader.join()
+    assert results == ["late"]
+    assert group.get_stats()["timeouts"] == 1
+
+
+def test_single_flight_loads_again_after_completion():
+    """Test that a key is loaded again once its previous load has finished."""
+    group = SingleFlight()
+    values = iter([1, 2])
+
+    assert group.do("key", lambda: next(values)) == 1
+    assert group.do("key", lambda: next(values)) == 2
+
+
+def test_single_flight_recursive_load():
+    """Test that a load of a key that loads the same key fails instead of deadlocking."""
+    group = SingleFlight(timeout=1)
+
+    with pytest.raises(RuntimeError, match="Recursive load"):
+        group.do("key", lambda: group.do("key", lambda: None))
+    assert group.get_stats()["in_flight"] == 0
@@ -0,0 +1,112 @@
+import pytest
+
+from playlist.utils import memory_utils
+from playlist.utils.memory_utils import compare_snapshots, get_deep_size, take_snapshot
+
+
+@pytest.fixture
+def clean_snapshots():
+    """Fixture that discards snapshots and stops tracemalloc after each test."""
+    yield
+    memory_utils.clear_snapshots()
+
+
+##########################################################
+# Deep Size
+##########################################################
+
+
+def test_get_deep_size_counts_nested_items():
+    """Test that nested containers are larger than their empty counterparts."""
+    assert get_deep_size({1: ["a" * 1000]}) > get_deep_size({1: []}) + 1000
+
+
+def test_get_deep_size_counts_shared_objects_once():
+    """Test that an object referenced twice is only counted once."""
+    shared = "x" * 1000
+    assert get_deep_size([shared, shared]) < get_deep_size([shared, "y" * 1000])
+
+
+def test_get_deep_size_skips_sqlalchemy_state(session):
+    """Test that ORM instances are sized without walking into the session."""
+    from playlist.models.song_model import Songs
+
+    song = Songs(artist="Queen", title="Bohemian Rhapsody", year=1975, genre="Rock", duration=354)
+    session.add(song)
+    session.commit()
+
+    assert get_deep_size(song) < 10_000
+
+
+##########################################################
+# Snapshots
+##########################################################
+
+
+def test_compare_snapshots(clean_snapshots):
+    """Test diffing two snapshots reports the allocation sites that grew."""
+    take_snapshot()
+    leak = [str(i) * 10 for i in range(10_000)]
+    take_snapshot()
+
+    stats = compare_snapshots(limit=5)
+
+    assert 0 < len(stats) <= 5
+    assert stats[0]["size_diff_bytes"] > 0
+    assert any("test_memory_utils.py" in location for stat in stats for location in stat["location"])
+    del leak
+
+
+def test_compare_snapshots_requires_two(clean_snapshots):
+    """Test that diffing with fewer than two snapshots raises an error."""
+    take_snapshot()
+    with pytest.raises(ValueError, match="At least two snapshots"):
+        compare_snapshots()
+
+
+def test_compare_snapshots_defaults_second_to_latest(clean_snapshots, mocker):
+    """Test that giving only the older snapshot diffs it against the most recent one."""
+    first = take_snapshot()["snapshot_id"]
+    take_snapshot()
+    latest = take_snapshot()["snapshot_id"]
+    spy = mocker.spy(memory_utils.logger, "info")
+
+    compare_snapshots(first_id=first)
+
+    assert f"snapshots {first} and {latest}" in spy.call_args[0][0]
+
+
+def test_compare_snapshots_defaults_first_to_previous(clean_snapshots, mocker):
+    """Test that giving only the newer snapshot diffs it against the one taken before it."""
+    first = take_snapshot()["snapshot_id"]
+    second = take_snapshot()["snapshot_id"]
+    take_snapshot()
+    spy = mocker.spy(memory_utils.logger, "info")
+
+    compare_snapshots(second_id=second)
+
+    assert f"snapshots {first} and {second}" in spy.call_args[0][0]
+
+
+def test_compare_snapshots_nothing_before_second(clean_snapshots):
+    """Test that the oldest snapshot has no default snapshot to compare against."""
+    first = take_snapshot()["snapshot_id"]
+    take_snapshot()
+
+    with pytest.raises(ValueError, match="No snapshot was taken before"):
+        compare_snapshots(second_id=first)
+
+
+def test_compare_snapshots_invalid_key_type(clean_snapshots):
+    """Test that an unknown key_type is rejected."""
+    with pytest.raises(ValueError, match="Invalid key_type"):
+        compare_snapshots(key_type="bogus")
+
+
+def test_clear_snapshots_stops_tracing():
+    """Test that clearing snapshots stops tracemalloc."""
+    take_snapshot()
+    memory_utils.clear_snapshots()
+
+    assert not memory_utils.is_tracing()
+    assert memory_utils.list_snapshots() == []
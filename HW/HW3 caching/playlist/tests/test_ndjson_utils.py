@@ -0,0 +1,59 @@
+import gzip
+import io
+
+import pytest
+
+from playlist.utils.ndjson_utils import iter_gzip_ndjson, iter_ndjson
+
+
+##########################################################
+# Encoding
+##########################################################
+
+
+def test_iter_gzip_ndjson_round_trip():
+    """Test that encoded records decode back to the same records."""
+    records = [{"id": i, "title": f"Song {i}"} for i in range(1000)]
+    data = b"".join(iter_gzip_ndjson(records))
+
+    assert gzip.decompress(data).count(b"\n") == 1000
+    assert list(iter_ndjson(io.BytesIO(data))) == records
+
+
+def test_iter_gzip_ndjson_yields_bounded_chunks():
+    """Test that output is produced in small chunks rather than all at once."""
+    records = ({"id": i, "payload": f"{i:x}" * 20} for i in range(50000))
+    chunks = list(iter_gzip_ndjson(records, chunk_size=4096))
+
+    # zlib releases output in bursts of a few tens of KB, on top of the chunk size
+    assert max(len(chunk) for chunk in chunks) < 4096 + 64 * 1024
+    assert sum(len(chunk) for chunk in chunks) > 5 * max(len(chunk) for chunk in chunks)
+
+
+def test_iter_gzip_ndjson_empty():
+    """Test that an empty input is still a valid gzip stream."""
+    data = b"".join(iter_gzip_ndjson([]))
+    assert gzip.decompress(data) == b""
+
+
+##########################################################
+# Decoding
+##########################################################
+
+
+def test_iter_ndjson_uncompressed_skips_blank_lines():
+    """Test decoding plain NDJSON."""
+    stream = io.BytesIO(b'{"a": 1}\n\n{"a": 2}\n')
+    assert list(iter_ndjson(stream, compressed=False)) == [{"a": 1}, {"a": 2}]
+
+
+@pytest.mark.parametrize("data, compressed, match", [
+    (b"not gzip at all", True, "Invalid input"),
+    (gzip.compress(b'{"a": 1}\n{"a": \n'), True, "Line 2"),
+    (b'[1, 2]\n', False, "not a JSON object"),
+    (gzip.compress(b'{"a": 1}\n' * 100)[:-20], True, "Invalid input"),
+])
+def test_iter_ndjson_invalid(data, compressed, match):
+    """Test that malformed input raises a ValueError."""
+    with pytest.raises(ValueError, match=match):
+        list(iter_ndjson(io.BytesIO(data), compressed=compressed))
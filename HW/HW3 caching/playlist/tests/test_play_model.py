@@ -0,0 +1,272 @@
+import math
+
+import pytest
+from sqlalchemy import func, select
+
+from playlist.db import db
+from playlist.models.play_model import PlayTracker, Plays, RollingPlayCounter, SongHotScores, log_add_exp
+from playlist.models.playlist_model import PlaylistModel
+from playlist.models.song_model import Songs
+
+
+class FakeClock:
+    """A manually advanced wall clock."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture providing a fake clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def play_tracker(app, clock):
+    """Fixture providing a PlayTracker on the test database."""
+    return PlayTracker(db.engine, batch_size=100, clock=clock)
+
+
+@pytest.fixture
+def three_songs(session):
+    """Fixture adding three songs (IDs 1-3) to the catalog."""
+    songs = [Songs(artist=f"Artist {i}", title=f"Song {i}", year=2000 + i, genre="Pop", duration=200)
+             for i in range(1, 4)]
+    session.add_all(songs)
+    session.commit()
+    return songs
+
+
+def count_plays() -> int:
+    return db.session.execute(select(func.count()).select_from(Plays)).scalar()
+
+
+##################################################
+# Rolling Counter
+##################################################
+
+
+def test_rolling_counter_expires_old_buckets():
+    """Test that plays drop out once their bucket is entirely outside the window."""
+    counter = RollingPlayCounter(window_seconds=600, bucket_seconds=60)
+    counter.add(1, 0)
+    counter.add(1, 30)
+    counter.add(2, 90)
+
+    counter.expire(659)
+    assert counter.ranking.top(5) == [(1, 2), (2, 1)]
+
+    counter.expire(660)
+    assert counter.ranking.top(5) == [(2, 1)]
+
+    counter.expire(720)
+    assert counter.ranking.top(5) == []
+
+
+def test_log_add_exp():
+    """Test that log_add_exp matches the direct sum and handles large and empty values."""
+    assert log_add_exp(math.log(2), math.log(3)) == pytest.approx(math.log(5))
+    assert log_add_exp(-math.inf, 1.5) == 1.5
+    assert log_add_exp(10_000.0, 10_000.0) == pytest.approx(10_000.0 + math.log(2))
+
+
+##################################################
+# Recording and Flushing
+##################################################
+
+
+def test_record_play_buffers_until_flush(play_tracker, three_songs):
+    """Test that plays are written only when flushed, in one batch."""
+    for song_id in (1, 2, 1):
+        play_tracker.record_play(song_id)
+
+    assert count_plays() == 0
+    assert play_tracker.flush() == 3
+    assert count_plays() == 3
+    assert play_tracker.flush() == 0
+
+
+def test_record_play_flushes_full_batch(app, clock, three_songs):
+    """Test that reaching the batch size writes the buffered plays."""
+    tracker = PlayTracker(db.engine, batch_size=2, clock=clock)
+
+    tracker.record_play(1)
+    assert count_plays() == 0
+    tracker.record_play(2)
+    assert count_plays() == 2
+
+
+def test_stop_flushes_buffered_plays(play_tracker, three_songs):
+    """Test that stopping the tracker writes what is still buffered."""
+    play_tracker.record_play(1)
+
+    play_tracker.stop()
+
+    assert count_plays() == 1
+
+
+def test_play_current_song_records_play(app, clock, three_songs):
+    """Test that playing a song in the playlist records the play."""
+    tracker = PlayTracker(db.engine, clock=clock)
+    playlist_model = PlaylistModel(play_tracker=tracker)
+    playlist_model.add_songs_to_playlist([2, 3])
+
+    playlist_model.play_current_song()
+
+    assert tracker.get_top_songs("1h", 5) == [(2, 1)]
+
+
+##################################################
+# Leaderboards
+##################################################
+
+
+def test_get_top_songs_per_window(play_tracker, clock):
+    """Test that each window only counts the plays inside it."""
+    play_tracker.record_play(1, played_at=clock.now - 2 * 24 * 3600)
+    play_tracker.record_play(2, played_at=clock.now - 3 * 3600)
+    play_tracker.record_play(2, played_at=clock.now - 3 * 3600)
+    play_tracker.record_play(3, played_at=clock.now - 60)
+
+    assert play_tracker.get_top_songs("1h", 5) == [(3, 1)]
+    assert play_tracker.get_top_songs("24h", 5) == [(2, 2), (3, 1)]
+    assert play_tracker.get_top_songs("7d", 5) == [(2, 2), (1, 1), (3, 1)]
+
+
+def test_get_top_songs_slides_with_time(play_tracker, clock):
+    """Test that plays leave the window as time passes."""
+    play_tracker.record_play(1)
+    clock.now += 3600 + 60
+
+    assert play_tracker.get_top_songs("1h", 5) == []
+    assert play_tracker.get_top_songs("24h", 5) == [(1, 1)]
+
+
+def test_get_top_songs_invalid_window(play_tracker):
+    """Test that an unknown window raises a ValueError."""
+    with pytest.raises(ValueError, match="Invalid window: 30d"):
+        play_tracker.get_top_songs("30d", 5)
+
+
+def test_get_leaderboard(play_tracker, three_songs):
+    """Test that the leaderboard has song details and window play counts."""
+    for song_id in (3, 3, 1):
+        play_tracker.record_play(song_id)
+
+    leaderboard = play_tracker.get_leaderboard("24h", limit=5)
+
+    assert [(entry["title"], entry["plays"]) for entry in leaderboard] == [("Song 3", 2), ("Song 1", 1)]
+
+
+def test_get_leaderboard_skips_deleted_songs(play_tracker, three_songs):
+    """Test that deleted songs are skipped and the list is filled from further down."""
+    for song_id in (1, 1, 1, 2, 2, 3):
+        play_tracker.record_play(song_id)
+    Songs.delete_song(1)
+
+    leaderboard = play_tracker.get_leaderboard("1h", limit=2)
+
+    assert [entry["id"] for entry in leaderboard] == [2, 3]
+
+
+def test_get_leaderboard_invalid_limit(play_tracker):
+    """Test that a limit out of range raises a ValueError."""
+    with pytest.raises(ValueError, match="limit must be between"):
+        play_tracker.get_leaderboard("1h", limit=0)
+
+
+def test_load_recent_rebuilds_counters(play_tracker, clock, app):
+    """Test that a new tracker rebuilds its counters from the plays table."""
+    play_tracker.record_play(1, played_at=clock.now - 8 * 24 * 3600)
+    play_tracker.record_play(2, played_at=clock.now - 2 * 3600)
+    play_tracker.record_play(3, played_at=clock.now - 10)
+    play_tracker.flush()
+
+    restarted = PlayTracker(db.engine, clock=clock)
+    assert restarted.load_recent() == 2
+
+    assert restarted.get_top_songs("1h", 5) == [(3, 1)]
+    assert restarted.get_top_songs("7d", 5) == [(2, 1), (3, 1)]
+
+
+##################################################
+# Hot Songs
+##################################################
+
+
+def test_hot_score_decays_by_half_life(app, clock, three_songs):
+    """Test that each play counts half as much per half-life since it was played."""
+    tracker = PlayTracker(db.engine, clock=clock, half_life=3600)
+    tracker.record_play(1, played_at=clock.now - 7200)
+    tracker.record_play(1, played_at=clock.now - 3600)
+    tracker.record_play(2, played_at=clock.now)
+
+    hot_songs = tracker.get_hot_songs(limit=5)
+
+    assert [song["id"] for song in hot_songs] == [2, 1]
+    assert hot_songs[0]["hot_score"] == pytest.approx(1.0)
+    assert hot_songs[1]["hot_score"] == pytest.approx(0.75)
+
+
+def test_hot_scores_persisted_on_flush(app, clock, three_songs):
+    """Test that a flush adds the pending scores to the stored ones."""
+    tracker = PlayTracker(db.engine, clock=clock, half_life=3600)
+    tracker.record_play(3)
+    tracker.flush()
+    tracker.record_play(3)
+    tracker.flush()
+
+    stored = db.session.execute(select(SongHotScores.hot_score).where(SongHotScores.song_id == 3)).scalar()
+    assert stored == pytest.approx(tracker.decay_rate * clock.now + math.log(2))
+
+    restarted = PlayTracker(db.engine, clock=clock, half_life=3600)
+    clock.now += 3600
+    assert restarted.get_hot_songs(limit=1)[0]["hot_score"] == pytest.approx(1.0)
+
+
+def test_get_hot_songs_merges_unflushed_plays(app, clock, three_songs):
+    """Test that unflushed plays can lift a song above the stored top."""
+    tracker = PlayTracker(db.engine, clock=clock, half_life=3600)
+    for song_id in (1, 1, 2):
+        tracker.record_play(song_id)
+    tracker.flush()
+    tracker.record_play(2)
+    tracker.record_play(2)
+
+    hot_songs = tracker.get_hot_songs(limit=1)
+
+    assert hot_songs[0]["id"] == 2
+    assert hot_songs[0]["hot_score"] == pytest.approx(3.0)
+
+
+def test_get_hot_songs_skips_deleted_songs(play_tracker, three_songs):
+    """Test that deleted songs are skipped and the list is filled from further down."""
+    for song_id in (1, 1, 1, 2, 2, 3):
+        play_tracker.record_play(song_id)
+    play_tracker.flush()
+    Songs.delete_song(1)
+
+    hot_songs = play_tracker.get_hot_songs(limit=2)
+
+    assert [song["id"] for song in hot_songs] == [2, 3]
+
+
+def test_get_hot_songs_invalid_limit(play_tracker):
+    """Test that a limit out of range raises a ValueError."""
+    with pytest.raises(ValueError, match="limit must be between"):
+        play_tracker.get_hot_songs(limit=101)
+
+
+def test_clear(play_tracker):
+    """Test that clear drops buffered plays and counts."""
+    play_tracker.record_play(1)
+
+    play_tracker.clear()
+
+    assert play_tracker.get_top_songs("7d", 5) == []
+    assert play_tracker.get_hot_songs(5) == []
+    assert play_tracker.flush() == 0
@@ -1,6 +1,10 @@
+import random
+import threading
+import time
+
 import pytest
 
-from playlist.models.playlist_model import PlaylistModel
+from playlist.models.playlist_model import PlaylistModel, SongCacheRefresher
 from playlist.models.song_model import Songs
 
 
@@ -58,7 +62,7 @@ def test_add_song_to_playlist(playlist_model, song_beatles, mocker):
 
 def test_add_duplicate_song_to_playlist(playlist_model, song_beatles, mocker):
     """Test error when adding a duplicate song to the playlist by ID."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=[song_beatles] * 2)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_beatles)
     playlist_model.add_song_to_playlist(1)
     with pytest.raises(ValueError, match="Song with ID 1 already exists in the playlist"):
         playlist_model.add_song_to_playlist(1)
@@ -149,6 +153,130 @@ def test_move_song_to_beginning(playlist_model, sample_playlist, mocker):
     assert playlist_model.playlist[0] == 2, "Expected Song 2 to be at the beginning"
 
 
+##################################################
+# Bulk Add / Reorder Test Cases
+##################################################
+
+
+@pytest.fixture
+def five_songs(session):
+    """Fixture adding five songs (IDs 1-5) to the catalog."""
+    songs = [Songs(artist=f"Artist {i}", title=f"Song {i}", year=2000 + i, genre="Pop", duration=100 * i)
+             for i in range(1, 6)]
+    session.add_all(songs)
+    session.commit()
+    return songs
+
+
+def test_add_songs_to_playlist(playlist_model, five_songs, mocker):
+    """Test adding several songs with one batch lookup."""
+    spy = mocker.spy(Songs, "get_songs_by_ids")
+
+    playlist_model.add_songs_to_playlist([3, 1, 5])
+
+    assert playlist_model.playlist == [3, 1, 5]
+    assert playlist_model.get_playlist_duration() == 900
+    assert playlist_model.find_track_at_time(350)["track_number"] == 2
+    assert spy.call_count == 1
+
+
+def test_add_songs_to_playlist_is_atomic(playlist_model, five_songs):
+    """Test that nothing is added if any song does not exist."""
+    playlist_model.add_songs_to_playlist([1])
+
+    with pytest.raises(ValueError, match=r"Songs with IDs \[99\] not found"):
+        playlist_model.add_songs_to_playlist([2, 99, 3])
+
+    assert playlist_model.playlist == [1]
+
+
+@pytest.mark.parametrize("song_ids, message", [
+    ([2, 2], "duplicates"),
+    ([2, 1], r"IDs \[1\] already exist"),
+    ([2, "x"], "Invalid song id"),
+])
+def test_add_songs_to_playlist_invalid(playlist_model, five_songs, song_ids, message):
+    """Test that repeated, already-added and malformed IDs are rejected."""
+    playlist_model.add_songs_to_playlist([1])
+
+    with pytest.raises(ValueError, match=message):
+        playlist_model.add_songs_to_playlist(song_ids)
+
+    assert playlist_model.playlist == [1]
+
+
+def test_add_songs_to_playlist_extends_shuffle(playlist_model, five_songs):
+    """Test that bulk-added songs join the shuffle order."""
+    playlist_model.add_songs_to_playlist([1, 2])
+    playlist_model.enable_shuffle(seed=7)
+
+    playlist_model.add_songs_to_playlist([3, 4, 5])
+
+    assert sorted(playlist_model.get_shuffle_order()) == [1, 2, 3, 4, 5]
+
+
+def test_reorder_playlist(playlist_model, five_songs):
+    """Test applying a full new ordering, keeping the current song current."""
+    playlist_model.add_songs_to_playlist([1, 2, 3, 4, 5])
+    playlist_model.go_to_track_number(2)
+
+    playlist_model.reorder_playlist([5, 4, 3, 2, 1])
+
+    assert playlist_model.playlist == [5, 4, 3, 2, 1]
+    assert playlist_model.get_current_song().id == 2
+    assert playlist_model.find_track_at_time(0)["song_id"] == 5
+
+
+@pytest.mark.parametrize("song_ids", [[1, 2, 3], [1, 2, 3, 4, 4], [1, 2, 3, 4, 6], "1,2,3,4,5"])
+def test_reorder_playlist_invalid(playlist_model, song_ids):
+    """Test that an ordering that is not a permutation of the playlist is rejected."""
+    playlist_model.playlist = [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError, match="every song in the playlist exactly once"):
+        playlist_model.reorder_playlist(song_ids)
+
+    assert playlist_model.playlist == [1, 2, 3, 4, 5]
+
+
+def test_move_songs(playlist_model):
+    """Test that moved songs land on their targets and the rest keep their order."""
+    playlist_model.playlist = [1, 2, 3, 4, 5]
+
+    playlist_model.move_songs([(5, 1), (1, 3)])
+
+    assert playlist_model.playlist == [5, 2, 1, 3, 4]
+
+
+def test_move_songs_single_move_matches_move_song_to_track_number(playlist_model, five_songs):
+    """Test that a single move gives the same result as move_song_to_track_number."""
+    playlist_model.add_songs_to_playlist([1, 2, 3, 4, 5])
+    other = PlaylistModel()
+    other.add_songs_to_playlist([1, 2, 3, 4, 5])
+
+    playlist_model.move_songs([(2, 4)])
+    other.move_song_to_track_number(2, 4)
+
+    assert playlist_model.playlist == other.playlist
+
+
+@pytest.mark.parametrize("moves, message", [
+    ([(9, 1)], "not found in playlist"),
+    ([(1, 6)], "Invalid track number"),
+    ([(1, 2), (1, 3)], "moved more than once"),
+    ([(1, 2), (3, 2)], "target of more than one move"),
+    ([(1,)], "Invalid move"),
+    ([], "non-empty list"),
+])
+def test_move_songs_invalid(playlist_model, moves, message):
+    """Test that invalid moves are rejected without changing the playlist."""
+    playlist_model.playlist = [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError, match=message):
+        playlist_model.move_songs(moves)
+
+    assert playlist_model.playlist == [1, 2, 3, 4, 5]
+
+
 ##################################################
 # Song Retrieval Test Cases
 ##################################################
@@ -224,6 +352,47 @@ def test_get_playlist_duration(playlist_model, sample_playlist, mocker):
     assert playlist_model.get_playlist_duration() == 560, "Expected playlist duration to be 560 seconds"
 
 
+def test_get_songs_by_ids(playlist_model, song_beatles, song_nirvana):
+    """Test retrieving songs by ID in request order, with None for missing IDs."""
+    songs = playlist_model.get_songs_by_ids([2, 999, 1, 2])
+
+    assert [song.id if song else None for song in songs] == [2, None, 1, 2]
+
+
+def test_get_songs_by_ids_sees_plays_and_deletes(playlist_model, song_beatles, song_nirvana):
+    """Test that batch lookups read the shared song cache, which plays and deletes invalidate."""
+    playlist_model.get_songs_by_ids([1, 2])
+
+    Songs.get_song_by_id(2).update_play_count()
+    Songs.delete_song(1)
+
+    songs = playlist_model.get_songs_by_ids([1, 2])
+    assert songs[0] is None
+    assert songs[1].play_count == 1
+
+
+def test_playlist_lookups_fill_shared_song_cache(playlist_model, song_beatles):
+    """Test that songs the playlist loads are cached for every caller, not just the playlist."""
+    playlist_model._get_song_from_cache_or_db(1)
+
+    assert Songs.get_cached_song(1).title == "Come Together"
+
+
+@pytest.mark.parametrize("song_ids", ["1,2", [1, "2"], [1, -1], [True]])
+def test_get_songs_by_ids_invalid(playlist_model, song_ids):
+    """Test that malformed ID lists are rejected."""
+    with pytest.raises(ValueError):
+        playlist_model.get_songs_by_ids(song_ids)
+
+
+def test_get_songs_by_ids_too_many(playlist_model, mocker):
+    """Test that requesting more than the batch limit is rejected."""
+    mocker.patch("playlist.models.playlist_model.MAX_BATCH_SONG_IDS", 3)
+
+    with pytest.raises(ValueError, match="At most 3 song IDs"):
+        playlist_model.get_songs_by_ids([1, 2, 3, 4])
+
+
 ##################################################
 # Utility Function Test Cases
 ##################################################
@@ -394,4 +563,454 @@ def test_play_rest_of_playlist(playlist_model, sample_playlist, mocker):
     mock_update_play_count.assert_any_call()
     assert mock_update_play_count.call_count == 1
 
-    assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
\ No newline at end of file
+    assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
+
+##################################################
+# Time Offset Test Cases
+##################################################
+
+
+@pytest.fixture
+def timed_model(playlist_model, mocker):
+    """Fixture for a playlist of three songs lasting 100, 200 and 300 seconds."""
+    songs = {song_id: mocker.Mock(id=song_id, duration=song_id * 100) for song_id in (1, 2, 3)}
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=lambda song_id: songs[song_id])
+    for song_id in songs:
+        playlist_model.add_song_to_playlist(song_id)
+    return playlist_model
+
+
+@pytest.mark.parametrize("seconds, track_number, offset", [
+    (0, 1, 0),
+    (99, 1, 99),
+    (100, 2, 0),
+    (350, 3, 50),
+    (599, 3, 299),
+])
+def test_find_track_at_time(timed_model, seconds, track_number, offset):
+    """Test mapping a time offset to a track and an offset within it."""
+    position = timed_model.find_track_at_time(seconds)
+    assert position == {"track_number": track_number, "song_id": track_number, "offset_seconds": offset}
+
+
+@pytest.mark.parametrize("seconds", [-1, 600, "soon"])
+def test_find_track_at_time_invalid(timed_model, seconds):
+    """Test that times outside the playlist are rejected."""
+    with pytest.raises(ValueError):
+        timed_model.find_track_at_time(seconds)
+
+
+def test_seek_to_time(timed_model):
+    """Test that seeking makes the track at that time current."""
+    timed_model.seek_to_time(150)
+    assert timed_model.current_track_number == 2
+
+
+def test_time_remaining(timed_model):
+    """Test the remaining time from the start of the current track."""
+    assert timed_model.time_remaining() == 600
+    timed_model.go_to_track_number(3)
+    assert timed_model.time_remaining() == 300
+
+
+def test_time_offsets_follow_reordering(timed_model):
+    """Test that swaps, moves and removals keep the durations in playlist order."""
+    timed_model.swap_songs_in_playlist(1, 3)
+    assert timed_model.find_track_at_time(299)["song_id"] == 3
+    assert timed_model._duration_tree.prefix_sum(3) == 600
+
+    timed_model.move_song_to_beginning(2)
+    assert timed_model.find_track_at_time(199)["song_id"] == 2
+
+    timed_model.remove_song_by_song_id(3)
+    assert timed_model.find_track_at_time(200)["song_id"] == 1
+    assert timed_model.time_remaining() == 300
+
+
+def test_time_remaining_with_replaced_playlist(playlist_model, sample_playlist, mocker):
+    """Test that a playlist assigned directly is still timed correctly."""
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=sample_playlist)
+    playlist_model.playlist = [1, 2]
+    assert playlist_model.time_remaining() == 259 + 301
+
+
+##################################################
+# Shuffle Test Cases
+##################################################
+
+
+@pytest.fixture
+def shuffled_model(playlist_model, mocker):
+    """Fixture for a shuffled playlist of ten songs that never touches the network."""
+    songs = {song_id: mocker.Mock(id=song_id, title=f"Song {song_id}", duration=100) for song_id in range(1, 11)}
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=lambda song_id: songs[song_id])
+    mocker.patch("playlist.models.playlist_model.get_random", side_effect=AssertionError("network call"))
+    for song_id in songs:
+        playlist_model.add_song_to_playlist(song_id)
+    playlist_model.enable_shuffle(seed=42)
+    return playlist_model
+
+
+def check_shuffle_invariants(model):
+    """Checks that the shuffle order is a permutation of the playlist with a consistent index."""
+    assert sorted(model._shuffle_order) == sorted(model.playlist)
+    assert all(model._shuffle_order[position] == song_id for song_id, position in model._shuffle_index.items())
+    assert len(model._shuffle_index) == len(model._shuffle_order)
+    assert 0 <= model._shuffle_position < max(len(model._shuffle_order), 1)
+
+
+def test_enable_shuffle_keeps_current_song(playlist_model, sample_playlist):
+    """Test that enabling shuffle keeps the current song current."""
+    playlist_model.add_song_to_playlist(1)
+    playlist_model.add_song_to_playlist(2)
+    playlist_model.current_track_number = 2
+
+    playlist_model.enable_shuffle(seed=1)
+
+    assert playlist_model.get_current_song().id == 2
+    check_shuffle_invariants(playlist_model)
+
+
+def test_enable_shuffle_twice_keeps_cycle(shuffled_model):
+    """Test that enabling shuffle while it is on keeps the current song and the cycle."""
+    shuffled_model.go_to_next_track()
+    shuffled_model.go_to_next_track()
+    order = shuffled_model.get_shuffle_order()
+    current_id = shuffled_model.get_current_song().id
+
+    shuffled_model.enable_shuffle()
+
+    assert shuffled_model.get_current_song().id == current_id
+    assert shuffled_model.get_shuffle_order() == order
+    check_shuffle_invariants(shuffled_model)
+
+
+def test_shuffle_seed_is_drawn_once_per_session(shuffled_model):
+    """Test that re-enabling shuffle keeps the session's seed."""
+    seed = shuffled_model.shuffle_seed
+    shuffled_model.disable_shuffle()
+    shuffled_model.enable_shuffle(seed=7)
+    assert shuffled_model.shuffle_seed == seed
+
+
+def test_shuffle_is_reproducible_for_a_seed(shuffled_model, mocker):
+    """Test that the same seed produces the same permutation."""
+    other = PlaylistModel()
+    other.playlist = list(shuffled_model.playlist)
+    other.enable_shuffle(seed=42)
+    assert other.get_shuffle_order() == shuffled_model.get_shuffle_order()
+
+
+def test_play_entire_playlist_shuffled_plays_every_song_once(shuffled_model):
+    """Test that a shuffled cycle plays each song exactly once and follows the shuffle order."""
+    order = shuffled_model.get_shuffle_order()
+    played = []
+    for song_id in order:
+        Songs.get_song_by_id(song_id).update_play_count.side_effect = lambda song_id=song_id: played.append(song_id)
+
+    shuffled_model.play_entire_playlist()
+
+    assert played == order
+    assert sorted(played) == sorted(shuffled_model.playlist)
+
+
+def test_play_rest_of_playlist_shuffled(shuffled_model):
+    """Test that playing the rest of a shuffled playlist plays only the unplayed songs."""
+    order = shuffled_model.get_shuffle_order()
+    shuffled_model.play_current_song()
+    shuffled_model.play_current_song()
+
+    shuffled_model.play_rest_of_playlist()
+
+    for song_id in order:
+        assert Songs.get_song_by_id(song_id).update_play_count.call_count == 1
+
+
+def test_next_and_previous_track_shuffled(shuffled_model):
+    """Test that next and previous walk the shuffle order."""
+    order = shuffled_model.get_shuffle_order()
+
+    shuffled_model.go_to_next_track()
+    shuffled_model.go_to_next_track()
+    assert shuffled_model.get_current_song().id == order[2]
+
+    shuffled_model.go_to_previous_track()
+    assert shuffled_model.get_current_song().id == order[1]
+    assert shuffled_model.get_current_track_number() == shuffled_model.playlist.index(order[1]) + 1
+
+
+def test_next_and_previous_track_sequential(playlist_model):
+    """Test that next and previous wrap around in playlist order."""
+    playlist_model.playlist = [1, 2, 3]
+    playlist_model.go_to_previous_track()
+    assert playlist_model.current_track_number == 3
+    playlist_model.go_to_next_track()
+    assert playlist_model.current_track_number == 1
+
+
+def test_go_to_random_track_shuffled_skips_network(shuffled_model):
+    """Test that a random jump in shuffle mode uses the shuffle order instead of random.org."""
+    order = shuffled_model.get_shuffle_order()
+    shuffled_model.go_to_random_track()
+    assert shuffled_model.get_current_song().id == order[1]
+    assert shuffled_model.current_track_number == shuffled_model.playlist.index(order[1]) + 1
+
+
+def test_shuffle_add_and_remove_keep_cycle(shuffled_model, mocker):
+    """Test that adding and removing songs mid-cycle never repeats or skips a song."""
+    songs = {song_id: Songs.get_song_by_id(song_id) for song_id in shuffled_model.playlist}
+    songs.update({song_id: mocker.Mock(id=song_id, title=f"Song {song_id}", duration=100) for song_id in (11, 12)})
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=songs.__getitem__)
+
+    order = shuffled_model.get_shuffle_order()
+    played = [order[0], order[1], order[2]]
+    for _ in played:
+        shuffled_model.play_current_song()
+
+    shuffled_model.add_song_to_playlist(11)
+    shuffled_model.remove_song_by_song_id(played[0])
+    shuffled_model.remove_song_by_song_id(shuffled_model.get_current_song().id)
+    shuffled_model.add_song_to_playlist(12)
+    check_shuffle_invariants(shuffled_model)
+
+    remaining_order = shuffled_model.get_shuffle_order()[shuffled_model._shuffle_position:]
+    assert 11 in remaining_order and 12 in remaining_order
+    assert not set(remaining_order) & set(played)
+    assert len(remaining_order) == len(shuffled_model.playlist) - 2
+
+
+def test_shuffle_wraps_to_new_cycle(shuffled_model):
+    """Test that finishing a cycle starts a new permutation of the whole playlist."""
+    shuffled_model.play_entire_playlist()
+    assert shuffled_model._shuffle_position == 0
+    check_shuffle_invariants(shuffled_model)
+
+
+def test_disable_shuffle_continues_from_current_song(shuffled_model):
+    """Test that disabling shuffle resumes playlist order from the current song."""
+    shuffled_model.go_to_next_track()
+    current_id = shuffled_model.get_current_song().id
+
+    shuffled_model.disable_shuffle()
+
+    assert shuffled_model.get_current_song().id == current_id
+    assert shuffled_model.get_shuffle_order() == []
+
+
+##################################################
+# Cache Refresh Test Cases
+##################################################
+
+
+def set_cache_expiry(song_id: int, expires: float) -> None:
+    """Sets when a song expires from the song cache."""
+    row, _, version = Songs._song_cache[song_id]
+    Songs._song_cache[song_id] = (row, expires, version)
+
+
+def test_refresh_expiring_songs_soonest_first(playlist_model, five_songs, mocker):
+    """Test that the songs closest to expiry are reloaded first, within the budget."""
+    playlist_model.add_songs_to_playlist([1, 2, 3, 4, 5])
+    now = time.time()
+    for song_id, expires_in in {1: 8, 2: 3, 3: 100, 4: 5, 5: 200}.items():
+        set_cache_expiry(song_id, now + expires_in)
+    spy = mocker.spy(Songs, "reload_songs")
+
+    assert playlist_model.refresh_expiring_songs(window_seconds=10, budget=2) == 2
+
+    spy.assert_called_once()
+    assert sorted(spy.call_args.args[0]) == [2, 4]
+    expiries = Songs.get_cached_song_expiries([1, 2, 4])
+    assert expiries[2] > now + Songs.song_cache_ttl_seconds - 1
+    assert expiries[4] > now + Songs.song_cache_ttl_seconds - 1
+    assert expiries[1] == pytest.approx(now + 8)
+
+
+def test_refresh_expiring_songs_nothing_due(playlist_model, five_songs, mocker):
+    """Test that no query is made when no entry expires within the window."""
+    playlist_model.add_songs_to_playlist([1, 2])
+    spy = mocker.spy(Songs, "reload_songs")
+
+    assert playlist_model.refresh_expiring_songs(window_seconds=10, budget=5) == 0
+    spy.assert_not_called()
+
+
+def test_refresh_expiring_songs_loads_missing_entries(playlist_model, five_songs):
+    """Test that playlist songs missing from the cache are reloaded."""
+    playlist_model.add_songs_to_playlist([1, 2, 3])
+    Songs.clear_song_cache()
+
+    assert playlist_model.refresh_expiring_songs(window_seconds=10, budget=5) == 3
+    assert set(Songs.get_cached_song_expiries([1, 2, 3, 4])) == {1, 2, 3}
+
+
+def test_song_cache_refresher_thread(app, playlist_model, five_songs):
+    """Test that the background refresher reloads expiring entries from its own thread."""
+    playlist_model.add_songs_to_playlist([1, 2])
+    set_cache_expiry(1, time.time() + 1)
+    refresher = SongCacheRefresher(app, playlist_model, interval_seconds=0.01, window_seconds=5, budget=10)
+
+    refresher.start()
+    try:
+        deadline = time.time() + 2
+        while Songs.get_cached_song_expiries([1])[1] < time.time() + 5 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        refresher.stop()
+
+    assert Songs.get_cached_song_expiries([1])[1] > time.time() + 5
+    assert Songs.get_cached_song(1).title == "Song 1"
+
+
+##################################################
+# Memory Usage Test Cases
+##################################################
+
+
+def test_get_memory_usage(playlist_model, sample_playlist):
+    """Test that memory usage grows with the playlist."""
+    empty_usage = playlist_model.get_memory_usage()
+
+    playlist_model.add_song_to_playlist(1)
+    playlist_model.add_song_to_playlist(2)
+    usage = playlist_model.get_memory_usage()
+
+    assert usage["playlist"]["entries"] == 2
+    assert usage["playlist"]["bytes"] > empty_usage["playlist"]["bytes"]
+    assert usage["total_bytes"] == sum(usage[name]["bytes"] for name in ("playlist", "shuffle"))
+
+
+##################################################
+# Concurrency Test Cases
+##################################################
+
+
+def test_concurrent_operations_keep_playlist_consistent(playlist_model, mocker):
+    """Test that hammering the model from many threads never corrupts the playlist."""
+    songs = {song_id: mocker.Mock(id=song_id, title=f"Song {song_id}", duration=10) for song_id in range(1, 201)}
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=lambda song_id: songs[song_id])
+    playlist_model.enable_shuffle(seed=3)
+
+    writer_count, reader_count, iterations = 8, 4, 300
+    expected = [set() for _ in range(writer_count)]
+    errors = []
+    done = threading.Event()
+    start = threading.Barrier(writer_count + reader_count)
+
+    def writer(index):
+        rng = random.Random(index)
+        owned = list(range(index * 25 + 1, index * 25 + 26))
+        start.wait()
+        try:
+            for _ in range(iterations):
+                song_id = rng.choice(owned)
+                try:
+                    if song_id in expected[index]:
+                        operation = rng.choice(["remove", "move", "swap", "play", "next"])
+                        if operation == "remove":
+                            playlist_model.remove_song_by_song_id(song_id)
+                            expected[index].discard(song_id)
+                        elif operation == "move":
+                            playlist_model.move_song_to_beginning(song_id)
+                        elif operation == "swap" and len(expected[index]) > 1:
+                            other = rng.choice(sorted(expected[index] - {song_id}))
+                            playlist_model.swap_songs_in_playlist(song_id, other)
+                        elif operation == "play":
+                            playlist_model.play_current_song()
+                        else:
+                            playlist_model.go_to_next_track()
+                    else:
+                        playlist_model.add_song_to_playlist(song_id)
+                        expected[index].add(song_id)
+                except ValueError:
+                    # Expected when another thread emptied the playlist in between
+                    pass
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        start.wait()
+        try:
+            while not done.is_set():
+                try:
+                    song_ids = [song.id for song in playlist_model.get_all_songs()]
+                    assert len(song_ids) == len(set(song_ids))
+                    playlist_model.get_playlist_duration()
+                    playlist_model.get_current_song()
+                except ValueError:
+                    pass
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(index,)) for index in range(writer_count)]
+    readers = [threading.Thread(target=reader) for _ in range(reader_count)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(playlist_model.playlist) == len(set(playlist_model.playlist))
+    assert set(playlist_model.playlist) == set().union(*expected)
+    check_shuffle_invariants(playlist_model)
+
+
+def test_concurrent_cache_misses_share_one_load(playlist_model, mocker):
+    """Test that threads missing the cache for the same song send a single DB query."""
+    song = mocker.Mock(id=1, duration=10)
+
+    def slow_get_song_by_id(song_id):
+        time.sleep(0.1)
+        return song
+
+    mock_get = mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=slow_get_song_by_id)
+    start = threading.Barrier(6)
+    results = []
+
+    def reader():
+        start.wait()
+        results.append(playlist_model._get_song_from_cache_or_db(1))
+
+    threads = [threading.Thread(target=reader) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [song] * 6
+    assert mock_get.call_count == 1
+
+
+def test_concurrent_cache_misses_share_errors(playlist_model, mocker):
+    """Test that every thread waiting on a failed load gets the not-found error."""
+    def slow_missing_song(song_id):
+        time.sleep(0.1)
+        raise ValueError(f"Song with ID {song_id} not found")
+
+    mock_get = mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=slow_missing_song)
+    start = threading.Barrier(4)
+    errors = []
+
+    def reader():
+        start.wait()
+        try:
+            playlist_model._get_song_from_cache_or_db(99)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["Song ID 99 not found in database"] * 4
+    assert mock_get.call_count == 1
+
+    # The failure is not cached, so the next lookup queries again
+    with pytest.raises(ValueError):
+        playlist_model._get_song_from_cache_or_db(99)
+    assert mock_get.call_count == 2
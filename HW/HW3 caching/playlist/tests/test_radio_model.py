@@ -0,0 +1,138 @@
+from collections import Counter
+
+import pytest
+
+from playlist.models.radio_model import RadioModel
+from playlist.models.song_model import Songs
+
+
+@pytest.fixture
+def radio_model():
+    """Fixture providing a seeded RadioModel that rebuilds on every catalog change."""
+    model = RadioModel(seed=42)
+    model.min_rebuild_seconds = 0
+    return model
+
+
+@pytest.fixture
+def radio_catalog(session):
+    """Fixture adding songs with known play counts to the catalog."""
+    songs = [
+        Songs(artist="A", title="Hit", year=2000, genre="Rock", duration=200, play_count=90),
+        Songs(artist="B", title="Deep Cut", year=2001, genre="Rock", duration=200, play_count=10),
+        Songs(artist="C", title="Never Played", year=2002, genre="Rock", duration=200, play_count=0),
+        Songs(artist="D", title="Tune", year=2003, genre="Jazz", duration=200, play_count=0),
+        Songs(artist="E", title="Other Tune", year=2004, genre="Jazz", duration=200, play_count=0),
+    ]
+    session.add_all(songs)
+    session.commit()
+    return songs
+
+
+##################################################
+# Weighted Picks
+##################################################
+
+
+def test_next_song_weighted_by_play_count(radio_model, radio_catalog):
+    """Test that picks follow play counts and unplayed songs are skipped."""
+    counts = Counter(radio_model.next_song().title for _ in range(2000))
+
+    assert set(counts) == {"Hit", "Deep Cut"}
+    assert counts["Hit"] / 2000 == pytest.approx(0.9, abs=0.03)
+
+
+def test_next_song_genre_filter(radio_model, radio_catalog):
+    """Test that a genre station only picks songs of that genre."""
+    titles = {radio_model.next_song("Rock").title for _ in range(200)}
+
+    assert titles <= {"Hit", "Deep Cut"}
+
+
+def test_next_song_unplayed_genre_is_uniform(radio_model, radio_catalog):
+    """Test that a station whose songs were never played picks uniformly."""
+    counts = Counter(radio_model.next_song(" Jazz ").title for _ in range(2000))
+
+    assert set(counts) == {"Tune", "Other Tune"}
+    assert counts["Tune"] / 2000 == pytest.approx(0.5, abs=0.05)
+
+
+def test_next_song_unknown_genre(radio_model, radio_catalog):
+    """Test that a genre with no songs raises a ValueError."""
+    with pytest.raises(ValueError, match="No songs in genre 'Polka'"):
+        radio_model.next_song("Polka")
+
+
+def test_next_song_empty_catalog(radio_model, session):
+    """Test that an empty catalog raises a ValueError."""
+    with pytest.raises(ValueError, match="The song catalog is empty"):
+        radio_model.next_song()
+
+
+def test_next_song_is_reproducible_for_a_seed(radio_catalog):
+    """Test that two radios with the same seed pick the same sequence."""
+    first, second = RadioModel(seed=7), RadioModel(seed=7)
+
+    assert [first.next_song().id for _ in range(20)] == [second.next_song().id for _ in range(20)]
+
+
+def test_next_song_makes_no_network_calls(radio_model, radio_catalog, mocker):
+    """Test that picks never call random.org."""
+    mock_get = mocker.patch("requests.get")
+
+    radio_model.next_song()
+
+    mock_get.assert_not_called()
+
+
+##################################################
+# Rebuilds
+##################################################
+
+
+def test_stations_not_rebuilt_while_catalog_unchanged(radio_model, radio_catalog):
+    """Test that the tables are built once and reused."""
+    for _ in range(10):
+        radio_model.next_song()
+
+    assert radio_model.rebuilds == 1
+
+
+def test_stations_rebuilt_when_catalog_changes(radio_model, radio_catalog, session):
+    """Test that a catalog change is picked up on the next pick."""
+    radio_model.next_song()
+
+    radio_catalog[0].play_count = 0
+    radio_catalog[1].play_count = 0
+    radio_catalog[2].play_count = 5
+    session.commit()
+
+    assert radio_model.next_song("Rock").title == "Never Played"
+    assert radio_model.rebuilds == 2
+
+
+def test_rebuilds_are_rate_limited(radio_catalog, session):
+    """Test that catalog changes within min_rebuild_seconds reuse the old tables."""
+    radio_model = RadioModel(seed=1)
+    radio_model.min_rebuild_seconds = 3600
+    radio_model.next_song()
+
+    radio_catalog[2].play_count = 5
+    session.commit()
+    radio_model.next_song()
+
+    assert radio_model.rebuilds == 1
+
+
+def test_deleted_song_forces_rebuild(radio_catalog, session):
+    """Test that drawing a deleted song rebuilds the stations and draws again."""
+    radio_model = RadioModel(seed=1)
+    radio_model.min_rebuild_seconds = 3600
+    radio_model.next_song()
+
+    Songs.delete_song(radio_catalog[0].id)
+
+    titles = {radio_model.next_song("Rock").title for _ in range(50)}
+
+    assert titles == {"Deep Cut"}
+    assert radio_model.rebuilds == 2
@@ -0,0 +1,86 @@
+import random
+from collections import Counter
+
+import pytest
+
+from playlist.utils.ranking import CountRanking
+
+
+##########################################################
+# Count Ranking
+##########################################################
+
+
+def test_top_orders_by_count():
+    """Test that the top keys come out highest count first."""
+    ranking = CountRanking()
+    for key, count in (("a", 3), ("b", 1), ("c", 5), ("d", 3)):
+        for _ in range(count):
+            ranking.increment(key)
+
+    assert ranking.top(3) == [("c", 5), ("a", 3), ("d", 3)]
+    assert ranking.count("b") == 1
+    assert len(ranking) == 4
+
+
+def test_decrement_to_zero_drops_key():
+    """Test that a key whose count reaches zero is no longer ranked."""
+    ranking = CountRanking()
+    ranking.increment("a")
+    ranking.increment("a")
+    ranking.increment("b")
+
+    ranking.decrement("a")
+    ranking.decrement("a")
+
+    assert ranking.top(10) == [("b", 1)]
+    assert ranking.count("a") == 0
+
+
+def test_decrement_unknown_key():
+    """Test that decrementing a key that is not ranked raises a KeyError."""
+    with pytest.raises(KeyError):
+        CountRanking().decrement("missing")
+
+
+def test_matches_counter_under_random_updates():
+    """Test that the ranking agrees with a Counter after many random updates."""
+    rng = random.Random(5)
+    ranking = CountRanking()
+    expected = Counter()
+
+    for _ in range(5000):
+        key = rng.randrange(30)
+        if expected[key] and rng.random() < 0.4:
+            ranking.decrement(key)
+            expected[key] -= 1
+        else:
+            ranking.increment(key)
+            expected[key] += 1
+
+    expected = +expected
+    ranked = ranking.top(len(expected))
+    assert dict(ranked) == dict(expected)
+    assert [count for _, count in ranked] == sorted(expected.values(), reverse=True)
+
+
+def test_top_with_small_k():
+    """Test that top returns at most k keys and nothing for k <= 0."""
+    ranking = CountRanking()
+    for key in "abc":
+        ranking.increment(key)
+
+    assert len(ranking.top(2)) == 2
+    assert ranking.top(0) == []
+
+
+def test_clear():
+    """Test that clear removes every key."""
+    ranking = CountRanking()
+    ranking.increment("a")
+
+    ranking.clear()
+
+    assert ranking.top(5) == []
+    ranking.increment("b")
+    assert ranking.top(5) == [("b", 1)]
@@ -0,0 +1,262 @@
+import time
+
+import pytest
+from flask import Flask, jsonify, make_response, request
+from flask_login import LoginManager, UserMixin
+
+from playlist.models.song_model import Songs
+from playlist.models.user_model import Users
+from playlist.utils.response_cache import ResponseCache
+
+
+class FakeUser(UserMixin):
+    def __init__(self, user_id: str):
+        self.id = user_id
+
+
+@pytest.fixture
+def cache_app():
+    """A small app with cached views that count how often they run."""
+    flask_app = Flask(__name__)
+    flask_app.config["SECRET_KEY"] = "test-secret-key"
+
+    login_manager = LoginManager()
+    login_manager.init_app(flask_app)
+
+    @login_manager.request_loader
+    def load_user_from_request(req):
+        user_id = req.headers.get("X-User")
+        return FakeUser(user_id) if user_id else None
+
+    cache = ResponseCache(max_bytes=1024)
+    state = {"version": 1, "calls": 0, "status": 200}
+
+    @flask_app.route("/items/<int:item_id>")
+    @cache.cached(version=lambda: state["version"])
+    def get_item(item_id):
+        state["calls"] += 1
+        return make_response(jsonify({"id": item_id, "sort": request.args.get("sort")}), state["status"])
+
+    @flask_app.route("/short")
+    @cache.cached(ttl=0.05)
+    def get_short():
+        state["calls"] += 1
+        return make_response(jsonify({"calls": state["calls"]}), 200)
+
+    @flask_app.route("/mine")
+    @cache.cached(per_user=True)
+    def get_mine():
+        state["calls"] += 1
+        return make_response(jsonify({"calls": state["calls"]}), 200)
+
+    @flask_app.route("/broken-version")
+    @cache.cached(version=lambda: 1 / 0)
+    def get_broken_version():
+        state["calls"] += 1
+        return make_response(jsonify({}), 200)
+
+    return flask_app, cache, state
+
+
+##########################################################
+# Response Cache
+##########################################################
+
+
+def test_put_and_get():
+    """Test that a stored response is returned and counted as a hit."""
+    cache = ResponseCache(max_bytes=100)
+
+    assert cache.get("a") is None
+    assert cache.put("a", b"body", 200, "application/json")
+    assert cache.get("a") == (b"body", 200, "application/json")
+
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["bytes"], stats["hits"], stats["misses"]) == (1, 4, 1, 1)
+
+
+def test_evicts_least_recently_used_by_size():
+    """Test that entries are evicted in LRU order once the body bytes exceed the limit."""
+    cache = ResponseCache(max_bytes=10, max_entry_bytes=10)
+    cache.put("a", b"aaaa", 200, "text/plain")
+    cache.put("b", b"bbbb", 200, "text/plain")
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", b"cccc", 200, "text/plain")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    stats = cache.get_stats()
+    assert (stats["bytes"], stats["evictions"]) == (8, 1)
+
+
+def test_skips_oversized_entries():
+    """Test that a response larger than max_entry_bytes is not stored."""
+    cache = ResponseCache(max_bytes=80)
+
+    assert not cache.put("a", b"x" * 11, 200, "text/plain")
+    assert cache.put("b", b"x" * 10, 200, "text/plain")
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_replacing_entry_updates_size():
+    """Test that storing a key again replaces its body size instead of adding to it."""
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"x" * 10, 200, "text/plain")
+    cache.put("a", b"x" * 5, 200, "text/plain")
+
+    assert cache.get_stats()["bytes"] == 5
+
+
+def test_entries_expire_after_ttl():
+    """Test that an entry with a TTL is dropped once it expires."""
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"body", 200, "text/plain", ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_clear():
+    """Test that clear removes every entry."""
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"body", 200, "text/plain")
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] == 0
+
+
+##########################################################
+# Cached Views
+##########################################################
+
+
+def test_cached_view_hit_and_miss(cache_app):
+    """Test that a repeated GET is served from the cache with the same body."""
+    flask_app, _, state = cache_app
+    client = flask_app.test_client()
+
+    first = client.get("/items/1?sort=asc")
+    second = client.get("/items/1?sort=asc")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json() == {"id": 1, "sort": "asc"}
+    assert second.mimetype == "application/json"
+    assert state["calls"] == 1
+
+
+def test_cached_view_keys_on_path_and_args(cache_app):
+    """Test that different paths and query arguments get their own entries."""
+    flask_app, _, state = cache_app
+    client = flask_app.test_client()
+
+    client.get("/items/1?sort=asc")
+    client.get("/items/2?sort=asc")
+    client.get("/items/1?sort=desc")
+
+    assert state["calls"] == 3
+    assert client.get("/items/1?sort=desc").headers["X-Cache"] == "HIT"
+
+
+def test_cached_view_misses_after_version_change(cache_app):
+    """Test that bumping the data version bypasses the old entries."""
+    flask_app, _, state = cache_app
+    client = flask_app.test_client()
+
+    client.get("/items/1")
+    state["version"] += 1
+
+    assert client.get("/items/1").headers["X-Cache"] == "MISS"
+    assert state["calls"] == 2
+
+
+def test_cached_view_skips_error_responses(cache_app):
+    """Test that non-200 responses are never cached."""
+    flask_app, cache, state = cache_app
+    client = flask_app.test_client()
+    state["status"] = 400
+
+    client.get("/items/1")
+    client.get("/items/1")
+
+    assert state["calls"] == 2
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_cached_view_ttl(cache_app):
+    """Test that a view with a TTL is recomputed once the entry expires."""
+    flask_app, _, state = cache_app
+    client = flask_app.test_client()
+
+    client.get("/short")
+    assert client.get("/short").headers["X-Cache"] == "HIT"
+    time.sleep(0.06)
+
+    assert client.get("/short").get_json() == {"calls": 2}
+
+
+def test_cached_view_per_user(cache_app):
+    """Test that per-user views are cached separately for each user."""
+    flask_app, _, state = cache_app
+    client = flask_app.test_client()
+
+    client.get("/mine", headers={"X-User": "1"})
+    client.get("/mine", headers={"X-User": "2"})
+
+    assert state["calls"] == 2
+    assert client.get("/mine", headers={"X-User": "1"}).get_json() == {"calls": 1}
+
+
+def test_cached_view_runs_uncached_when_version_fails(cache_app):
+    """Test that a failing version callable falls back to running the view."""
+    flask_app, cache, state = cache_app
+    client = flask_app.test_client()
+
+    assert client.get("/broken-version").status_code == 200
+    assert client.get("/broken-version").status_code == 200
+    assert state["calls"] == 2
+    assert cache.get_stats()["entries"] == 0
+
+
+##########################################################
+# Catalog Routes
+##########################################################
+
+
+@pytest.fixture
+def logged_in_client(client, session):
+    """Fixture providing a test client with a logged-in user."""
+    Users.create_user("testuser", "password")
+    client.post("/api/login", json={"username": "testuser", "password": "password"})
+    return client
+
+
+@pytest.fixture
+def queen(session):
+    """Fixture for Queen - Bohemian Rhapsody."""
+    song = Songs(artist="Queen", title="Bohemian Rhapsody", year=1975, genre="Rock", duration=354)
+    session.add(song)
+    session.commit()
+    return song
+
+
+def test_catalog_routes_miss_after_a_play(logged_in_client, queen):
+    """Test that playing a song invalidates the cached catalog responses that show play counts."""
+    routes = [
+        "/api/search-songs?q=queen",
+        "/api/get-all-songs-from-catalog?sort_by_play_count=true",
+        "/api/catalog-stats",
+    ]
+    for route in routes:
+        logged_in_client.get(route)
+        assert logged_in_client.get(route).headers["X-Cache"] == "HIT"
+
+    Songs.get_song_by_id(queen.id).update_play_count()
+
+    for route in routes:
+        response = logged_in_client.get(route)
+        assert response.headers["X-Cache"] == "MISS", route
+    assert logged_in_client.get("/api/search-songs?q=queen").get_json()["songs"][0]["play_count"] == 1
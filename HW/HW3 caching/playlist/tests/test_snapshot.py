@@ -0,0 +1,88 @@
+import json
+import os
+import time
+
+from flask import has_app_context
+
+from playlist.utils.snapshot import CacheSnapshotter, read_snapshot, write_snapshot
+
+
+##########################################################
+# Snapshot Files
+##########################################################
+
+
+def test_write_and_read_snapshot(tmp_path):
+    """Test that a snapshot reads back as written, in compact JSON."""
+    path = tmp_path / "cache" / "snapshot.json"
+    payload = {"version": 3, "rows": [[1, "a"], [2, "b"]]}
+
+    size = write_snapshot(str(path), payload)
+
+    assert read_snapshot(str(path)) == payload
+    assert size == os.path.getsize(path)
+    assert b" " not in path.read_bytes()
+    assert os.listdir(path.parent) == ["snapshot.json"]
+
+
+def test_write_snapshot_replaces_old(tmp_path):
+    """Test that a new snapshot replaces the previous one."""
+    path = str(tmp_path / "snapshot.json")
+    write_snapshot(path, {"version": 1})
+    write_snapshot(path, {"version": 2})
+
+    assert read_snapshot(path) == {"version": 2}
+
+
+def test_read_missing_snapshot(tmp_path):
+    """Test that a missing snapshot reads as None."""
+    assert read_snapshot(str(tmp_path / "missing.json")) is None
+
+
+def test_read_corrupt_snapshot(tmp_path):
+    """Test that a truncated or malformed snapshot is ignored."""
+    path = tmp_path / "snapshot.json"
+    path.write_text('{"version": 1, "rows": [')
+    assert read_snapshot(str(path)) is None
+
+    path.write_text(json.dumps([1, 2, 3]))
+    assert read_snapshot(str(path)) is None
+
+
+##########################################################
+# Cache Snapshotter
+##########################################################
+
+
+def test_snapshotter_saves_on_stop(app):
+    """Test that stopping the snapshotter writes a final snapshot."""
+    saves = []
+    snapshotter = CacheSnapshotter(app, lambda: saves.append(1), interval_seconds=0)
+
+    snapshotter.start()
+    snapshotter.stop()
+
+    assert saves == [1]
+
+
+def test_snapshotter_saves_periodically(app):
+    """Test that the snapshotter saves at its interval, inside an app context."""
+    contexts = []
+    snapshotter = CacheSnapshotter(app, lambda: contexts.append(has_app_context()), interval_seconds=0.01)
+
+    snapshotter.start()
+    deadline = time.time() + 2
+    while len(contexts) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    snapshotter.stop()
+
+    assert len(contexts) >= 3
+    assert all(contexts)
+
+
+def test_snapshotter_logs_failures(app):
+    """Test that a failing save does not raise."""
+    def fail():
+        raise OSError("disk full")
+
+    CacheSnapshotter(app, fail, interval_seconds=0).stop()
@@ -1,5 +1,10 @@
+import json
+import time
+
 import pytest
+from sqlalchemy import event, inspect, text
 
+from playlist.db import db, get_readonly_engine
 from playlist.models.song_model import Songs
 
 
@@ -74,6 +79,217 @@ def test_get_song_by_compound_key_not_found(app):
     with pytest.raises(ValueError, match="not found"):
         Songs.get_song_by_compound_key("Ghost", "Invisible Song", 2024)
 
+def test_get_songs_by_ids(song_beatles, song_nirvana):
+    """Test fetching several songs by ID, skipping IDs that do not exist."""
+    songs = Songs.get_songs_by_ids([song_nirvana.id, 999, song_beatles.id])
+
+    assert set(songs) == {song_beatles.id, song_nirvana.id}
+    assert songs[song_nirvana.id].title == "Smells Like Teen Spirit"
+
+def test_get_songs_by_ids_empty(app):
+    """Test that an empty ID list returns no songs."""
+    assert Songs.get_songs_by_ids([]) == {}
+
+def test_to_dict(song_beatles):
+    """Test converting a song to a dictionary."""
+    assert song_beatles.to_dict() == {
+        "id": song_beatles.id, "artist": "The Beatles", "title": "Hey Jude",
+        "year": 1968, "genre": "Rock", "duration": 431, "play_count": 0
+    }
+
+
+# --- Song Cache ---
+
+@pytest.fixture
+def song_selects(session, song_beatles, song_nirvana):
+    """Fixture recording the SELECT statements run against the Songs table on any engine.
+
+    The fixture songs are loaded and dropped from the session first, so lookups cannot be
+    answered from the session's identity map.
+    """
+    song_beatles.id, song_nirvana.id
+    session.expunge_all()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "Songs" in statement:
+            statements.append(statement)
+
+    engines = [engine for engine in (db.engine, get_readonly_engine()) if engine is not None]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", capture)
+
+def test_get_song_by_id_cached(song_beatles, song_selects):
+    """Test that a repeated lookup by ID is served from the song cache."""
+    loaded = Songs.get_song_by_id(song_beatles.id)
+    cached = Songs.get_song_by_id(song_beatles.id)
+
+    assert len(song_selects) == 1
+    assert cached.to_dict() == loaded.to_dict()
+    assert cached is not Songs.get_song_by_id(song_beatles.id)
+
+def test_compound_key_lookup_uses_id_cache(song_beatles, song_selects):
+    """Test that a song cached by ID is found by its compound key, and the other way round."""
+    Songs.get_song_by_id(song_beatles.id)
+    song = Songs.get_song_by_compound_key("  The Beatles ", "Hey Jude ", 1968)
+
+    assert song.id == song_beatles.id
+    assert len(song_selects) == 1
+
+def test_get_songs_by_ids_loads_only_misses(song_beatles, song_nirvana, song_selects):
+    """Test that a batch lookup only queries the songs that are not cached."""
+    Songs.get_song_by_id(song_beatles.id)
+    songs = Songs.get_songs_by_ids([song_beatles.id, song_nirvana.id])
+    assert set(songs) == {song_beatles.id, song_nirvana.id}
+    assert "IN" in song_selects[-1] and song_selects[-1].count("?") == 1
+
+    Songs.get_songs_by_ids([song_beatles.id, song_nirvana.id])
+    assert len(song_selects) == 2
+
+def test_song_cache_invalidated_on_play_count_update(song_nirvana):
+    """Test that updating the play count drops the cached song."""
+    Songs.get_song_by_id(song_nirvana.id)
+    song_nirvana.update_play_count()
+
+    assert Songs.get_song_by_id(song_nirvana.id).play_count == 1
+    assert Songs.get_song_by_compound_key("Nirvana", "Smells Like Teen Spirit", 1991).play_count == 1
+
+def test_song_cache_invalidated_on_delete(song_beatles):
+    """Test that a deleted song is no longer found by ID or compound key."""
+    song_id = song_beatles.id
+    Songs.get_song_by_id(song_id)
+    Songs.delete_song(song_id)
+
+    with pytest.raises(ValueError, match="not found"):
+        Songs.get_song_by_id(song_id)
+    with pytest.raises(ValueError, match="not found"):
+        Songs.get_song_by_compound_key("The Beatles", "Hey Jude", 1968)
+
+def test_song_cache_invalidated_on_create(session):
+    """Test that creating a song drops a stale compound key entry left by another process."""
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    Songs.get_song_by_compound_key("Queen", "Bohemian Rhapsody", 1975)
+    # Delete and recreate behind the cache's back
+    session.query(Songs).delete()
+    session.commit()
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 300)
+
+    assert Songs.get_song_by_compound_key("Queen", "Bohemian Rhapsody", 1975).duration == 300
+
+def test_song_cache_expires(song_beatles, song_selects, mocker):
+    """Test that cached songs are reloaded once their TTL has passed."""
+    mocker.patch.object(Songs, "song_cache_ttl_seconds", 0)
+    Songs.get_song_by_id(song_beatles.id)
+    db.session.expunge_all()
+    Songs.get_song_by_id(song_beatles.id)
+
+    assert len(song_selects) == 2
+
+def test_song_cache_max_size(song_beatles, song_nirvana, mocker):
+    """Test that the oldest songs are evicted when the cache is full."""
+    mocker.patch.object(Songs, "song_cache_max_size", 1)
+    Songs.get_song_by_id(song_beatles.id)
+    Songs.get_song_by_id(song_nirvana.id)
+
+    assert list(Songs._song_cache) == [song_nirvana.id]
+    assert list(Songs._song_key_index.values()) == [song_nirvana.id]
+
+
+def test_lookups_return_detached_songs_on_miss(song_beatles, song_nirvana):
+    """Test that songs loaded from the database are detached copies, like cached ones."""
+    Songs.clear_song_cache()
+    by_id = Songs.get_song_by_id(song_beatles.id)
+    Songs.clear_song_cache()
+    by_key = Songs.get_song_by_compound_key("Nirvana", "Smells Like Teen Spirit", 1991)
+    Songs.clear_song_cache()
+    by_ids = Songs.get_songs_by_ids([song_beatles.id, song_nirvana.id])
+
+    for song in (by_id, by_key, *by_ids.values()):
+        assert inspect(song).detached
+        assert song is not db.session.get(Songs, song.id)
+
+
+def test_get_song_cache_usage(song_beatles):
+    """Test that the song cache usage counts cached songs."""
+    empty_usage = Songs.get_song_cache_usage()
+    Songs.get_song_by_id(song_beatles.id)
+    usage = Songs.get_song_cache_usage()
+
+    assert usage["entries"] == 1
+    assert usage["bytes"] > empty_usage["bytes"]
+
+
+# --- Song Cache Snapshots ---
+
+def test_cache_snapshot_round_trip(song_beatles, song_nirvana, tmp_path, mocker):
+    """Test that an unchanged catalog restores the snapshot without querying the songs."""
+    path = str(tmp_path / "songs.json")
+    Songs.get_songs_by_ids([song_beatles.id, song_nirvana.id])
+    assert Songs.save_cache_snapshot(path) == 2
+
+    Songs.clear_song_cache()
+    spy = mocker.spy(Songs, "reload_songs")
+    assert Songs.load_cache_snapshot(path) == 2
+
+    spy.assert_not_called()
+    assert Songs.get_cached_song(song_nirvana.id).title == "Smells Like Teen Spirit"
+    assert Songs.get_cached_song_expiries([song_nirvana.id])[song_nirvana.id] > time.time() + Songs.song_cache_ttl_seconds - 5
+
+
+def test_cache_snapshot_revalidated_after_catalog_change(session, song_beatles, song_nirvana, tmp_path, mocker):
+    """Test that a stale snapshot is revalidated with one batch query."""
+    path = str(tmp_path / "songs.json")
+    beatles_id, nirvana_id = song_beatles.id, song_nirvana.id
+    Songs.get_songs_by_ids([beatles_id, nirvana_id])
+    Songs.save_cache_snapshot(path)
+    # Change the catalog behind the cache's back, as another process would
+    session.execute(text("DELETE FROM Songs WHERE id = :id"), {"id": beatles_id})
+    session.execute(text("UPDATE Songs SET play_count = 3 WHERE id = :id"), {"id": nirvana_id})
+    session.commit()
+
+    Songs.clear_song_cache()
+    spy = mocker.spy(Songs, "reload_songs")
+    assert Songs.load_cache_snapshot(path) == 1
+
+    spy.assert_called_once()
+    assert set(Songs.get_cached_song_expiries([beatles_id, nirvana_id])) == {nirvana_id}
+    assert Songs.get_cached_song(nirvana_id).play_count == 3
+
+
+def test_cache_snapshot_saved_after_catalog_change(session, song_beatles, song_nirvana, tmp_path, mocker):
+    """Test that entries cached before a change are revalidated even if the snapshot is saved after it."""
+    path = str(tmp_path / "songs.json")
+    beatles_id, nirvana_id = song_beatles.id, song_nirvana.id
+    Songs.get_songs_by_ids([beatles_id, nirvana_id])
+    session.execute(text("DELETE FROM Songs WHERE id = :id"), {"id": beatles_id})
+    session.execute(text("UPDATE Songs SET play_count = 3 WHERE id = :id"), {"id": nirvana_id})
+    session.commit()
+    Songs.save_cache_snapshot(path)
+
+    Songs.clear_song_cache()
+    spy = mocker.spy(Songs, "reload_songs")
+    assert Songs.load_cache_snapshot(path) == 1
+
+    spy.assert_called_once_with([beatles_id, nirvana_id])
+    assert Songs.get_cached_song(beatles_id) is None
+    assert Songs.get_cached_song(nirvana_id).play_count == 3
+
+
+def test_cache_snapshot_unknown_format(app, tmp_path):
+    """Test that a snapshot with another format is ignored."""
+    path = tmp_path / "songs.json"
+    path.write_text(json.dumps({"format": 99, "songs": [[1, "a", "b", 2000, "Pop", 100, 0]]}))
+
+    assert Songs.load_cache_snapshot(str(path)) == 0
+    assert Songs.get_cached_song(1) is None
+
+
+def test_cache_snapshot_missing_file(app, tmp_path):
+    """Test that a missing snapshot loads nothing."""
+    assert Songs.load_cache_snapshot(str(tmp_path / "missing.json")) == 0
 
 # --- Delete Song ---
 
@@ -113,6 +329,29 @@ def test_get_all_songs_sorted(session, song_beatles, song_nirvana):
     sorted_songs = Songs.get_all_songs(sort_by_play_count=True)
     assert sorted_songs[0]["title"] == "Smells Like Teen Spirit"
 
+def test_get_all_songs_loads_no_instances(session, song_beatles, song_nirvana):
+    """Test that listing songs does not add ORM instances to the session."""
+    session.expunge_all()
+
+    songs = Songs.get_all_songs()
+
+    assert {song["title"] for song in songs} == {"Hey Jude", "Smells Like Teen Spirit"}
+    assert len(session.identity_map) == 0
+
+def test_get_song_rows(session, song_beatles, song_nirvana):
+    """Test retrieving selected columns as plain tuples."""
+    song_nirvana.play_count = 5
+    session.commit()
+
+    rows = Songs.get_song_rows(("title", "play_count"), sort_by_play_count=True)
+
+    assert rows == [("Smells Like Teen Spirit", 5), ("Hey Jude", 0)]
+
+def test_get_song_rows_invalid_column(session):
+    """Test that selecting an unknown column raises a ValueError."""
+    with pytest.raises(ValueError, match="Invalid columns: password"):
+        Songs.get_song_rows(("title", "password"))
+
 
 # --- Random Song ---
 
@@ -133,3 +372,305 @@ def test_get_random_song_empty(session):
     session.commit()
     with pytest.raises(ValueError, match="empty"):
         Songs.get_random_song()
+
+
+# --- Search ---
+
+@pytest.fixture
+def song_beat_it(session):
+    """Fixture for Michael Jackson - Beat It."""
+    song = Songs(artist="Michael Jackson", title="Beat It", year=1982, genre="Pop", duration=258)
+    session.add(song)
+    session.commit()
+    return song
+
+
+def test_search_songs_prefix_match(song_beatles, song_nirvana, song_beat_it):
+    """Test that search terms match word prefixes across artist and title."""
+    results = Songs.search_songs("beat")
+
+    titles = [song["title"] for song in results["songs"]]
+    assert sorted(titles) == ["Beat It", "Hey Jude"]
+    assert results["has_more"] is False
+
+
+def test_search_songs_ranks_title_matches_first(song_beatles, song_beat_it):
+    """Test that a title match outranks an artist match."""
+    results = Songs.search_songs("beat")
+    assert results["songs"][0]["title"] == "Beat It"
+
+
+def test_search_songs_all_terms_must_match(song_beatles, song_nirvana, song_beat_it):
+    """Test that multi-word queries only return songs matching every word."""
+    results = Songs.search_songs("smells spirit")
+    assert [song["title"] for song in results["songs"]] == ["Smells Like Teen Spirit"]
+
+
+def test_search_songs_pagination(song_beatles, song_beat_it):
+    """Test paging through search results."""
+    first_page = Songs.search_songs("beat", limit=1)
+    second_page = Songs.search_songs("beat", limit=1, offset=1)
+
+    assert first_page["has_more"] is True
+    assert second_page["has_more"] is False
+    assert first_page["songs"][0]["id"] != second_page["songs"][0]["id"]
+
+
+def test_search_songs_index_follows_updates_and_deletes(session, song_beatles):
+    """Test that the search index is kept in sync by the triggers."""
+    song_beatles.title = "Let It Be"
+    session.commit()
+    assert Songs.search_songs("jude")["songs"] == []
+    assert len(Songs.search_songs("let")["songs"]) == 1
+
+    Songs.delete_song(song_beatles.id)
+    assert Songs.search_songs("let")["songs"] == []
+
+
+def test_search_songs_treats_operators_as_text(song_beatles):
+    """Test that FTS5 syntax in the query is not interpreted."""
+    assert Songs.search_songs('hey OR "NEAR(jude')["songs"] == []
+    assert len(Songs.search_songs("hey-jude")["songs"]) == 1
+
+
+@pytest.mark.parametrize("query, limit, offset", [
+    ("   ", 20, 0),
+    ("beat", 0, 0),
+    ("beat", 101, 0),
+    ("beat", 20, -1),
+])
+def test_search_songs_invalid(app, query, limit, offset):
+    """Test that invalid search parameters are rejected."""
+    with pytest.raises(ValueError):
+        Songs.search_songs(query, limit=limit, offset=offset)
+
+
+def test_ensure_search_index_backfills_existing_songs(session, song_beatles):
+    """Test that the index is rebuilt for catalogs created before it existed."""
+    session.execute(text("DROP TABLE songs_fts"))
+    session.commit()
+
+    Songs.ensure_search_index()
+
+    assert len(Songs.search_songs("jude")["songs"]) == 1
+
+
+# --- Query Songs ---
+
+@pytest.fixture
+def catalog(session):
+    """Fixture for a small catalog spanning several genres, years and durations."""
+    songs = [
+        Songs(artist="Artist A", title=f"Song {i}", year=1960 + i * 5, genre="Rock" if i % 2 else "Pop", duration=120 + i * 30)
+        for i in range(8)
+    ]
+    session.add_all(songs)
+    session.commit()
+    return songs
+
+
+def test_query_songs_filters(catalog):
+    """Test that filters are combined and ranges are inclusive."""
+    result = Songs.query_songs(genre="Rock", year_min=1965, year_max=1985)
+    assert [song["year"] for song in result["songs"]] == [1965, 1975, 1985]
+    assert result["next_cursor"] is None
+
+    result = Songs.query_songs(duration_min=150, duration_max=210)
+    assert [song["duration"] for song in result["songs"]] == [150, 180, 210]
+
+    assert Songs.query_songs(artist="Nobody")["songs"] == []
+
+
+@pytest.mark.parametrize("sort_by, descending", [
+    ("id", False),
+    ("id", True),
+    ("duration", True),
+    ("genre", False),
+    ("play_count", False),
+])
+def test_query_songs_keyset_pagination(catalog, sort_by, descending):
+    """Test that following cursors visits every song exactly once in sort order."""
+    seen = []
+    cursor = None
+    while True:
+        page = Songs.query_songs(sort_by=sort_by, descending=descending, limit=3, cursor=cursor)
+        seen.extend(page["songs"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(
+        Songs.query_songs(limit=100)["songs"],
+        key=lambda song: (song[sort_by], song["id"]),
+        reverse=descending
+    )
+    assert seen == expected
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"sort_by": "lyrics"},
+    {"limit": 0},
+    {"limit": 501},
+    {"cursor": "not-a-cursor"},
+])
+def test_query_songs_invalid(app, kwargs):
+    """Test that invalid query arguments are rejected."""
+    with pytest.raises(ValueError):
+        Songs.query_songs(**kwargs)
+
+
+@pytest.mark.parametrize("kwargs, index", [
+    ({"genre": "Rock"}, "ix_songs_genre_year"),
+    ({"genre": "Rock", "year_min": 1970, "year_max": 1990}, "ix_songs_genre_year"),
+    ({"artist": "Artist A"}, "ix_songs_artist_title_year"),
+    ({"year_min": 1970, "year_max": 1990}, "ix_songs_year_duration"),
+    ({"duration_min": 150, "duration_max": 210}, "ix_songs_duration"),
+])
+def test_query_songs_uses_index(session, catalog, kwargs, index):
+    """Test that each filter is answered with an index search rather than a table scan."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        Songs.query_songs(**kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    plan = " ".join(row[-1] for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+    assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan
+    assert "SCAN songs" not in plan.replace("Songs", "songs")
+
+
+# --- Export / Import ---
+
+def test_export_songs(song_beatles, song_nirvana):
+    """Test that export streams every song in ID order."""
+    exported = list(Songs.export_songs(batch_size=1))
+    assert [song["id"] for song in exported] == [song_beatles.id, song_nirvana.id]
+    assert exported[0] == {
+        "id": song_beatles.id, "artist": "The Beatles", "title": "Hey Jude",
+        "year": 1968, "genre": "Rock", "duration": 431, "play_count": 0
+    }
+
+
+def test_import_songs_round_trip(session, song_beatles, song_nirvana):
+    """Test that an export can be restored into an empty catalog with IDs and play counts."""
+    song_nirvana.update_play_count()
+    exported = list(Songs.export_songs())
+    session.query(Songs).delete()
+    session.commit()
+
+    assert Songs.import_songs(iter(exported), batch_size=1) == {"imported": 2, "skipped": 0}
+    assert list(Songs.export_songs()) == exported
+    assert len(Songs.search_songs("jude")["songs"]) == 1
+
+
+def test_import_songs_skips_existing(song_beatles):
+    """Test that songs with an existing ID or compound key are skipped."""
+    records = [
+        {"id": song_beatles.id, "artist": "Other", "title": "Other", "year": 2000, "genre": "Pop", "duration": 100},
+        {"artist": " The Beatles ", "title": "Hey Jude", "year": 1968, "genre": "Rock", "duration": 431},
+        {"artist": "New", "title": "Song", "year": 2001, "genre": "Pop", "duration": 100},
+        {"artist": "New", "title": "Song", "year": 2001, "genre": "Pop", "duration": 100},
+    ]
+
+    assert Songs.import_songs(records) == {"imported": 1, "skipped": 3}
+    assert Songs.get_song_by_compound_key("New", "Song", 2001).play_count == 0
+
+
+@pytest.mark.parametrize("record", [
+    {"artist": "A", "title": "B", "year": 1800, "genre": "Pop", "duration": 100},
+    {"artist": "A", "title": "B", "year": 2000, "genre": "Pop"},
+    {"artist": "A", "title": "B", "year": 2000, "genre": "Pop", "duration": 100, "play_count": -1},
+    {"artist": "A", "title": "B", "year": 2000, "genre": "Pop", "duration": 100, "mood": "happy"},
+])
+def test_import_songs_invalid_rolls_back(session, record):
+    """Test that an invalid record aborts the whole import."""
+    records = [{"artist": "Good", "title": "Song", "year": 2000, "genre": "Pop", "duration": 100}, record]
+
+    with pytest.raises(ValueError, match="Record 2"):
+        Songs.import_songs(records, batch_size=1)
+
+    assert Songs.get_all_songs() == []
+
+
+# --- Catalog Analytics ---
+
+def test_catalog_version_changes_on_every_write(session, song_beatles):
+    """Test that creating, editing and deleting songs bumps the catalog version."""
+    version = Songs.get_catalog_version()
+
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    after_create = Songs.get_catalog_version()
+    song_beatles.genre = "Pop"
+    session.commit()
+    after_update = Songs.get_catalog_version()
+    Songs.delete_song(song_beatles.id)
+    after_delete = Songs.get_catalog_version()
+
+    assert version < after_create < after_update < after_delete
+
+
+def test_catalog_version_ignores_play_counts(session, song_beatles):
+    """Test that play count updates only bump the version that includes play counts."""
+    version = Songs.get_catalog_version()
+    with_plays = Songs.get_catalog_version(include_play_counts=True)
+
+    song_beatles.update_play_count()
+
+    assert Songs.get_catalog_version() == version
+    assert Songs.get_catalog_version(include_play_counts=True) > with_plays
+
+
+def test_get_catalog_stats(session, catalog):
+    """Test the aggregates against the catalog fixture."""
+    catalog[0].play_count = 10
+    catalog[7].play_count = 4
+    session.commit()
+
+    stats = Songs.get_catalog_stats(top_artists=5)
+
+    assert stats["song_count"] == 8
+    assert stats["genres"] == [{"genre": "Pop", "songs": 4}, {"genre": "Rock", "songs": 4}]
+    assert stats["decades"][0] == {"decade": 1960, "songs": 2, "plays": 10}
+    assert {"decade": 1990, "songs": 2, "plays": 4} in stats["decades"]
+    assert stats["top_artists"] == [{"artist": "Artist A", "songs": 8, "total_duration": sum(120 + i * 30 for i in range(8))}]
+    assert stats["play_count_percentiles"] == {"p50": 0, "p90": 10, "p95": 10, "p99": 10, "max": 10}
+
+
+def test_get_catalog_stats_empty(app):
+    """Test analytics on an empty catalog."""
+    stats = Songs.get_catalog_stats()
+    assert stats["song_count"] == 0
+    assert stats["play_count_percentiles"]["p50"] is None
+
+
+def test_get_catalog_stats_cached_until_catalog_changes(session, catalog, mocker):
+    """Test that stats are recomputed only after the catalog version changes."""
+    compute = mocker.spy(Songs, "_compute_catalog_stats")
+
+    first = Songs.get_catalog_stats()
+    assert Songs.get_catalog_stats() is first
+    assert compute.call_count == 1
+
+    catalog[0].update_play_count()
+    refreshed = Songs.get_catalog_stats()
+    assert compute.call_count == 2
+    assert refreshed["catalog_version"] > first["catalog_version"]
+    assert refreshed["play_count_percentiles"]["max"] == 1
+
+
+@pytest.mark.parametrize("histogram, expected", [
+    ([(0, 1)], {"p50": 0, "p99": 0, "max": 0}),
+    ([(1, 50), (2, 49), (100, 1)], {"p50": 1, "p99": 2, "max": 100}),
+    ([(1, 1), (2, 1), (3, 1), (4, 1)], {"p50": 2, "p99": 4, "max": 4}),
+])
+def test_percentiles_from_histogram(histogram, expected):
+    """Test nearest-rank percentiles."""
+    assert Songs._percentiles_from_histogram(histogram, (50, 99)) == expected
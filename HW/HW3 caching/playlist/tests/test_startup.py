@@ -0,0 +1,75 @@
+import socket
+import time
+
+from playlist.utils.startup import StartupTimer, start_warmup, wait_for_port
+
+
+##########################################################
+# Startup Timer
+##########################################################
+
+
+def test_startup_timer_records_phases():
+    """Test that each phase's duration is recorded."""
+    timer = StartupTimer()
+    with timer.phase("slow"):
+        time.sleep(0.01)
+    with timer.phase("fast"):
+        pass
+
+    summary = timer.summary()
+    assert summary["phases_ms"]["slow"] >= 10
+    assert summary["phases_ms"]["fast"] < summary["phases_ms"]["slow"]
+    assert summary["total_ms"] >= summary["phases_ms"]["slow"]
+
+
+def test_create_app_records_startup_timings(app):
+    """Test that create_app exposes its startup timings."""
+    timings = app.extensions["startup_timer"].timings
+    assert {"db_init", "db_engines", "schema"} <= set(timings)
+
+
+##########################################################
+# Warm-Up
+##########################################################
+
+
+def test_wait_for_port():
+    """Test waiting for a port that is listening and one that is not."""
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        assert wait_for_port("0.0.0.0", port, timeout=1)
+
+    assert not wait_for_port("127.0.0.1", port, timeout=0.2)
+
+
+def test_start_warmup_runs_tasks_after_failures(app):
+    """Test that warm-up runs every task in the app context, even after one fails."""
+    results = []
+
+    def failing():
+        raise RuntimeError("boom")
+
+    thread = start_warmup(app, {
+        "failing": failing,
+        "app_context": lambda: results.append(app.extensions["startup_timer"] is not None),
+    })
+    thread.join(timeout=5)
+
+    assert results == [True]
+
+
+def test_start_warmup_skips_when_server_never_listens(app):
+    """Test that warm-up gives up if the server does not come up."""
+    results = []
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    thread = start_warmup(app, {"task": lambda: results.append(1)}, "127.0.0.1", port, timeout=0.2)
+    thread.join(timeout=5)
+
+    assert results == []
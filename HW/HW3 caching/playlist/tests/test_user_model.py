@@ -1,6 +1,6 @@
 import pytest
 
-from playlist.models.user_model import Users
+from playlist.models.user_model import UserRecord, Users
 
 
 @pytest.fixture
@@ -112,3 +112,90 @@ def test_get_id_by_username_user_not_found(session):
     """
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.get_id_by_username("nonexistentuser")
+
+
+##########################################################
+# User Cache
+##########################################################
+
+def test_get_cached_user(session, sample_user):
+    """Test that the user loader returns a lightweight record, not an ORM object."""
+    Users.create_user(**sample_user)
+
+    record = Users.get_cached_user(sample_user["username"])
+
+    assert isinstance(record, UserRecord)
+    assert record.username == sample_user["username"]
+    assert record.get_id() == sample_user["username"]
+    assert record.is_authenticated
+    assert not hasattr(record, "password"), "Cached records should not hold password material."
+
+
+def test_get_cached_user_hits_cache(session, sample_user, mocker):
+    """Test that a cached user is served without querying the database."""
+    Users.create_user(**sample_user)
+    Users.get_cached_user(sample_user["username"])
+
+    query_spy = mocker.spy(session, "query")
+    Users.get_cached_user(sample_user["username"])
+
+    query_spy.assert_not_called()
+
+
+def test_get_cached_user_expires(session, sample_user, mocker):
+    """Test that an expired entry is reloaded from the database."""
+    Users.create_user(**sample_user)
+    Users.get_cached_user(sample_user["username"])
+    Users._user_ttl[sample_user["username"]] = 0
+
+    query_spy = mocker.spy(session, "query")
+    Users.get_cached_user(sample_user["username"])
+
+    query_spy.assert_called_once()
+
+
+def test_get_cached_user_not_found(session):
+    """Test that unknown users return None and are not cached."""
+    assert Users.get_cached_user("nonexistentuser") is None
+    assert "nonexistentuser" not in Users._user_cache
+
+
+def test_update_password_invalidates_cached_user(session, sample_user):
+    """Test that changing a password drops the user from the cache."""
+    Users.create_user(**sample_user)
+    Users.get_cached_user(sample_user["username"])
+
+    Users.update_password(sample_user["username"], "newpassword")
+
+    assert sample_user["username"] not in Users._user_cache
+
+
+def test_delete_user_invalidates_cached_user(session, sample_user):
+    """Test that deleting a user drops them from the cache."""
+    Users.create_user(**sample_user)
+    Users.get_cached_user(sample_user["username"])
+
+    Users.delete_user(sample_user["username"])
+
+    assert Users.get_cached_user(sample_user["username"]) is None
+
+
+def test_user_cache_evicts_when_full(session, sample_user, mocker):
+    """Test that the cache never grows past its maximum size."""
+    mocker.patch.object(Users, "user_cache_max_size", 2)
+    for i in range(3):
+        Users.create_user(f"user{i}", "password")
+        Users.get_cached_user(f"user{i}")
+
+    assert list(Users._user_cache) == ["user1", "user2"]
+
+
+def test_reset_users_clears_cached_users(client, session, sample_user):
+    """Test that recreating the users table clears the user cache."""
+    Users.create_user(**sample_user)
+    Users.get_cached_user(sample_user["username"])
+
+    response = client.delete("/api/reset-users")
+
+    assert response.status_code == 200
+    assert Users._user_cache == {}